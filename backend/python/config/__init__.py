@@ -10,6 +10,13 @@ from .settings import *
 __all__ = [
     'BASE_DIR',
     'DATABASE_URL',
+    'WAREHOUSE_BATCH_SIZE',
+    'WAREHOUSE_POOL_MIN_SIZE',
+    'WAREHOUSE_POOL_MAX_SIZE',
+    'SQLITE_BUSY_TIMEOUT_MS',
+    'INTEREST_RETENTION_MONTHS',
+    'INTEREST_DOWNSAMPLE_AFTER_MONTHS',
+    'WAREHOUSE_FETCH_SIZE',
     'GOOGLE_ADS_DEVELOPER_TOKEN',
     'GOOGLE_ADS_CLIENT_ID',
     'GOOGLE_ADS_CLIENT_SECRET',
@@ -19,10 +26,32 @@ __all__ = [
     'OPENAI_API_KEY',
     'SCRAPING_DELAY',
     'USER_AGENT',
+    'ORGANIC_CONCURRENCY',
+    'ORGANIC_HOST_RATES',
+    'ORGANIC_DEFAULT_REQUESTS_PER_SECOND',
+    'ORGANIC_EXPANSION_DEPTH',
+    'ORGANIC_EXPANSION_BUDGET',
+    'ORGANIC_TOOL_TERMS_FILE',
+    'TRENDS_CONCURRENCY',
+    'TRENDS_GEOS',
+    'TRENDS_REQUESTS_PER_SECOND',
+    'TRENDS_BURST',
+    'TRENDS_MAX_REQUESTS_PER_SECOND',
+    'TRENDS_MAX_RETRIES',
+    'TRENDS_CIRCUIT_COOLDOWN_SECONDS',
+    'TRENDS_CACHE_TTL_HOURS',
+    'TRENDS_CACHE_MAX_MB',
+    'TRENDS_TRENDING_CACHE_TTL_MINUTES',
+    'TRENDS_REALTIME_CACHE_TTL_MINUTES',
+    'TRENDS_REFRESH_OVERLAP_DAYS',
+    'TRENDS_OUTPUT_COMPRESSION',
     'DATA_WAREHOUSE_DIR',
     'KEYWORDS_DIR',
     'IMAGES_DIR',
     'ARTICLES_DIR',
+    'EXPORTS_DIR',
+    'TRENDS_CACHE_FILE',
+    'COLLECTION_JOURNAL_FILE',
     'LOG_LEVEL',
     'LOG_FILE'
 ]
@@ -13,6 +13,13 @@ BASE_DIR = Path(__file__).parent.parent.parent
 
 # Database settings
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./data_warehouse.db')
+WAREHOUSE_BATCH_SIZE = int(os.getenv('WAREHOUSE_BATCH_SIZE', '5000'))  # rows per bulk insert chunk
+WAREHOUSE_POOL_MIN_SIZE = int(os.getenv('WAREHOUSE_POOL_MIN_SIZE', '1'))  # PostgreSQL connections kept open
+WAREHOUSE_POOL_MAX_SIZE = int(os.getenv('WAREHOUSE_POOL_MAX_SIZE', '10'))  # PostgreSQL connections at most
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '30000'))  # wait on locked SQLite database
+INTEREST_RETENTION_MONTHS = int(os.getenv('INTEREST_RETENTION_MONTHS', '0'))  # drop older interest partitions (0 = keep all)
+INTEREST_DOWNSAMPLE_AFTER_MONTHS = int(os.getenv('INTEREST_DOWNSAMPLE_AFTER_MONTHS', '0'))  # monthly averages past this age (0 = never)
+WAREHOUSE_FETCH_SIZE = int(os.getenv('WAREHOUSE_FETCH_SIZE', '2000'))  # rows per round trip when streaming reads
 
 # Google API settings
 GOOGLE_ADS_DEVELOPER_TOKEN = os.getenv('GOOGLE_ADS_DEVELOPER_TOKEN')
@@ -30,15 +37,42 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 # Scraping settings
 SCRAPING_DELAY = int(os.getenv('SCRAPING_DELAY', '2'))  # seconds between requests
 USER_AGENT = os.getenv('USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+ORGANIC_CONCURRENCY = int(os.getenv('ORGANIC_CONCURRENCY', '4'))  # parallel organic keyword workers
+ORGANIC_HOST_RATES = {  # requests per second allowed per host, as host=rate pairs
+    host.strip(): float(rate)
+    for host, rate in (
+        pair.split('=') for pair in os.getenv('ORGANIC_HOST_RATES', 'suggestqueries.google.com=1,www.google.com=0.5').split(',') if pair.strip()
+    )
+}
+ORGANIC_DEFAULT_REQUESTS_PER_SECOND = float(os.getenv('ORGANIC_DEFAULT_REQUESTS_PER_SECOND', '1'))  # hosts not in ORGANIC_HOST_RATES
+ORGANIC_EXPANSION_DEPTH = int(os.getenv('ORGANIC_EXPANSION_DEPTH', '2'))  # autocomplete expansion levels per seed
+ORGANIC_EXPANSION_BUDGET = int(os.getenv('ORGANIC_EXPANSION_BUDGET', '500'))  # autocomplete requests per seed at most
+ORGANIC_TOOL_TERMS_FILE = os.getenv('ORGANIC_TOOL_TERMS_FILE')  # extra tool terms for Reddit matching, one per line
+TRENDS_CONCURRENCY = int(os.getenv('TRENDS_CONCURRENCY', '4'))  # parallel Google Trends sessions
+TRENDS_GEOS = [geo.strip() for geo in os.getenv('TRENDS_GEOS', 'US').split(',') if geo.strip()]  # markets for trending searches
+TRENDS_REQUESTS_PER_SECOND = float(os.getenv('TRENDS_REQUESTS_PER_SECOND', '1'))  # HTTP requests, shared across all sessions
+TRENDS_BURST = int(os.getenv('TRENDS_BURST', '2'))  # requests allowed back to back before pacing
+TRENDS_MAX_REQUESTS_PER_SECOND = float(os.getenv('TRENDS_MAX_REQUESTS_PER_SECOND', '3'))  # ceiling while ramping up after successes
+TRENDS_MAX_RETRIES = int(os.getenv('TRENDS_MAX_RETRIES', '4'))  # retries of a throttled (429) request
+TRENDS_CIRCUIT_COOLDOWN_SECONDS = int(os.getenv('TRENDS_CIRCUIT_COOLDOWN_SECONDS', '300'))  # pause after repeated 429s
+TRENDS_CACHE_TTL_HOURS = float(os.getenv('TRENDS_CACHE_TTL_HOURS', '24'))  # reuse Trends responses this long (0 = no cache)
+TRENDS_CACHE_MAX_MB = int(os.getenv('TRENDS_CACHE_MAX_MB', '256'))  # response cache size before LRU eviction
+TRENDS_TRENDING_CACHE_TTL_MINUTES = float(os.getenv('TRENDS_TRENDING_CACHE_TTL_MINUTES', '60'))  # reuse daily trending searches this long
+TRENDS_REALTIME_CACHE_TTL_MINUTES = float(os.getenv('TRENDS_REALTIME_CACHE_TTL_MINUTES', '5'))  # reuse real-time trending searches this long
+TRENDS_REFRESH_OVERLAP_DAYS = int(os.getenv('TRENDS_REFRESH_OVERLAP_DAYS', '28'))  # stored history refetched to rescale incremental refreshes
+TRENDS_OUTPUT_COMPRESSION = os.getenv('TRENDS_OUTPUT_COMPRESSION', 'gzip').strip().lower() or None  # NDJSON run output: gzip, zstd or none
 
 # Data warehouse paths
 DATA_WAREHOUSE_DIR = BASE_DIR / 'data_warehouse'
 KEYWORDS_DIR = DATA_WAREHOUSE_DIR / 'keywords'
 IMAGES_DIR = DATA_WAREHOUSE_DIR / 'images'
 ARTICLES_DIR = DATA_WAREHOUSE_DIR / 'articles'
+EXPORTS_DIR = DATA_WAREHOUSE_DIR / 'exports'
+TRENDS_CACHE_FILE = DATA_WAREHOUSE_DIR / 'trends_cache.db'
+COLLECTION_JOURNAL_FILE = DATA_WAREHOUSE_DIR / 'collection_journal.db'
 
 # Create directories if they don't exist
-for directory in [DATA_WAREHOUSE_DIR, KEYWORDS_DIR, IMAGES_DIR, ARTICLES_DIR]:
+for directory in [DATA_WAREHOUSE_DIR, KEYWORDS_DIR, IMAGES_DIR, ARTICLES_DIR, EXPORTS_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
 # Logging settings
@@ -0,0 +1,137 @@
+"""
+Collection Run Journal
+
+This module checkpoints long collection runs to a local SQLite journal. Each
+completed unit of work (one Trends payload for a keyword group and timeframe,
+or one trending-searches call) is recorded with its result as soon as it
+finishes, so a run that crashes or is throttled out can be resumed without
+repeating the requests that already succeeded.
+"""
+
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional, Any
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from config.settings import COLLECTION_JOURNAL_FILE
+from data_collection.trends_cache import is_complete_response
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CollectionJournal:
+    """Persistent per-unit completion state and results of collection runs."""
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (or create) the journal file.
+        
+        Args:
+            path: SQLite file holding the journal (default: COLLECTION_JOURNAL_FILE)
+        """
+        self.path = Path(path or COLLECTION_JOURNAL_FILE)
+        self.run_id = None
+        self.recorded = 0
+        
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            )
+        ''')
+        self._connection.execute('''
+            CREATE TABLE IF NOT EXISTS units (
+                run_id TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                result BLOB NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run_id, unit)
+            )
+        ''')
+    
+    def _run_id(self, params: Dict[str, Any]) -> str:
+        """Identity of a run: hash of its canonical parameters."""
+        canonical = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+    
+    def open_run(self, params: Dict[str, Any], resume: bool = False) -> Dict[str, Any]:
+        """
+        Start a run, or pick up the unfinished run with the same parameters.
+        
+        Args:
+            params: Parameters identifying the run (keywords, timeframes, ...)
+            resume: Keep the units an earlier unfinished run completed; when
+                False any earlier state for these parameters is discarded
+        
+        Returns:
+            Mapping of completed unit name to its recorded result
+        """
+        run_id = self._run_id(params)
+        with self._lock:
+            row = self._connection.execute('SELECT finished_at FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+            if resume and row is not None and row[0] is None:
+                units = self._connection.execute(
+                    'SELECT unit, result FROM units WHERE run_id = ?', (run_id,)
+                ).fetchall()
+                completed = {unit: json.loads(zlib.decompress(result)) for unit, result in units}
+                logger.info(f"Resuming collection run {run_id}: {len(completed)} units already done")
+            else:
+                self._connection.execute('DELETE FROM units WHERE run_id = ?', (run_id,))
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO runs (run_id, params, started_at, finished_at) VALUES (?, ?, ?, NULL)',
+                    (run_id, json.dumps(params, sort_keys=True, default=str), time.time())
+                )
+                completed = {}
+                logger.info(f"Started collection run {run_id}")
+            self.run_id = run_id
+        return completed
+    
+    def record(self, unit: str, result: Any) -> bool:
+        """
+        Checkpoint a finished unit of the open run.
+        
+        Args:
+            unit: Unit name, unique within the run
+            result: JSON-serializable result of the unit
+        
+        Returns:
+            True if recorded, False if the result carries an error and the
+            unit must be retried
+        """
+        if not is_complete_response(result):
+            return False
+        payload = zlib.compress(json.dumps(result).encode('utf-8'))
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO units (run_id, unit, result, completed_at) VALUES (?, ?, ?, ?)',
+                (self.run_id, unit, payload, time.time())
+            )
+            self.recorded += 1
+        return True
+    
+    def finish_run(self):
+        """Mark the open run finished and drop its checkpointed results."""
+        with self._lock:
+            self._connection.execute('UPDATE runs SET finished_at = ? WHERE run_id = ?', (time.time(), self.run_id))
+            self._connection.execute('DELETE FROM units WHERE run_id = ?', (self.run_id,))
+        logger.info(f"Finished collection run {self.run_id}")
+    
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            self._connection.close()
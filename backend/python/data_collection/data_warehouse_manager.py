@@ -6,9 +6,16 @@ It includes methods for database operations, data validation, and data transform
 """
 
 import json
+import math
+import time
 import sqlite3
+import threading
+from itertools import repeat
 import psycopg2
-from typing import List, Dict, Optional, Any, Union
+from contextlib import contextmanager
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from typing import List, Dict, Optional, Any, Union, Iterable, Iterator, Sequence, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
@@ -16,29 +23,110 @@ import sys
 # Add the parent directory to the path so we can import our modules
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from config.settings import DATABASE_URL, BASE_DIR
+from config.settings import (
+    DATABASE_URL, BASE_DIR, WAREHOUSE_BATCH_SIZE,
+    WAREHOUSE_POOL_MIN_SIZE, WAREHOUSE_POOL_MAX_SIZE, SQLITE_BUSY_TIMEOUT_MS,
+    INTEREST_RETENTION_MONTHS, INTEREST_DOWNSAMPLE_AFTER_MONTHS, WAREHOUSE_FETCH_SIZE
+)
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Natural keys used for upserts: re-collecting the same day updates these rows in place
+NATURAL_KEYS = {
+    'keywords': ('keyword_id', 'source', 'snapshot_date'),
+    'trends': ('keyword_id', 'query', 'trend_type', 'timeframe', 'source', 'snapshot_date'),
+    'topics': ('keyword_id', 'topic_title', 'trend_type', 'timeframe', 'source', 'snapshot_date'),
+    'interest_over_time': ('keyword_id', 'date', 'timeframe', 'source'),
+    'trending_searches': ('search_term', 'location', 'source', 'snapshot_date')
+}
+
+# keywords/keyword_name predate keyword_dim and are no longer populated
+INTEREST_COLUMNS = (
+    'keyword_id', 'keywords', 'date', 'interest_value', 'keyword_name', 'is_partial',
+    'timeframe', 'source', 'timestamp', 'created_at'
+)
+
+# Upper bound on cached normalized-keyword -> keyword_dim id entries
+KEYWORD_ID_CACHE_SIZE = 500000
+
+# Matching stored keywords considered when building suggestions for a seed
+SUGGESTION_MATCH_LIMIT = 50
+
+# Per-month shard of interest_over_time (SQLite has no native partitioning)
+SQLITE_INTEREST_SHARD_DDL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword_id INTEGER,
+        keywords TEXT,
+        date TEXT NOT NULL,
+        interest_value INTEGER,
+        keyword_name TEXT,
+        is_partial BOOLEAN,
+        timeframe TEXT,
+        source TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+POSTGRESQL_INTEREST_DDL = '''
+    CREATE TABLE IF NOT EXISTS interest_over_time (
+        id SERIAL,
+        keyword_id INTEGER,
+        keywords TEXT,
+        date DATE NOT NULL,
+        interest_value INTEGER,
+        keyword_name VARCHAR(255),
+        is_partial BOOLEAN,
+        timeframe VARCHAR(20),
+        source VARCHAR(50) NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id, date)
+    ) PARTITION BY RANGE (date)
+'''
+
 class DataWarehouseManager:
     """Manages data storage and retrieval for the keyword data warehouse."""
     
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(self,
+                 database_url: Optional[str] = None,
+                 pool_min_size: Optional[int] = None,
+                 pool_max_size: Optional[int] = None):
         """
         Initialize the data warehouse manager.
         
+        The manager is safe to share between threads: PostgreSQL sessions are
+        drawn from a bounded connection pool and SQLite sessions use one WAL-mode
+        connection per thread.
+        
         Args:
             database_url: Database connection URL (optional, uses config default)
+            pool_min_size: PostgreSQL connections kept open (default: WAREHOUSE_POOL_MIN_SIZE)
+            pool_max_size: PostgreSQL connections at most (default: WAREHOUSE_POOL_MAX_SIZE)
         """
         self.database_url = database_url or DATABASE_URL
-        self.connection = None
+        self.dialect = 'postgresql' if self.database_url.startswith('postgresql') else 'sqlite'
+        self.pool_min_size = pool_min_size or WAREHOUSE_POOL_MIN_SIZE
+        self.pool_max_size = max(pool_max_size or WAREHOUSE_POOL_MAX_SIZE, self.pool_min_size)
+        self.db_path = None
+        self._pool = None
+        self._pool_slots = None
+        self._local = threading.local()
+        self._sqlite_connections = []
+        self._sqlite_lock = threading.Lock()
+        self._interest_months = set()
+        self._interest_lock = threading.Lock()
+        self._keyword_ids = {}
+        self._keyword_lock = threading.Lock()
+        self._keyword_search = 'like'
         self._initialize_database()
     
     def _initialize_database(self):
-        """Initialize the database connection and create tables if they don't exist."""
+        """Initialize the database connection layer and create tables if they don't exist."""
         try:
-            if self.database_url.startswith('sqlite'):
+            if self.dialect == 'sqlite':
                 # SQLite database (for development/testing)
                 db_path = self.database_url.replace('sqlite:///', '')
                 if db_path.startswith('./'):
@@ -48,14 +136,22 @@ class DataWarehouseManager:
                 
                 # Ensure directory exists
                 db_path.parent.mkdir(parents=True, exist_ok=True)
+                self.db_path = db_path
                 
-                self.connection = sqlite3.connect(str(db_path))
-                self._create_sqlite_tables()
+                with self.session() as conn:
+                    self._create_sqlite_tables(conn)
                 
-            elif self.database_url.startswith('postgresql'):
+            else:
                 # PostgreSQL database (for production)
-                self.connection = psycopg2.connect(self.database_url)
-                self._create_postgresql_tables()
+                self._pool = ThreadedConnectionPool(
+                    self.pool_min_size, self.pool_max_size, self.database_url
+                )
+                # ThreadedConnectionPool raises when exhausted; the semaphore makes
+                # callers wait for a free connection instead
+                self._pool_slots = threading.BoundedSemaphore(self.pool_max_size)
+                
+                with self.session() as conn:
+                    self._create_postgresql_tables(conn)
             
             logger.info("Database connection established successfully")
             
@@ -63,15 +159,121 @@ class DataWarehouseManager:
             logger.error(f"Failed to initialize database: {e}")
             raise
     
-    def _create_sqlite_tables(self):
+    def _sqlite_connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's SQLite connection, opening it on first use.
+        
+        Returns:
+            SQLite connection in WAL mode with a busy timeout
+        """
+        conn = getattr(self._local, 'sqlite_connection', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False
+            )
+            # WAL lets readers proceed while one writer commits; the busy timeout
+            # makes concurrent writers wait for the lock instead of failing
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+            self._local.sqlite_connection = conn
+            with self._sqlite_lock:
+                self._sqlite_connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def session(self):
+        """
+        Open a database session for the calling thread.
+        
+        Commits when the block exits normally and rolls back if it raises.
+        Nested sessions on the same thread reuse the outer connection and leave
+        the final commit to the outermost block.
+        
+        Yields:
+            DB-API connection
+        """
+        conn = getattr(self._local, 'session_connection', None)
+        if conn is not None:
+            self._local.session_depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.session_depth -= 1
+            return
+        
+        if self.dialect == 'sqlite':
+            conn = self._sqlite_connection()
+        else:
+            self._pool_slots.acquire()
+            try:
+                conn = self._pool.getconn()
+            except Exception:
+                self._pool_slots.release()
+                raise
+        
+        self._local.session_connection = conn
+        self._local.session_depth = 0
+        self._local.pending_keyword_ids = {}
+        try:
+            yield conn
+            self._commit(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.session_connection = None
+            # Ids of keyword_dim rows a rolled-back transaction inserted never reach the cache
+            self._local.pending_keyword_ids = None
+            if self.dialect == 'postgresql':
+                self._pool.putconn(conn)
+                self._pool_slots.release()
+    
+    def _commit(self, conn):
+        """
+        Commit the session's transaction and publish the keyword ids it inserted.
+        
+        Ids of keyword_dim rows inserted by an open transaction are kept per
+        session until it commits, so no other session can reference a row
+        that may still be rolled back.
+        
+        Args:
+            conn: The session's connection
+        """
+        conn.commit()
+        pending = getattr(self._local, 'pending_keyword_ids', None)
+        if pending:
+            self._cache_keyword_ids(pending)
+            pending.clear()
+    
+    def _cache_keyword_ids(self, ids: Dict[str, int]):
+        """Add committed keyword_dim ids to the shared cache, emptying it when full."""
+        with self._keyword_lock:
+            if len(self._keyword_ids) + len(ids) > KEYWORD_ID_CACHE_SIZE:
+                self._keyword_ids.clear()
+            self._keyword_ids.update(ids)
+    
+    def _create_sqlite_tables(self, conn):
         """Create SQLite tables for keyword data."""
-        cursor = self.connection.cursor()
+        cursor = conn.cursor()
+        
+        # Keyword dimension: one row per normalized keyword, referenced by keyword_id
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_dim (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                keyword TEXT NOT NULL,
+                normalized TEXT NOT NULL UNIQUE,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
         
         # Keywords table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS keywords (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword TEXT NOT NULL,
+                keyword_id INTEGER NOT NULL,
                 avg_monthly_searches INTEGER,
                 competition TEXT,
                 competition_index INTEGER,
@@ -79,7 +281,9 @@ class DataWarehouseManager:
                 high_top_of_page_bid_micros INTEGER,
                 source TEXT NOT NULL,
                 seed_keywords TEXT,
+                snapshot_date TEXT,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -88,12 +292,13 @@ class DataWarehouseManager:
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trends (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword TEXT NOT NULL,
+                keyword_id INTEGER NOT NULL,
                 query TEXT,
                 value INTEGER,
                 trend_type TEXT,
                 timeframe TEXT,
                 source TEXT NOT NULL,
+                snapshot_date TEXT,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
@@ -103,33 +308,20 @@ class DataWarehouseManager:
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS topics (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword TEXT NOT NULL,
+                keyword_id INTEGER NOT NULL,
                 topic_title TEXT,
                 topic_type TEXT,
                 value INTEGER,
                 trend_type TEXT,
                 timeframe TEXT,
                 source TEXT NOT NULL,
+                snapshot_date TEXT,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
-        # Interest over time table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interest_over_time (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keywords TEXT NOT NULL,
-                date TEXT NOT NULL,
-                interest_value INTEGER,
-                keyword_name TEXT,
-                is_partial BOOLEAN,
-                timeframe TEXT,
-                source TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Interest over time is month-partitioned, see _setup_interest_partitioning()
         
         # Trending searches table
         cursor.execute('''
@@ -143,33 +335,76 @@ class DataWarehouseManager:
                 articles TEXT,
                 location TEXT,
                 source TEXT NOT NULL,
+                snapshot_date TEXT,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords(keyword)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_source ON keywords(source)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_timestamp ON keywords(timestamp)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_keyword ON trends(keyword)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_source ON trends(source)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_topics_keyword ON topics(keyword)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_interest_keywords ON interest_over_time(keywords)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_trending_rank ON trending_searches(rank)')
         
-        self.connection.commit()
+        # Registry of interest_over_time month partitions
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS interest_partitions (
+                month VARCHAR(7) PRIMARY KEY,
+                table_name VARCHAR(64) NOT NULL,
+                granularity VARCHAR(10) DEFAULT 'raw',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Daily per-keyword search volume, refreshed incrementally from keywords
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_daily_rollup (
+                keyword_id INTEGER NOT NULL,
+                day DATE NOT NULL,
+                sum_searches BIGINT,
+                observations INTEGER,
+                last_seen TIMESTAMP,
+                PRIMARY KEY (keyword_id, day)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_keyword_daily_rollup_day ON keyword_daily_rollup(day)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rollup_watermarks (
+                name VARCHAR(64) PRIMARY KEY,
+                high_water TIMESTAMP,
+                refreshed_at TIMESTAMP
+            )
+        ''')
+        
+        self._migrate_keyword_dim(cursor)
+        self._migrate_natural_keys(cursor)
+        self._setup_interest_partitioning(cursor)
+        self._setup_keyword_search(cursor)
+        self._setup_trending_rollup(cursor)
+        
+        conn.commit()
         logger.info("SQLite tables created successfully")
     
-    def _create_postgresql_tables(self):
+    def _create_postgresql_tables(self, conn):
         """Create PostgreSQL tables for keyword data."""
-        cursor = self.connection.cursor()
+        cursor = conn.cursor()
+        
+        # Keyword dimension: one row per normalized keyword, referenced by keyword_id
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_dim (
+                id SERIAL PRIMARY KEY,
+                keyword VARCHAR(255) NOT NULL,
+                normalized VARCHAR(255) NOT NULL UNIQUE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
         
         # Keywords table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS keywords (
                 id SERIAL PRIMARY KEY,
-                keyword VARCHAR(255) NOT NULL,
+                keyword_id INTEGER NOT NULL,
                 avg_monthly_searches INTEGER,
                 competition VARCHAR(50),
                 competition_index INTEGER,
@@ -177,7 +412,9 @@ class DataWarehouseManager:
                 high_top_of_page_bid_micros BIGINT,
                 source VARCHAR(50) NOT NULL,
                 seed_keywords TEXT,
+                snapshot_date DATE,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -186,12 +423,13 @@ class DataWarehouseManager:
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trends (
                 id SERIAL PRIMARY KEY,
-                keyword VARCHAR(255) NOT NULL,
+                keyword_id INTEGER NOT NULL,
                 query TEXT,
                 value INTEGER,
                 trend_type VARCHAR(20),
                 timeframe VARCHAR(20),
                 source VARCHAR(50) NOT NULL,
+                snapshot_date DATE,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -201,33 +439,20 @@ class DataWarehouseManager:
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS topics (
                 id SERIAL PRIMARY KEY,
-                keyword VARCHAR(255) NOT NULL,
+                keyword_id INTEGER NOT NULL,
                 topic_title TEXT,
                 topic_type VARCHAR(50),
                 value INTEGER,
                 trend_type VARCHAR(20),
                 timeframe VARCHAR(20),
                 source VARCHAR(50) NOT NULL,
+                snapshot_date DATE,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
-        # Interest over time table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interest_over_time (
-                id SERIAL PRIMARY KEY,
-                keywords TEXT NOT NULL,
-                date DATE NOT NULL,
-                interest_value INTEGER,
-                keyword_name VARCHAR(255),
-                is_partial BOOLEAN,
-                timeframe VARCHAR(20),
-                source VARCHAR(50) NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Interest over time is month-partitioned, see _setup_interest_partitioning()
         
         # Trending searches table
         cursor.execute('''
@@ -241,45 +466,1082 @@ class DataWarehouseManager:
                 articles JSONB,
                 location VARCHAR(10),
                 source VARCHAR(50) NOT NULL,
+                snapshot_date DATE,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords(keyword)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_source ON keywords(source)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_timestamp ON keywords(timestamp)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_keyword ON trends(keyword)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_source ON trends(source)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_topics_keyword ON topics(keyword)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_interest_keywords ON interest_over_time(keywords)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_trending_rank ON trending_searches(rank)')
         
-        self.connection.commit()
+        # Registry of interest_over_time month partitions
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS interest_partitions (
+                month VARCHAR(7) PRIMARY KEY,
+                table_name VARCHAR(64) NOT NULL,
+                granularity VARCHAR(10) DEFAULT 'raw',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Daily per-keyword search volume, refreshed incrementally from keywords
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_daily_rollup (
+                keyword_id INTEGER NOT NULL,
+                day DATE NOT NULL,
+                sum_searches BIGINT,
+                observations INTEGER,
+                last_seen TIMESTAMP,
+                PRIMARY KEY (keyword_id, day)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_keyword_daily_rollup_day ON keyword_daily_rollup(day)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rollup_watermarks (
+                name VARCHAR(64) PRIMARY KEY,
+                high_water TIMESTAMP,
+                refreshed_at TIMESTAMP
+            )
+        ''')
+        
+        self._migrate_keyword_dim(cursor)
+        self._migrate_natural_keys(cursor)
+        self._setup_interest_partitioning(cursor)
+        self._setup_keyword_search(cursor)
+        self._setup_trending_rollup(cursor)
+        
+        conn.commit()
         logger.info("PostgreSQL tables created successfully")
     
-    def store_keywords(self, keywords: List[Dict]) -> bool:
+    def _column_exists(self, cursor, table: str, column: str) -> bool:
+        """Check whether a table already has a column."""
+        if self.dialect == 'postgresql':
+            cursor.execute(
+                'SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = %s',
+                (table, column)
+            )
+            return cursor.fetchone() is not None
+        cursor.execute(f'PRAGMA table_info({table})')
+        return any(row[1] == column for row in cursor.fetchall())
+    
+    def _table_exists(self, cursor, table: str) -> bool:
+        """Check whether a table already exists."""
+        if self.dialect == 'postgresql':
+            cursor.execute('SELECT 1 FROM information_schema.tables WHERE table_name = %s', (table,))
+        else:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        return cursor.fetchone() is not None
+    
+    def _index_exists(self, cursor, index: str) -> bool:
+        """Check whether an index already exists."""
+        if self.dialect == 'postgresql':
+            cursor.execute('SELECT 1 FROM pg_indexes WHERE indexname = %s', (index,))
+        else:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,))
+        return cursor.fetchone() is not None
+    
+    def _migrate_natural_keys(self, cursor):
         """
-        Store keyword data in the database.
+        Bring existing tables up to the natural-key schema.
+        
+        Adds and backfills `snapshot_date` on databases created before it existed,
+        collapses duplicate rows to the most recent one per natural key, and
+        creates the unique indexes that back `ON CONFLICT` upserts.
+        """
+        date_type = 'DATE' if self.dialect == 'postgresql' else 'TEXT'
+        snapshot_expr = 'CAST(timestamp AS DATE)' if self.dialect == 'postgresql' else 'substr(timestamp, 1, 10)'
+        
+        for table, key in NATURAL_KEYS.items():
+            index = f'uq_{table}_natural_key'
+            if table == 'interest_over_time' or self._index_exists(cursor, index):
+                # interest_over_time keys are created with its partitions
+                continue
+            
+            if 'snapshot_date' in key:
+                if not self._column_exists(cursor, table, 'snapshot_date'):
+                    cursor.execute(f'ALTER TABLE {table} ADD COLUMN snapshot_date {date_type}')
+                cursor.execute(f'UPDATE {table} SET snapshot_date = {snapshot_expr} WHERE snapshot_date IS NULL')
+            
+            key_list = ', '.join(key)
+            cursor.execute(f'''
+                DELETE FROM {table}
+                WHERE id NOT IN (SELECT MAX(id) FROM {table} GROUP BY {key_list})
+            ''')
+            if cursor.rowcount and cursor.rowcount > 0:
+                logger.info(f"Collapsed {cursor.rowcount} duplicate rows in {table}")
+            cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table}({key_list})')
+    
+    def _normalize_keyword(self, keyword: Any) -> str:
+        """Normalized keyword_dim form: lowercase with collapsed whitespace."""
+        return ' '.join(str(keyword).lower().split())
+    
+    def _fetch_keyword_ids(self, cursor, forms: Iterable[str], inserted: bool = False) -> Dict[str, int]:
+        """
+        Look up the keyword_dim ids of normalized forms, from the caches or the table.
         
         Args:
-            keywords: List of keyword dictionaries
+            cursor: Open database cursor
+            forms: Normalized keyword forms
+            inserted: The forms were just inserted by this session's transaction;
+                their ids are cached for the session only until it commits
             
         Returns:
-            True if successful, False otherwise
+            Mapping of each form already in keyword_dim to its id
+        """
+        forms = set(forms)
+        pending = getattr(self._local, 'pending_keyword_ids', None)
+        with self._keyword_lock:
+            resolved = {form: self._keyword_ids[form] for form in forms if form in self._keyword_ids}
+        if pending:
+            resolved.update((form, pending[form]) for form in forms if form in pending)
+        
+        found = {}
+        for chunk in self._chunked([form for form in forms if form not in resolved], 500):
+            placeholders = ', '.join('?' for _ in chunk)
+            cursor.execute(
+                self._sql(f'SELECT normalized, id FROM keyword_dim WHERE normalized IN ({placeholders})'),
+                chunk
+            )
+            found.update(cursor.fetchall())
+        
+        if found:
+            if inserted and pending is not None:
+                pending.update(found)
+            else:
+                self._cache_keyword_ids(found)
+        resolved.update(found)
+        return resolved
+    
+    def _lookup_keyword_ids(self, cursor, keywords: Iterable[str]) -> Dict[str, int]:
+        """
+        Map keyword texts to existing keyword_dim ids without creating rows, for reads.
+        
+        Args:
+            cursor: Open database cursor
+            keywords: Keyword texts (duplicates and case variants are fine)
+            
+        Returns:
+            Mapping of each given text that is already known to its keyword id
+        """
+        normalized = {text: self._normalize_keyword(text) for text in set(keywords) if text is not None}
+        ids = self._fetch_keyword_ids(cursor, normalized.values())
+        return {text: ids[form] for text, form in normalized.items() if form in ids}
+    
+    def _resolve_keyword_ids(self, cursor, keywords: Iterable[str]) -> Dict[str, int]:
+        """
+        Map keyword texts to keyword_dim ids, creating dimension rows as needed.
+        
+        Args:
+            cursor: Open database cursor
+            keywords: Keyword texts (duplicates and case variants are fine)
+            
+        Returns:
+            Mapping of each given (non-None) text to its keyword id
+        """
+        normalized = {text: self._normalize_keyword(text) for text in set(keywords) if text is not None}
+        resolved = self._fetch_keyword_ids(cursor, normalized.values())
+        
+        missing = {}
+        for text, form in normalized.items():
+            if form not in resolved:
+                missing.setdefault(form, text)
+        
+        if missing:
+            # Insert in normalized order so concurrent writers take unique-index locks in the same order
+            rows = sorted(((text, form) for form, text in missing.items()), key=lambda row: row[1])
+            for chunk in self._chunked(rows, WAREHOUSE_BATCH_SIZE):
+                self._bulk_insert(cursor, 'keyword_dim', ('keyword', 'normalized'), chunk, upsert=False, key=('normalized',))
+            resolved.update(self._fetch_keyword_ids(cursor, missing, inserted=True))
+        
+        return {text: resolved[form] for text, form in normalized.items()}
+    
+    def _backfill_keyword_ids(self, cursor, table: str, text_column: str):
+        """
+        Fill keyword_id on existing rows from their keyword text column.
+        
+        Args:
+            cursor: Open database cursor
+            table: Fact table to backfill
+            text_column: Column holding the keyword text
+        """
+        cursor.execute(f'SELECT DISTINCT {text_column} FROM {table} WHERE keyword_id IS NULL AND {text_column} IS NOT NULL')
+        texts = [row[0] for row in cursor.fetchall()]
+        if not texts:
+            return
+        keyword_ids = self._resolve_keyword_ids(cursor, texts)
+        
+        # Join through a keyed temp table so the update is one pass over the fact table
+        cursor.execute('CREATE TEMP TABLE IF NOT EXISTS keyword_id_map (keyword_text TEXT PRIMARY KEY, keyword_id INTEGER)')
+        cursor.execute('DELETE FROM keyword_id_map')
+        for chunk in self._chunked(keyword_ids.items(), WAREHOUSE_BATCH_SIZE):
+            self._bulk_insert(cursor, 'keyword_id_map', ('keyword_text', 'keyword_id'), chunk)
+        cursor.execute(f'''
+            UPDATE {table} SET keyword_id = (
+                SELECT keyword_id FROM keyword_id_map WHERE keyword_text = {table}.{text_column}
+            )
+            WHERE keyword_id IS NULL
+        ''')
+        cursor.execute('DROP TABLE keyword_id_map')
+    
+    def _migrate_keyword_dim(self, cursor):
+        """
+        Move fact tables created before keyword_dim onto integer keyword ids.
+        
+        Adds and backfills keyword_id, swaps text-based natural keys and lookup
+        indexes for keyword_id ones, and drops the per-row keyword text (and
+        clears the JSON keyword list from interest_over_time), which the id
+        replaces. Dropping a column needs SQLite 3.35 or later.
+        """
+        for table in ('keywords', 'trends', 'topics'):
+            if not self._column_exists(cursor, table, 'keyword_id'):
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN keyword_id INTEGER')
+                # Recreated on keyword_id by _migrate_natural_keys()
+                cursor.execute(f'DROP INDEX IF EXISTS uq_{table}_natural_key')
+                logger.info(f"Linked {table} to keyword_dim")
+            cursor.execute(f'DROP INDEX IF EXISTS idx_{table}_keyword')
+            if self._column_exists(cursor, table, 'keyword'):
+                self._backfill_keyword_ids(cursor, table, 'keyword')
+                cursor.execute(f'ALTER TABLE {table} DROP COLUMN keyword')
+                logger.info(f"Dropped keyword text from {table}, now read from keyword_dim")
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_keyword_id ON {table}(keyword_id)')
+        
+        kind = self._interest_storage_kind(cursor)
+        if kind is None:
+            return
+        if kind == 'legacy':
+            # The plain table is re-keyed when it is moved into partitions
+            interest_tables = ['interest_over_time']
+        elif self.dialect == 'postgresql':
+            interest_tables = ['interest_over_time']
+        else:
+            cursor.execute('SELECT table_name FROM interest_partitions ORDER BY month')
+            interest_tables = [row[0] for row in cursor.fetchall()]
+        
+        migrated = False
+        for table in interest_tables:
+            if self._column_exists(cursor, table, 'keyword_id'):
+                continue
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN keyword_id INTEGER')
+            self._backfill_keyword_ids(cursor, table, 'keyword_name')
+            
+            if kind == 'partitioned':
+                cursor.execute(f'UPDATE {table} SET keywords = NULL, keyword_name = NULL')
+                cursor.execute(f'DROP INDEX IF EXISTS uq_{table}_natural_key')
+                cursor.execute(f'DROP INDEX IF EXISTS idx_{table}_keyword_date')
+                cursor.execute('DROP INDEX IF EXISTS idx_interest_keyword_date')
+                # Case variants of a keyword now share an id; keep the newest point
+                key_list = ', '.join(NATURAL_KEYS['interest_over_time'])
+                cursor.execute(f'''
+                    DELETE FROM {table}
+                    WHERE id NOT IN (SELECT MAX(id) FROM {table} GROUP BY {key_list})
+                ''')
+                self._create_interest_indexes(cursor, table)
+            migrated = True
+        
+        if migrated:
+            if kind == 'partitioned' and self.dialect == 'sqlite':
+                self._refresh_interest_view(cursor)
+            logger.info("Linked interest_over_time to keyword_dim")
+    
+    def _setup_keyword_search(self, cursor):
+        """
+        Create the substring/fuzzy search index over keyword_dim.
+        
+        SQLite uses an FTS5 trigram table kept in sync by triggers; PostgreSQL
+        uses a pg_trgm GIN index. When neither is available (old SQLite build,
+        no privilege to create the extension) search falls back to LIKE scans
+        over keyword_dim.
+        """
+        if self.dialect == 'postgresql':
+            cursor.execute('SAVEPOINT keyword_search')
+            try:
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                cursor.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_keyword_dim_trgm ON keyword_dim USING GIN (normalized gin_trgm_ops)'
+                )
+                cursor.execute('RELEASE SAVEPOINT keyword_search')
+                self._keyword_search = 'trigram'
+            except psycopg2.Error as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT keyword_search')
+                logger.warning(f"pg_trgm unavailable, keyword search falls back to ILIKE: {e}")
+                self._keyword_search = 'like'
+            return
+        
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'keyword_dim_fts'")
+        if cursor.fetchone() is not None:
+            self._keyword_search = 'trigram'
+            return
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE keyword_dim_fts USING fts5(
+                    normalized, content='keyword_dim', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 trigram tokenizer unavailable, keyword search falls back to LIKE: {e}")
+            self._keyword_search = 'like'
+            return
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS keyword_dim_fts_insert AFTER INSERT ON keyword_dim BEGIN
+                INSERT INTO keyword_dim_fts(rowid, normalized) VALUES (new.id, new.normalized);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS keyword_dim_fts_delete AFTER DELETE ON keyword_dim BEGIN
+                INSERT INTO keyword_dim_fts(keyword_dim_fts, rowid, normalized) VALUES ('delete', old.id, old.normalized);
+            END
+        ''')
+        # Index keywords that were stored before the search table existed
+        cursor.execute("INSERT INTO keyword_dim_fts(keyword_dim_fts) VALUES ('rebuild')")
+        self._keyword_search = 'trigram'
+    
+    def _trigrams(self, text: str) -> set:
+        """Padded character trigrams of a string, as pg_trgm builds them per word."""
+        grams = set()
+        for word in text.split():
+            padded = f'  {word} '
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return grams
+    
+    def _min_shared_trigrams(self, normalized: str, min_similarity: float) -> int:
+        """
+        Fewest in-word trigrams a keyword can share with a query and still reach `min_similarity`.
+        
+        A keyword at similarity s shares at least s * |query trigrams| padded
+        trigrams; all but the word-edge ones (which hold a space) are in-word
+        trigrams the FTS index can count.
+        """
+        grams = self._trigrams(normalized)
+        edges = sum(1 for gram in grams if ' ' in gram)
+        return max(1, math.ceil(min_similarity * len(grams)) - edges)
+    
+    def _similarity(self, left: str, right: str) -> float:
+        """Trigram similarity between two strings (same measure as pg_trgm's similarity())."""
+        left_grams, right_grams = self._trigrams(left), self._trigrams(right)
+        if not left_grams or not right_grams:
+            return 0.0
+        return len(left_grams & right_grams) / len(left_grams | right_grams)
+    
+    def _postgres_search_query(self, normalized: str, fuzzy: bool, limit: int) -> Tuple[str, List[Any]]:
+        """
+        Build the keyword_dim search for PostgreSQL.
+        
+        Both filters are operators the trigram GIN index serves (combined with a
+        BitmapOr); similarity() is only computed to rank the rows they return.
+        Fuzzy matching relies on pg_trgm.similarity_threshold being set first.
+        
+        Returns:
+            (SQL, parameters)
+        """
+        condition = 'normalized LIKE %s'
+        params = [f'%{normalized}%']
+        order = ''
+        if self._keyword_search == 'trigram':
+            if fuzzy:
+                condition += ' OR normalized %% %s'
+                params.append(normalized)
+            order = 'ORDER BY similarity(normalized, %s) DESC'
+            params.append(normalized)
+        query = f'''
+            SELECT id, keyword, normalized
+            FROM keyword_dim
+            WHERE {condition}
+            {order}
+            LIMIT %s
+        '''
+        return query, params + [limit]
+    
+    def search_keywords(self,
+                        query: str,
+                        limit: int = 50,
+                        fuzzy: bool = True,
+                        min_similarity: float = 0.3) -> List[Dict]:
+        """
+        Find stored keywords containing, or resembling, a search string.
+        
+        Substring matches always qualify; with `fuzzy`, keywords whose trigram
+        similarity reaches `min_similarity` qualify too (catching typos and
+        reordered words). Both paths are served by the trigram index.
+        
+        Args:
+            query: Search string
+            limit: Maximum number of matches
+            fuzzy: Also return similar, non-substring matches
+            min_similarity: Similarity threshold for fuzzy matches (0-1)
+            
+        Returns:
+            List of {'keyword_id', 'keyword', 'similarity'} dictionaries, most similar first
+        """
+        normalized = self._normalize_keyword(query)
+        if not normalized:
+            return []
+        
+        try:
+            with self.session() as conn:
+                cursor = conn.cursor()
+                
+                if self.dialect == 'postgresql':
+                    if fuzzy and self._keyword_search == 'trigram':
+                        # `%` compares against pg_trgm.similarity_threshold; scope it to this transaction
+                        cursor.execute(
+                            "SELECT set_config('pg_trgm.similarity_threshold', %s, true)", (str(min_similarity),)
+                        )
+                    cursor.execute(*self._postgres_search_query(normalized, fuzzy, limit))
+                    candidates = cursor.fetchall()
+                
+                elif self._keyword_search == 'trigram' and len(normalized) >= 3:
+                    phrase = '"' + normalized.replace('"', '""') + '"'
+                    cursor.execute('''
+                        SELECT d.id, d.keyword, d.normalized
+                        FROM keyword_dim_fts f JOIN keyword_dim d ON d.id = f.rowid
+                        WHERE keyword_dim_fts MATCH ?
+                        ORDER BY f.rank
+                        LIMIT ?
+                    ''', (phrase, limit * 5))
+                    candidates = cursor.fetchall()
+                    
+                    if fuzzy:
+                        # Candidates are the keywords sharing the most trigrams with the query,
+                        # counted per row from each trigram's posting list
+                        grams = sorted({normalized[i:i + 3] for i in range(len(normalized) - 2)})
+                        shared = ' UNION ALL '.join(
+                            'SELECT rowid AS id FROM keyword_dim_fts WHERE keyword_dim_fts MATCH ?' for _ in grams
+                        )
+                        cursor.execute(f'''
+                            SELECT d.id, d.keyword, d.normalized
+                            FROM (
+                                SELECT id, COUNT(*) AS shared FROM ({shared})
+                                GROUP BY id HAVING COUNT(*) >= ?
+                                ORDER BY shared DESC
+                                LIMIT ?
+                            ) m JOIN keyword_dim d ON d.id = m.id
+                        ''', ['"' + gram.replace('"', '""') + '"' for gram in grams]
+                             + [self._min_shared_trigrams(normalized, min_similarity), limit * 20])
+                        candidates += cursor.fetchall()
+                
+                else:
+                    cursor.execute(
+                        "SELECT id, keyword, normalized FROM keyword_dim WHERE normalized LIKE ? LIMIT ?",
+                        (f'%{normalized}%', limit * 5)
+                    )
+                    candidates = cursor.fetchall()
+            
+            matches = {}
+            for row in candidates:
+                keyword_id, keyword, candidate = row[0], row[1], row[2]
+                similarity = self._similarity(normalized, candidate)
+                if normalized not in candidate and similarity < min_similarity:
+                    continue
+                matches[keyword_id] = {
+                    'keyword_id': keyword_id,
+                    'keyword': keyword,
+                    'similarity': round(similarity, 4)
+                }
+            
+            results = sorted(matches.values(), key=lambda match: match['similarity'], reverse=True)[:limit]
+            logger.info(f"Found {len(results)} keyword matches for: {query}")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error searching keywords for {query}: {e}")
+            return []
+    
+    def _interest_partition_name(self, month: str) -> str:
+        """Table name of the interest_over_time partition for a 'YYYY-MM' month."""
+        return f"interest_over_time_p{month.replace('-', '')}"
+    
+    def _next_month(self, month: str) -> str:
+        """Return the 'YYYY-MM' month after the given one."""
+        year, month_number = (int(part) for part in month.split('-'))
+        if month_number == 12:
+            return f'{year + 1:04d}-01'
+        return f'{year:04d}-{month_number + 1:02d}'
+    
+    def _interest_storage_kind(self, cursor) -> Optional[str]:
+        """
+        Detect how interest_over_time is stored.
+        
+        Returns:
+            'partitioned', 'legacy' for a pre-partitioning plain table, or None
+        """
+        if self.dialect == 'postgresql':
+            cursor.execute("SELECT relkind FROM pg_class WHERE relname = 'interest_over_time'")
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return 'partitioned' if row[0] == 'p' else 'legacy'
+        
+        cursor.execute("SELECT type FROM sqlite_master WHERE name = 'interest_over_time'")
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return 'partitioned' if row[0] == 'view' else 'legacy'
+    
+    def _setup_interest_partitioning(self, cursor):
+        """
+        Create month-partitioned interest_over_time storage, migrating a legacy table.
+        
+        PostgreSQL uses a native `PARTITION BY RANGE (date)` table. SQLite stores
+        one shard table per month behind an `interest_over_time` view that unions
+        them, so existing readers keep working while writes, range scans and
+        retention operate on individual months.
+        """
+        kind = self._interest_storage_kind(cursor)
+        if kind == 'partitioned':
+            cursor.execute('SELECT month FROM interest_partitions')
+            with self._interest_lock:
+                self._interest_months.update(row[0] for row in cursor.fetchall())
+            return
+        
+        if kind == 'legacy':
+            cursor.execute('DROP INDEX IF EXISTS idx_interest_keywords')
+            cursor.execute('DROP INDEX IF EXISTS uq_interest_over_time_natural_key')
+            cursor.execute('ALTER TABLE interest_over_time RENAME TO interest_over_time_legacy')
+        
+        if self.dialect == 'postgresql':
+            cursor.execute(POSTGRESQL_INTEREST_DDL)
+            self._create_interest_indexes(cursor, 'interest_over_time')
+        else:
+            self._refresh_interest_view(cursor)
+        
+        if kind == 'legacy':
+            month_expr = "to_char(date, 'YYYY-MM')" if self.dialect == 'postgresql' else 'substr(date, 1, 7)'
+            cursor.execute(f'SELECT DISTINCT {month_expr} FROM interest_over_time_legacy')
+            months = [row[0] for row in cursor.fetchall() if row[0]]
+            self._ensure_interest_partitions(cursor, months)
+            
+            column_list = ', '.join(INTEREST_COLUMNS)
+            # The keyword text columns are superseded by keyword_id and not carried over
+            select_list = ', '.join(
+                'NULL' if column in ('keywords', 'keyword_name') else column for column in INTEREST_COLUMNS
+            )
+            key_list = ', '.join(NATURAL_KEYS['interest_over_time'])
+            # Newest rows first so the most recent value wins each natural key
+            if self.dialect == 'postgresql':
+                cursor.execute(f'''
+                    INSERT INTO interest_over_time ({column_list})
+                    SELECT {select_list} FROM interest_over_time_legacy
+                    ORDER BY id DESC
+                    ON CONFLICT ({key_list}) DO NOTHING
+                ''')
+            else:
+                for month in months:
+                    cursor.execute(f'''
+                        INSERT INTO {self._interest_partition_name(month)} ({column_list})
+                        SELECT {select_list} FROM interest_over_time_legacy
+                        WHERE substr(date, 1, 7) = ?
+                        ORDER BY id DESC
+                        ON CONFLICT ({key_list}) DO NOTHING
+                    ''', (month,))
+            cursor.execute('DROP TABLE interest_over_time_legacy')
+            logger.info(f"Migrated interest_over_time into {len(months)} monthly partitions")
+    
+    def _create_interest_indexes(self, cursor, table: str):
+        """
+        Create the natural-key and (keyword_id, date) indexes on interest storage.
+        
+        Args:
+            cursor: Open database cursor
+            table: PostgreSQL parent table or SQLite month shard
+        """
+        key_list = ', '.join(NATURAL_KEYS['interest_over_time'])
+        cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS uq_{table}_natural_key ON {table}({key_list})')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_keyword_date ON {table}(keyword_id, date)')
+    
+    def _create_interest_partition(self, cursor, month: str):
+        """Create the partition for one 'YYYY-MM' month and record it in the registry."""
+        table = self._interest_partition_name(month)
+        if self.dialect == 'postgresql':
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} PARTITION OF interest_over_time
+                FOR VALUES FROM ('{month}-01') TO ('{self._next_month(month)}-01')
+            ''')
+            cursor.execute(
+                'INSERT INTO interest_partitions (month, table_name) VALUES (%s, %s) ON CONFLICT (month) DO NOTHING',
+                (month, table)
+            )
+        else:
+            cursor.execute(SQLITE_INTEREST_SHARD_DDL.format(table=table))
+            self._create_interest_indexes(cursor, table)
+            cursor.execute(
+                'INSERT INTO interest_partitions (month, table_name) VALUES (?, ?) ON CONFLICT (month) DO NOTHING',
+                (month, table)
+            )
+    
+    def _ensure_interest_partitions(self, cursor, months: Iterable[str]):
+        """
+        Make sure a partition exists for every given month.
+        
+        Args:
+            cursor: Open database cursor
+            months: 'YYYY-MM' months about to receive rows
+        """
+        with self._interest_lock:
+            missing = sorted(set(months) - self._interest_months)
+        if not missing:
+            return
+        
+        for month in missing:
+            self._create_interest_partition(cursor, month)
+        if self.dialect == 'sqlite':
+            self._refresh_interest_view(cursor)
+        
+        with self._interest_lock:
+            self._interest_months.update(missing)
+    
+    def _refresh_interest_view(self, cursor):
+        """Rebuild the SQLite interest_over_time view over all month shards."""
+        cursor.execute('SELECT table_name FROM interest_partitions ORDER BY month')
+        tables = [row[0] for row in cursor.fetchall()]
+        columns = ('id',) + INTEREST_COLUMNS
+        if tables:
+            column_list = ', '.join(columns)
+            body = ' UNION ALL '.join(f'SELECT {column_list} FROM {table}' for table in tables)
+        else:
+            body = 'SELECT ' + ', '.join(f'NULL AS {column}' for column in columns) + ' WHERE 0'
+        cursor.execute('DROP VIEW IF EXISTS interest_over_time')
+        cursor.execute(f'CREATE VIEW interest_over_time AS {body}')
+    
+    def _interest_tables_between(self, cursor, start: Optional[str], end: Optional[str]) -> List[str]:
+        """
+        List the SQLite shard tables overlapping a date range.
+        
+        Args:
+            cursor: Open database cursor
+            start: Inclusive ISO start date (optional)
+            end: Inclusive ISO end date (optional)
+            
+        Returns:
+            Shard table names in month order
+        """
+        cursor.execute('SELECT month, table_name FROM interest_partitions ORDER BY month')
+        return [
+            table for month, table in cursor.fetchall()
+            if (start is None or month >= start[:7]) and (end is None or month <= end[:7])
+        ]
+    
+    def _store_interest_rows(self,
+                             cursor,
+                             columns: Sequence[str],
+                             rows: List[Sequence],
+                             batch_size: int,
+                             upsert: Optional[bool]):
+        """
+        Write interest_over_time rows into their month partitions.
+        
+        Args:
+            cursor: Open database cursor
+            columns: Column names, in row order (must include 'date')
+            rows: Row tuples
+            batch_size: Maximum rows per bulk statement
+            upsert: Conflict handling, as for _bulk_insert
+        """
+        date_index = columns.index('date')
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(str(row[date_index])[:7], []).append(row)
+        self._ensure_interest_partitions(cursor, by_month.keys())
+        
+        key = NATURAL_KEYS['interest_over_time']
+        for month, month_rows in by_month.items():
+            # PostgreSQL routes rows through the parent; SQLite writes the shard directly
+            table = 'interest_over_time' if self.dialect == 'postgresql' else self._interest_partition_name(month)
+            for chunk in self._chunked(month_rows, batch_size):
+                self._bulk_insert(cursor, table, columns, chunk, upsert=upsert, key=key)
+    
+    def get_interest_series(self,
+                            keyword: str,
+                            start: Optional[str] = None,
+                            end: Optional[str] = None,
+                            timeframe: Optional[str] = None) -> List[Dict]:
+        """
+        Get one keyword's interest-over-time series within a date range.
+        
+        Only the partitions overlapping the range are scanned, and each is
+        searched through its (keyword_id, date) index.
+        
+        Args:
+            keyword: Keyword to look up
+            start: Inclusive ISO start date (optional)
+            end: Inclusive ISO end date (optional)
+            timeframe: Restrict to one collection timeframe (optional)
+            
+        Returns:
+            List of data point dictionaries ordered by date
         """
+        conditions = ['keyword_id = ?']
+        params = []
+        if start:
+            conditions.append('date >= ?')
+            params.append(start[:10])
+        if end:
+            # Dates may carry a time component on SQLite, so compare against the next day
+            conditions.append('date < ?')
+            params.append((datetime.fromisoformat(end[:10]) + timedelta(days=1)).date().isoformat())
+        if timeframe:
+            conditions.append('timeframe = ?')
+            params.append(timeframe)
+        where = ' AND '.join(conditions)
+        select = 'SELECT date, interest_value, is_partial, timeframe, source FROM {table} WHERE ' + where
+        
         try:
-            cursor = self.connection.cursor()
+            with self.session() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    self._sql('SELECT id FROM keyword_dim WHERE normalized = ?'),
+                    (self._normalize_keyword(keyword),)
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    return []
+                params.insert(0, row[0])
+                
+                if self.dialect == 'postgresql':
+                    cursor.execute(self._sql(select.format(table='interest_over_time') + ' ORDER BY date'), params)
+                else:
+                    tables = self._interest_tables_between(cursor, start, end)
+                    if not tables:
+                        return []
+                    query = ' UNION ALL '.join(select.format(table=table) for table in tables)
+                    cursor.execute(query + ' ORDER BY date', params * len(tables))
+                
+                series = [
+                    {
+                        'date': str(row[0]),
+                        'interest_value': row[1],
+                        'is_partial': bool(row[2]),
+                        'timeframe': row[3],
+                        'source': row[4]
+                    }
+                    for row in cursor.fetchall()
+                ]
+            
+            logger.info(f"Retrieved {len(series)} interest points for: {keyword}")
+            return series
+            
+        except Exception as e:
+            logger.error(f"Error retrieving interest series for {keyword}: {e}")
+            return []
+    
+    def get_interest_tails(self,
+                           keywords: Iterable[str],
+                           timeframe: str,
+                           overlap_days: int,
+                           source: str = 'google_trends') -> Dict[str, Dict[str, Any]]:
+        """
+        Get the stored end of each keyword's interest series, for incremental refreshes.
+        
+        The tail runs from `overlap_days` before the keyword's latest complete
+        (non-partial) point to the end of the series, so a refresh can rescale
+        newly fetched points against values already stored.
+        
+        Args:
+            keywords: Keywords to look up
+            timeframe: Collection timeframe of the series
+            overlap_days: Days of complete history to include before the latest point
+            source: Data source of the series
+            
+        Returns:
+            Mapping of keyword to {'latest': ISO date of the latest complete point,
+            'points': data points ordered by date}; keywords with no complete
+            points are left out
+        """
+        tails = {}
+        
+        try:
+            with self.session() as conn:
+                cursor = conn.cursor()
+                ids = self._lookup_keyword_ids(cursor, keywords)
+                if not ids:
+                    return {}
+                names = {keyword_id: keyword for keyword, keyword_id in ids.items()}
+                placeholders = ', '.join('?' for _ in names)
+                
+                # The view covers every SQLite shard; each is searched through its (keyword_id, date) index
+                cursor.execute(self._sql(f'''
+                    SELECT keyword_id, MAX(date) FROM interest_over_time
+                    WHERE keyword_id IN ({placeholders}) AND timeframe = ? AND source = ? AND NOT COALESCE(is_partial, FALSE)
+                    GROUP BY keyword_id
+                '''), list(names) + [timeframe, source])
+                latest = {keyword_id: str(day)[:10] for keyword_id, day in cursor.fetchall()}
+                if not latest:
+                    return {}
+                
+                starts = {
+                    keyword_id: (datetime.fromisoformat(day) - timedelta(days=overlap_days)).date().isoformat()
+                    for keyword_id, day in latest.items()
+                }
+                first = min(starts.values())
+                select = f'''
+                    SELECT keyword_id, date, interest_value, is_partial FROM {{table}}
+                    WHERE keyword_id IN ({', '.join('?' for _ in latest)}) AND timeframe = ? AND source = ? AND date >= ?
+                '''
+                params = list(latest) + [timeframe, source, first]
+                
+                if self.dialect == 'postgresql':
+                    cursor.execute(self._sql(select.format(table='interest_over_time') + ' ORDER BY date'), params)
+                else:
+                    tables = self._interest_tables_between(cursor, first, None)
+                    query = ' UNION ALL '.join(select.format(table=table) for table in tables)
+                    cursor.execute(query + ' ORDER BY date', params * len(tables))
+                
+                for keyword_id, day in latest.items():
+                    tails[names[keyword_id]] = {'latest': day, 'points': []}
+                for keyword_id, day, value, is_partial in cursor.fetchall():
+                    if str(day)[:10] >= starts[keyword_id]:
+                        tails[names[keyword_id]]['points'].append({
+                            'date': str(day)[:10],
+                            'interest_value': value,
+                            'is_partial': bool(is_partial)
+                        })
+            
+            logger.info(f"Retrieved interest tails for {len(tails)} keywords")
+            return tails
+            
+        except Exception as e:
+            logger.error(f"Error retrieving interest tails: {e}")
+            return {}
+    
+    def compact_interest_over_time(self,
+                                   retention_months: Optional[int] = None,
+                                   downsample_after_months: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Apply retention and compaction to interest_over_time partitions.
+        
+        Partitions older than the retention window are dropped outright. Older
+        partitions still inside it are downsampled once to a single monthly
+        average per keyword, timeframe and source.
+        
+        Args:
+            retention_months: Months of history to keep (default: INTEREST_RETENTION_MONTHS, 0 keeps all)
+            downsample_after_months: Age in months after which partitions are downsampled
+                (default: INTEREST_DOWNSAMPLE_AFTER_MONTHS, 0 disables)
             
+        Returns:
+            Dictionary with the 'dropped' and 'downsampled' months
+        """
+        if retention_months is None:
+            retention_months = INTEREST_RETENTION_MONTHS
+        if downsample_after_months is None:
+            downsample_after_months = INTEREST_DOWNSAMPLE_AFTER_MONTHS
+        
+        def cutoff(months_back: int) -> str:
+            year, month = datetime.now().year, datetime.now().month - months_back
+            while month < 1:
+                year, month = year - 1, month + 12
+            return f'{year:04d}-{month:02d}'
+        
+        result = {'dropped': [], 'downsampled': []}
+        try:
+            with self.session() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT month, table_name, granularity FROM interest_partitions ORDER BY month')
+                partitions = cursor.fetchall()
+                
+                for month, table, granularity in partitions:
+                    if retention_months and month < cutoff(retention_months):
+                        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+                        cursor.execute(self._sql('DELETE FROM interest_partitions WHERE month = ?'), (month,))
+                        result['dropped'].append(month)
+                    elif downsample_after_months and granularity == 'raw' and month < cutoff(downsample_after_months):
+                        self._downsample_interest_partition(cursor, month, table)
+                        result['downsampled'].append(month)
+                
+                if result['dropped']:
+                    with self._interest_lock:
+                        self._interest_months.difference_update(result['dropped'])
+                    if self.dialect == 'sqlite':
+                        self._refresh_interest_view(cursor)
+            
+            logger.info(
+                f"Interest compaction dropped {len(result['dropped'])} and downsampled "
+                f"{len(result['downsampled'])} partitions"
+            )
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error compacting interest over time: {e}")
+            return result
+    
+    def _downsample_interest_partition(self, cursor, month: str, table: str):
+        """Replace one partition's points with monthly averages."""
+        cursor.execute(f'''
+            SELECT keyword_id, timeframe, source, ROUND(AVG(interest_value)), MAX(timestamp)
+            FROM {table}
+            GROUP BY keyword_id, timeframe, source
+        ''')
+        columns = ('keyword_id', 'timeframe', 'source', 'interest_value', 'timestamp', 'date', 'is_partial')
+        rows = [tuple(row) + (f'{month}-01', False) for row in cursor.fetchall()]
+        
+        cursor.execute(f'DELETE FROM {table}')
+        for chunk in self._chunked(rows, WAREHOUSE_BATCH_SIZE):
+            self._bulk_insert(cursor, table, columns, chunk)
+        cursor.execute(
+            self._sql("UPDATE interest_partitions SET granularity = 'monthly' WHERE month = ?"),
+            (month,)
+        )
+    
+    def _sql(self, query: str) -> str:
+        """
+        Translate a query written with '?' placeholders to the active paramstyle.
+        
+        Args:
+            query: SQL using qmark placeholders
+            
+        Returns:
+            SQL for the active dialect
+        """
+        if self.dialect == 'postgresql':
+            return query.replace('?', '%s')
+        return query
+    
+    def _snapshot_date(self, timestamp: Any) -> str:
+        """
+        Derive the snapshot date (YYYY-MM-DD) that a collected row belongs to.
+        
+        Args:
+            timestamp: ISO timestamp string or datetime (falls back to today)
+            
+        Returns:
+            ISO date string
+        """
+        if isinstance(timestamp, datetime):
+            return timestamp.date().isoformat()
+        if isinstance(timestamp, str) and len(timestamp) >= 10:
+            return timestamp[:10]
+        return datetime.now().date().isoformat()
+    
+    def _chunked(self, rows: Iterable[Sequence], size: int) -> Iterator[List[Sequence]]:
+        """
+        Split a row stream into fixed-size chunks.
+        
+        Args:
+            rows: Iterable of row tuples
+            size: Maximum number of rows per chunk
+            
+        Yields:
+            Lists of at most `size` rows
+        """
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def _bulk_insert(self,
+                     cursor,
+                     table: str,
+                     columns: Sequence[str],
+                     rows: List[Sequence],
+                     upsert: Optional[bool] = None,
+                     key: Optional[Sequence[str]] = None):
+        """
+        Insert a chunk of rows with a single round trip for the active dialect.
+        
+        SQLite uses `executemany`; PostgreSQL uses `execute_values`, which folds
+        the whole chunk into one multi-row VALUES statement.
+        
+        Args:
+            cursor: Open database cursor
+            table: Target table name
+            columns: Column names, in row order
+            rows: Row tuples to insert
+            upsert: None for a plain insert; True to update rows that collide on the
+                table's natural key; False to keep the existing row and skip the new one
+            key: Conflict columns (default: the table's entry in NATURAL_KEYS)
+        """
+        column_list = ', '.join(columns)
+        conflict_clause = ''
+        if upsert is not None:
+            key = key or NATURAL_KEYS[table]
+            updates = ', '.join(f'{column} = excluded.{column}' for column in columns if column not in key)
+            action = f'DO UPDATE SET {updates}' if upsert and updates else 'DO NOTHING'
+            conflict_clause = f' ON CONFLICT ({", ".join(key)}) {action}'
+        
+        if self.dialect == 'postgresql':
+            execute_values(
+                cursor,
+                f'INSERT INTO {table} ({column_list}) VALUES %s{conflict_clause}',
+                rows,
+                page_size=len(rows)
+            )
+        else:
+            placeholders = ', '.join('?' for _ in columns)
+            cursor.executemany(
+                f'INSERT INTO {table} ({column_list}) VALUES ({placeholders}){conflict_clause}',
+                rows
+            )
+    
+    def _dedupe_rows(self, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> List[Sequence]:
+        """
+        Collapse rows sharing a natural key, keeping the last occurrence.
+        
+        PostgreSQL rejects an `ON CONFLICT DO UPDATE` statement that touches the
+        same row twice, so duplicates must be resolved before the rows are sent.
+        
+        Args:
+            table: Target table name
+            columns: Column names, in row order
+            rows: Row tuples
+            
+        Returns:
+            Deduplicated rows in first-seen key order
+        """
+        positions = [columns.index(column) for column in NATURAL_KEYS[table]]
+        unique = {}
+        for row in rows:
+            unique[tuple(row[i] for i in positions)] = row
+        return list(unique.values())
+    
+    def store_keywords(self,
+                       keywords: Iterable[Dict],
+                       batch_size: Optional[int] = None,
+                       commit_per_chunk: bool = False,
+                       upsert: bool = True) -> bool:
+        """
+        Store keyword data in the database.
+        
+        Rows are written in fixed-size chunks with one bulk statement per chunk,
+        so ingest cost grows with the number of chunks rather than keywords.
+        
+        Args:
+            keywords: Keyword dictionaries; any iterable, read once chunk by chunk
+            batch_size: Rows per chunk (default: WAREHOUSE_BATCH_SIZE)
+            commit_per_chunk: Commit after every chunk instead of once at the end.
+                Keeps transactions short on very large loads, at the cost of
+                leaving earlier chunks in place if a later one fails.
+            upsert: Update rows already stored for the same (keyword, source,
+                snapshot date); when False the first row of the day is kept
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        batch_size = batch_size or WAREHOUSE_BATCH_SIZE
+        # keyword_id holds the keyword text until it is resolved chunk by chunk
+        columns = (
+            'keyword_id', 'avg_monthly_searches', 'competition', 'competition_index',
+            'low_top_of_page_bid_micros', 'high_top_of_page_bid_micros',
+            'source', 'seed_keywords', 'timestamp', 'snapshot_date', 'updated_at'
+        )
+        default_timestamp = datetime.now().isoformat()
+        # Ideas from one pull share the same seed list, so serialize each list once
+        serialized_seeds = {}
+        
+        def rows():
             for keyword_data in keywords:
-                cursor.execute('''
-                    INSERT INTO keywords (
-                        keyword, avg_monthly_searches, competition, competition_index,
-                        low_top_of_page_bid_micros, high_top_of_page_bid_micros,
-                        source, seed_keywords, timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                seeds = tuple(keyword_data.get('seed_keywords') or ())
+                if seeds not in serialized_seeds:
+                    serialized_seeds[seeds] = json.dumps(list(seeds))
+                timestamp = keyword_data.get('timestamp', default_timestamp)
+                yield (
                     keyword_data.get('keyword'),
                     keyword_data.get('avg_monthly_searches'),
                     keyword_data.get('competition'),
@@ -287,165 +1549,464 @@ class DataWarehouseManager:
                     keyword_data.get('low_top_of_page_bid_micros'),
                     keyword_data.get('high_top_of_page_bid_micros'),
                     keyword_data.get('source'),
-                    json.dumps(keyword_data.get('seed_keywords', [])),
-                    keyword_data.get('timestamp', datetime.now().isoformat())
-                ))
+                    serialized_seeds[seeds],
+                    timestamp,
+                    self._snapshot_date(timestamp),
+                    default_timestamp
+                )
+        
+        try:
+            started = time.perf_counter()
+            stored = 0
+            
+            with self.session() as conn:
+                cursor = conn.cursor()
+                # Ids are resolved chunk by chunk so only one chunk is ever held in memory;
+                # a key repeated across chunks is settled by the upsert itself
+                for chunk in self._chunked(rows(), batch_size):
+                    keyword_ids = self._resolve_keyword_ids(cursor, (row[0] for row in chunk))
+                    chunk = self._dedupe_rows('keywords', columns, ((keyword_ids.get(row[0]),) + row[1:] for row in chunk))
+                    self._bulk_insert(cursor, 'keywords', columns, chunk, upsert=upsert)
+                    self._queue_rollup_groups(cursor, ((row[0], row[9]) for row in chunk))
+                    stored += len(chunk)
+                    if commit_per_chunk:
+                        self._commit(conn)
             
-            self.connection.commit()
-            logger.info(f"Stored {len(keywords)} keywords in database")
+            elapsed = time.perf_counter() - started
+            rate = stored / elapsed if elapsed > 0 else float(stored)
+            logger.info(f"Stored {stored} keywords in database ({rate:,.0f} rows/sec, batch size {batch_size})")
             return True
             
         except Exception as e:
             logger.error(f"Error storing keywords: {e}")
-            self.connection.rollback()
             return False
     
-    def store_trends(self, trends_data: Dict[str, Any]) -> bool:
+    def _flatten_trends(self, trends_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """
-        Store trend data in the database.
+        Flatten a `collect_comprehensive_trends` result into per-table row buffers.
         
         Args:
             trends_data: Dictionary containing trend data
             
         Returns:
-            True if successful, False otherwise
+            Mapping of table name to its column names and row tuples
         """
-        try:
-            cursor = self.connection.cursor()
-            
-            # Store related queries
-            for keyword, timeframes in trends_data.get('related_queries', {}).items():
-                for timeframe, data in timeframes.items():
-                    # Store rising queries
-                    for query in data.get('rising_queries', []):
-                        cursor.execute('''
-                            INSERT INTO trends (
-                                keyword, query, value, trend_type, timeframe, source, timestamp
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            keyword,
-                            query.get('query'),
-                            query.get('value'),
-                            'rising',
-                            timeframe,
-                            data.get('source'),
-                            data.get('timestamp')
-                        ))
-                    
-                    # Store top queries
-                    for query in data.get('top_queries', []):
-                        cursor.execute('''
-                            INSERT INTO trends (
-                                keyword, query, value, trend_type, timeframe, source, timestamp
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (
+        # keyword_id holds the keyword text until _link_keyword_ids() resolves it
+        buffers = {
+            'trends': {
+                'columns': ('keyword_id', 'query', 'value', 'trend_type', 'timeframe', 'source', 'timestamp', 'snapshot_date'),
+                'rows': []
+            },
+            'topics': {
+                'columns': ('keyword_id', 'topic_title', 'topic_type', 'value', 'trend_type', 'timeframe', 'source', 'timestamp', 'snapshot_date'),
+                'rows': []
+            },
+            'interest_over_time': {
+                'columns': ('keyword_id', 'date', 'interest_value', 'is_partial', 'timeframe', 'source', 'timestamp'),
+                'rows': []
+            },
+            'trending_searches': {
+                'columns': ('rank', 'search_term', 'title', 'traffic', 'image_url', 'articles', 'location', 'source', 'timestamp', 'snapshot_date'),
+                'rows': []
+            }
+        }
+        
+        # Related queries
+        trend_rows = buffers['trends']['rows']
+        for keyword, timeframes in trends_data.get('related_queries', {}).items():
+            for timeframe, data in timeframes.items():
+                snapshot_date = self._snapshot_date(data.get('timestamp'))
+                for trend_type in ('rising', 'top'):
+                    for query in data.get(f'{trend_type}_queries', []):
+                        trend_rows.append((
                             keyword,
                             query.get('query'),
                             query.get('value'),
-                            'top',
+                            trend_type,
                             timeframe,
                             data.get('source'),
-                            data.get('timestamp')
+                            data.get('timestamp'),
+                            snapshot_date
                         ))
-            
-            # Store related topics
-            for keyword, timeframes in trends_data.get('related_topics', {}).items():
-                for timeframe, data in timeframes.items():
-                    # Store rising topics
-                    for topic in data.get('rising_topics', []):
-                        cursor.execute('''
-                            INSERT INTO topics (
-                                keyword, topic_title, topic_type, value, trend_type, timeframe, source, timestamp
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
+        
+        # Related topics
+        topic_rows = buffers['topics']['rows']
+        for keyword, timeframes in trends_data.get('related_topics', {}).items():
+            for timeframe, data in timeframes.items():
+                snapshot_date = self._snapshot_date(data.get('timestamp'))
+                for trend_type in ('rising', 'top'):
+                    for topic in data.get(f'{trend_type}_topics', []):
+                        topic_rows.append((
                             keyword,
                             topic.get('topic_title'),
                             topic.get('topic_type'),
                             topic.get('value'),
-                            'rising',
+                            trend_type,
                             timeframe,
                             data.get('source'),
-                            data.get('timestamp')
+                            data.get('timestamp'),
+                            snapshot_date
                         ))
-                    
-                    # Store top topics
-                    for topic in data.get('top_topics', []):
-                        cursor.execute('''
-                            INSERT INTO topics (
-                                keyword, topic_title, topic_type, value, trend_type, timeframe, source, timestamp
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
+        
+        # Interest over time
+        interest_rows = buffers['interest_over_time']['rows']
+        keywords = trends_data.get('keywords', [])
+        for timeframe, data in trends_data.get('interest_over_time', {}).items():
+            points = data.get('interest_over_time', [])
+            if isinstance(points, dict):
+                # Columnar result: one value list per keyword beside shared date/is_partial lists
+                dates = points.get('date', [])
+                partial = points.get('is_partial', [False] * len(dates))
+                for keyword in keywords:
+                    if keyword in points:
+                        interest_rows.extend(zip(
+                            repeat(keyword),
+                            dates,
+                            points[keyword],
+                            partial,
+                            repeat(timeframe),
+                            repeat(data.get('source')),
+                            repeat(data.get('timestamp'))
+                        ))
+                continue
+            
+            for time_point in points:
+                for keyword in keywords:
+                    if keyword in time_point:
+                        interest_rows.append((
                             keyword,
-                            topic.get('topic_title'),
-                            topic.get('topic_type'),
-                            topic.get('value'),
-                            'top',
+                            time_point.get('date'),
+                            time_point.get(keyword),
+                            time_point.get('is_partial', False),
                             timeframe,
                             data.get('source'),
                             data.get('timestamp')
                         ))
+        
+        # Trending and real-time trending searches share one table
+        search_rows = buffers['trending_searches']['rows']
+        for search in trends_data.get('trending_searches', []):
+            search_rows.append((
+                search.get('rank'),
+                search.get('search_term'),
+                None,
+                None,
+                None,
+                None,
+                search.get('location'),
+                search.get('source'),
+                search.get('timestamp'),
+                self._snapshot_date(search.get('timestamp'))
+            ))
+        for search in trends_data.get('realtime_trending', []):
+            search_rows.append((
+                search.get('rank'),
+                search.get('title', ''),
+                search.get('title'),
+                search.get('traffic'),
+                search.get('image_url'),
+                json.dumps(search.get('articles', [])),
+                search.get('location'),
+                search.get('source'),
+                search.get('timestamp'),
+                self._snapshot_date(search.get('timestamp'))
+            ))
+        
+        return buffers
+    
+    def _link_keyword_ids(self, cursor, buffers: Dict[str, Dict[str, Any]]):
+        """
+        Attach keyword_dim ids to flattened trends buffers in place.
+        
+        Args:
+            cursor: Open database cursor
+            buffers: Output of _flatten_trends()
+        """
+        texts = set()
+        for table in ('trends', 'topics', 'interest_over_time'):
+            texts.update(row[0] for row in buffers[table]['rows'])
+        keyword_ids = self._resolve_keyword_ids(cursor, texts)
+        
+        for table in ('trends', 'topics', 'interest_over_time'):
+            buffer = buffers[table]
+            buffer['rows'] = [(keyword_ids.get(row[0]),) + tuple(row[1:]) for row in buffer['rows']]
+    
+    def store_trends(self,
+                     trends_data: Dict[str, Any],
+                     batch_size: Optional[int] = None,
+                     upsert: bool = True) -> bool:
+        """
+        Store trend data in the database.
+        
+        The payload is flattened into one row buffer per table and each buffer is
+        written with a single bulk statement (split only past `batch_size` rows),
+        so a full comprehensive collection lands in a handful of round trips.
+        
+        Args:
+            trends_data: Dictionary containing trend data
+            batch_size: Maximum rows per bulk statement (default: WAREHOUSE_BATCH_SIZE)
+            upsert: Update rows already stored under the same natural key (e.g. the
+                same query for a keyword on the same day); when False the existing
+                rows are kept
             
-            # Store interest over time
-            for timeframe, data in trends_data.get('interest_over_time', {}).items():
-                for time_point in data.get('interest_over_time', []):
-                    for keyword in trends_data.get('keywords', []):
-                        if keyword in time_point:
-                            cursor.execute('''
-                                INSERT INTO interest_over_time (
-                                    keywords, date, interest_value, keyword_name, is_partial, timeframe, source, timestamp
-                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                            ''', (
-                                json.dumps(trends_data.get('keywords', [])),
-                                time_point.get('date'),
-                                time_point.get(keyword),
-                                keyword,
-                                time_point.get('is_partial', False),
-                                timeframe,
-                                data.get('source'),
-                                data.get('timestamp')
-                            ))
-            
-            # Store trending searches
-            for search in trends_data.get('trending_searches', []):
-                cursor.execute('''
-                    INSERT INTO trending_searches (
-                        rank, search_term, location, source, timestamp
-                    ) VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    search.get('rank'),
-                    search.get('search_term'),
-                    search.get('location'),
-                    search.get('source'),
-                    search.get('timestamp')
-                ))
-            
-            # Store real-time trending searches
-            for search in trends_data.get('realtime_trending', []):
-                cursor.execute('''
-                    INSERT INTO trending_searches (
-                        rank, search_term, title, traffic, image_url, articles, location, source, timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    search.get('rank'),
-                    search.get('title', ''),
-                    search.get('title'),
-                    search.get('traffic'),
-                    search.get('image_url'),
-                    json.dumps(search.get('articles', [])),
-                    search.get('location'),
-                    search.get('source'),
-                    search.get('timestamp')
-                ))
-            
-            self.connection.commit()
-            logger.info("Stored trend data in database")
+        Returns:
+            True if successful, False otherwise
+        """
+        batch_size = batch_size or WAREHOUSE_BATCH_SIZE
+        
+        try:
+            stored = {}
+            
+            with self.session() as conn:
+                cursor = conn.cursor()
+                buffers = self._flatten_trends(trends_data)
+                self._link_keyword_ids(cursor, buffers)
+                
+                for table, buffer in buffers.items():
+                    rows = self._dedupe_rows(table, buffer['columns'], buffer['rows'])
+                    if table == 'interest_over_time':
+                        self._store_interest_rows(cursor, buffer['columns'], rows, batch_size, upsert)
+                    else:
+                        for chunk in self._chunked(rows, batch_size):
+                            self._bulk_insert(cursor, table, buffer['columns'], chunk, upsert=upsert)
+                    stored[table] = len(rows)
+            
+            summary = ', '.join(f"{count} {table}" for table, count in stored.items())
+            logger.info(f"Stored trend data in database ({summary})")
             return True
             
         except Exception as e:
             logger.error(f"Error storing trends: {e}")
-            self.connection.rollback()
             return False
     
+    @contextmanager
+    def _read_connection(self):
+        """
+        Open a connection reserved for one streaming read.
+        
+        Streaming iterators may stay suspended while the caller uses the
+        warehouse, so they do not borrow the thread's session connection.
+        
+        Yields:
+            DB-API connection
+        """
+        if self.dialect == 'sqlite':
+            conn = sqlite3.connect(str(self.db_path), timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+        
+        self._pool_slots.acquire()
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._pool_slots.release()
+            raise
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            self._pool.putconn(conn)
+            self._pool_slots.release()
+    
+    def _stream_rows(self,
+                     conn,
+                     query: str,
+                     params: Sequence = (),
+                     chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Run a query and yield its rows as dictionaries, one chunk at a time.
+        
+        PostgreSQL uses a server-side (named) cursor so rows stay on the server
+        until fetched; SQLite steps through the result with `fetchmany`.
+        
+        Args:
+            conn: Connection from `_read_connection()`
+            query: SQL with qmark placeholders
+            params: Query parameters
+            chunk_size: Rows per round trip (default: WAREHOUSE_FETCH_SIZE)
+            
+        Yields:
+            Row dictionaries keyed by column name
+        """
+        chunk_size = chunk_size or WAREHOUSE_FETCH_SIZE
+        if self.dialect == 'postgresql':
+            cursor = conn.cursor(name=f'warehouse_stream_{id(conn)}_{time.monotonic_ns()}')
+            cursor.itersize = chunk_size
+        else:
+            cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(query), params)
+            columns = None
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if columns is None:
+                    # Named cursors only describe their result after the first fetch
+                    columns = [description[0] for description in cursor.description]
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            cursor.close()
+    
+    def _fact_select(self, table: str) -> str:
+        """SELECT over a fact table aliased `t`, joining the keyword text back from keyword_dim."""
+        if table in ('keywords', 'trends', 'topics'):
+            return f'SELECT t.*, d.keyword FROM {table} t LEFT JOIN keyword_dim d ON d.id = t.keyword_id'
+        return f'SELECT t.* FROM {table} t'
+    
+    def iter_table(self,
+                   table: str,
+                   source: Optional[str] = None,
+                   after_id: Optional[int] = None,
+                   chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream the raw rows of an id-keyed fact table in id order.
+        
+        Args:
+            table: One of keywords, trends, topics, trending_searches
+            source: Restrict to one data source (optional)
+            after_id: Only rows with a larger id, for keyset pagination (optional)
+            chunk_size: Rows per round trip (default: WAREHOUSE_FETCH_SIZE)
+            
+        Yields:
+            Row dictionaries, column values as stored plus the keyword text for
+            tables keyed by keyword_id
+        """
+        if table not in NATURAL_KEYS or table == 'interest_over_time':
+            raise ValueError(f"Cannot stream table: {table}")
+        
+        conditions, params = [], []
+        if source:
+            conditions.append('t.source = ?')
+            params.append(source)
+        if after_id is not None:
+            conditions.append('t.id > ?')
+            params.append(after_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with self._read_connection() as conn:
+            yield from self._stream_rows(conn, f'{self._fact_select(table)} {where} ORDER BY t.id', params, chunk_size)
+    
+    def iter_keywords(self,
+                      source: Optional[str] = None,
+                      after_id: Optional[int] = None,
+                      chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream stored keyword rows in id order, in constant memory.
+        
+        Pass the `id` of the last row seen as `after_id` to resume a walk
+        (keyset pagination) without rescanning earlier rows.
+        
+        Args:
+            source: Restrict to one data source (optional)
+            after_id: Only rows with a larger id (optional)
+            chunk_size: Rows per round trip (default: WAREHOUSE_FETCH_SIZE)
+            
+        Yields:
+            Keyword dictionaries
+        """
+        for keyword_dict in self.iter_table('keywords', source=source, after_id=after_id, chunk_size=chunk_size):
+            if keyword_dict.get('seed_keywords'):
+                keyword_dict['seed_keywords'] = json.loads(keyword_dict['seed_keywords'])
+            yield keyword_dict
+    
+    def iter_trends(self,
+                    keyword: Optional[str] = None,
+                    source: Optional[str] = None,
+                    after_id: Optional[int] = None,
+                    chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream stored related-query rows in id order, in constant memory.
+        
+        Args:
+            keyword: Restrict to queries related to one keyword (optional)
+            source: Restrict to one data source (optional)
+            after_id: Only rows with a larger id, for keyset pagination (optional)
+            chunk_size: Rows per round trip (default: WAREHOUSE_FETCH_SIZE)
+            
+        Yields:
+            Trend dictionaries
+        """
+        conditions, params = [], []
+        if keyword:
+            conditions.append('t.keyword_id = (SELECT id FROM keyword_dim WHERE normalized = ?)')
+            params.append(self._normalize_keyword(keyword))
+        if source:
+            conditions.append('t.source = ?')
+            params.append(source)
+        if after_id is not None:
+            conditions.append('t.id > ?')
+            params.append(after_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with self._read_connection() as conn:
+            yield from self._stream_rows(conn, f"{self._fact_select('trends')} {where} ORDER BY t.id", params, chunk_size)
+    
+    def iter_interest(self,
+                      keyword: Optional[str] = None,
+                      start: Optional[str] = None,
+                      end: Optional[str] = None,
+                      after: Optional[Sequence] = None,
+                      chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream interest-over-time points in (date, id) order, in constant memory.
+        
+        On SQLite the month shards are walked one after another, so each sort
+        is bounded by a single month.
+        
+        Args:
+            keyword: Restrict to one keyword (optional)
+            start: Inclusive ISO start date (optional)
+            end: Inclusive ISO end date (optional)
+            after: (date, id) of the last point seen, for keyset pagination (optional)
+            chunk_size: Rows per round trip (default: WAREHOUSE_FETCH_SIZE)
+            
+        Yields:
+            Data point dictionaries, with the keyword text joined from keyword_dim
+        """
+        conditions, params = [], []
+        if keyword:
+            conditions.append('i.keyword_id = (SELECT id FROM keyword_dim WHERE normalized = ?)')
+            params.append(self._normalize_keyword(keyword))
+        if start:
+            conditions.append('i.date >= ?')
+            params.append(start[:10])
+        if end:
+            # Dates may carry a time component on SQLite, so compare against the next day
+            conditions.append('i.date < ?')
+            params.append((datetime.fromisoformat(end[:10]) + timedelta(days=1)).date().isoformat())
+        if after is not None:
+            after_date, after_id = after
+            conditions.append('(i.date > ? OR (i.date = ? AND i.id > ?))')
+            params.extend([after_date, after_date, after_id])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        select = f'''
+            SELECT i.id, d.keyword, i.keyword_id, i.date, i.interest_value, i.is_partial,
+                   i.timeframe, i.source, i.timestamp
+            FROM {{table}} i LEFT JOIN keyword_dim d ON d.id = i.keyword_id
+            {where}
+            ORDER BY i.date, i.id
+        '''
+        
+        with self._read_connection() as conn:
+            if self.dialect == 'postgresql':
+                tables = ['interest_over_time']
+            else:
+                cursor = conn.cursor()
+                first_month = max(filter(None, [start, after[0] if after else None]), default=None)
+                tables = self._interest_tables_between(cursor, first_month, end)
+                cursor.close()
+            
+            for table in tables:
+                for point in self._stream_rows(conn, select.format(table=table), params, chunk_size):
+                    point['is_partial'] = bool(point['is_partial'])
+                    yield point
+    
     def get_keywords_by_source(self, source: str, limit: int = 100) -> List[Dict]:
         """
         Retrieve keywords by source.
@@ -458,23 +2019,24 @@ class DataWarehouseManager:
             List of keyword dictionaries
         """
         try:
-            cursor = self.connection.cursor()
+            with self.session() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT * FROM keywords 
-                WHERE source = ? 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            ''', (source, limit))
+                cursor.execute(self._sql(f'''
+                    {self._fact_select('keywords')}
+                    WHERE t.source = ? 
+                    ORDER BY t.timestamp DESC 
+                    LIMIT ?
+                '''), (source, limit))
             
-            columns = [description[0] for description in cursor.description]
-            keywords = []
+                columns = [description[0] for description in cursor.description]
+                keywords = []
             
-            for row in cursor.fetchall():
-                keyword_dict = dict(zip(columns, row))
-                if keyword_dict.get('seed_keywords'):
-                    keyword_dict['seed_keywords'] = json.loads(keyword_dict['seed_keywords'])
-                keywords.append(keyword_dict)
+                for row in cursor.fetchall():
+                    keyword_dict = dict(zip(columns, row))
+                    if keyword_dict.get('seed_keywords'):
+                        keyword_dict['seed_keywords'] = json.loads(keyword_dict['seed_keywords'])
+                    keywords.append(keyword_dict)
             
             logger.info(f"Retrieved {len(keywords)} keywords from source: {source}")
             return keywords
@@ -483,40 +2045,178 @@ class DataWarehouseManager:
             logger.error(f"Error retrieving keywords: {e}")
             return []
     
-    def get_trending_keywords(self, days: int = 7, limit: int = 50) -> List[Dict]:
+    def _setup_trending_rollup(self, cursor):
+        """
+        Prepare `keywords` for incremental rollup refreshes.
+        
+        Writers queue the (keyword, day) groups they touch in `rollup_pending`,
+        inside their own transaction, so a group becomes pending exactly when its
+        rows become visible. Databases created before the queue existed lose
+        their watermark, so the next refresh rebuilds the rollup in full.
+        """
+        if not self._column_exists(cursor, 'keywords', 'updated_at'):
+            column_type = 'TIMESTAMP' if self.dialect == 'postgresql' else 'DATETIME'
+            cursor.execute(f'ALTER TABLE keywords ADD COLUMN updated_at {column_type}')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_updated_at ON keywords(updated_at)')
+        
+        if not self._table_exists(cursor, 'rollup_pending'):
+            cursor.execute('''
+                CREATE TABLE rollup_pending (
+                    keyword_id INTEGER NOT NULL,
+                    day DATE NOT NULL,
+                    queued_at TIMESTAMP,
+                    PRIMARY KEY (keyword_id, day)
+                )
+            ''')
+            cursor.execute(self._sql('DELETE FROM rollup_watermarks WHERE name = ?'), ('keyword_daily_rollup',))
+    
+    def _queue_rollup_groups(self, cursor, groups: Iterable[Sequence]):
+        """
+        Mark (keyword_id, day) groups as needing a rollup refresh.
+        
+        The upsert locks an already-queued row on PostgreSQL, so a concurrent
+        refresh cannot dequeue it until this transaction's rows are committed.
+        
+        Args:
+            cursor: Cursor of the transaction that wrote the rows
+            groups: (keyword_id, day) pairs
+        """
+        queued_at = datetime.now().isoformat()
+        rows = sorted({(keyword_id, day) for keyword_id, day in groups if keyword_id is not None})
+        if rows:
+            self._bulk_insert(
+                cursor, 'rollup_pending', ('keyword_id', 'day', 'queued_at'),
+                [row + (queued_at,) for row in rows], upsert=True, key=('keyword_id', 'day')
+            )
+    
+    def refresh_trending_rollup(self, full: bool = False) -> int:
+        """
+        Bring keyword_daily_rollup up to date with the keywords table.
+        
+        Only the (keyword, day) groups queued in rollup_pending by writes since
+        the last refresh are recomputed, and dequeued in the same transaction;
+        with nothing queued the call does no work. Recomputing a group is
+        idempotent, so a group queued again mid-refresh is simply redone next time.
+        
+        Args:
+            full: Rebuild every group instead of refreshing incrementally
+            
+        Returns:
+            Number of (keyword, day) groups recomputed, or -1 on error
+        """
+        try:
+            with self.session() as conn:
+                cursor = conn.cursor()
+                
+                if not full:
+                    cursor.execute(self._sql('SELECT 1 FROM rollup_watermarks WHERE name = ?'), ('keyword_daily_rollup',))
+                    full = cursor.fetchone() is None
+                
+                cursor.execute('CREATE TEMP TABLE IF NOT EXISTS rollup_touched (keyword_id INTEGER, day DATE, queued_at TIMESTAMP)')
+                cursor.execute('DELETE FROM rollup_touched')
+                if full:
+                    cursor.execute('DELETE FROM keyword_daily_rollup')
+                    cursor.execute('''
+                        INSERT INTO rollup_touched (keyword_id, day, queued_at)
+                        SELECT keyword_id, snapshot_date, MAX(updated_at) FROM keywords
+                        WHERE keyword_id IS NOT NULL
+                        GROUP BY keyword_id, snapshot_date
+                    ''')
+                else:
+                    cursor.execute('INSERT INTO rollup_touched (keyword_id, day, queued_at) SELECT keyword_id, day, queued_at FROM rollup_pending')
+                touched = cursor.rowcount
+                if not touched and not full:
+                    cursor.execute('DROP TABLE rollup_touched')
+                    return 0
+                
+                # Dequeue exactly the groups read above; PostgreSQL waits here for writers still holding them
+                cursor.execute('''
+                    DELETE FROM rollup_pending
+                    WHERE EXISTS (
+                        SELECT 1 FROM rollup_touched t
+                        WHERE t.keyword_id = rollup_pending.keyword_id AND t.day = rollup_pending.day
+                    )
+                ''')
+                if not full:
+                    cursor.execute('''
+                        DELETE FROM keyword_daily_rollup
+                        WHERE EXISTS (
+                            SELECT 1 FROM rollup_touched t
+                            WHERE t.keyword_id = keyword_daily_rollup.keyword_id AND t.day = keyword_daily_rollup.day
+                        )
+                    ''')
+                cursor.execute('''
+                    INSERT INTO keyword_daily_rollup (keyword_id, day, sum_searches, observations, last_seen)
+                    SELECT k.keyword_id, k.snapshot_date, SUM(k.avg_monthly_searches), COUNT(*), MAX(k.timestamp)
+                    FROM keywords k
+                    JOIN rollup_touched t ON t.keyword_id = k.keyword_id AND t.day = k.snapshot_date
+                    WHERE k.avg_monthly_searches > 0
+                    GROUP BY k.keyword_id, k.snapshot_date
+                ''')
+                
+                # The watermark records the newest write this refresh actually covered
+                cursor.execute('SELECT MAX(queued_at) FROM rollup_touched')
+                high_water = cursor.fetchone()[0]
+                cursor.execute('DROP TABLE rollup_touched')
+                
+                self._bulk_insert(
+                    cursor, 'rollup_watermarks', ('name', 'high_water', 'refreshed_at'),
+                    [('keyword_daily_rollup', high_water, datetime.now().isoformat())],
+                    upsert=True, key=('name',)
+                )
+            
+            logger.info(f"Refreshed {touched} keyword rollup groups{' (full rebuild)' if full else ''}")
+            return touched
+            
+        except Exception as e:
+            logger.error(f"Error refreshing trending keyword rollup: {e}")
+            return -1
+    
+    def get_trending_keywords(self, days: int = 7, limit: int = 50, refresh: bool = False) -> List[Dict]:
         """
         Get trending keywords from the last N days.
         
+        Reads the daily rollup, so the cost scales with days x distinct keywords
+        rather than with stored history. The rollup is brought up to date by the
+        collection write path and the refresh-rollup command; groups queued since
+        then are only folded in when refresh is set, since that takes a write lock.
+        
         Args:
             days: Number of days to look back
             limit: Maximum number of results
+            refresh: Refresh the rollup before reading it
             
         Returns:
             List of trending keyword dictionaries
         """
+        if refresh:
+            self.refresh_trending_rollup()
+        cutoff = (datetime.now().date() - timedelta(days=days)).isoformat()
+        
         try:
-            cursor = self.connection.cursor()
+            with self.session() as conn:
+                cursor = conn.cursor()
             
-            # Get keywords with high search volume from recent data
-            cursor.execute('''
-                SELECT keyword, AVG(avg_monthly_searches) as avg_searches, 
-                       COUNT(*) as frequency, MAX(timestamp) as last_seen
-                FROM keywords 
-                WHERE timestamp >= datetime('now', '-{} days')
-                AND avg_monthly_searches > 0
-                GROUP BY keyword 
-                ORDER BY avg_searches DESC, frequency DESC 
-                LIMIT ?
-            '''.format(days), (limit,))
-            
-            trending_keywords = []
-            for row in cursor.fetchall():
-                trending_keywords.append({
-                    'keyword': row[0],
-                    'avg_monthly_searches': int(row[1]) if row[1] else 0,
-                    'frequency': row[2],
-                    'last_seen': row[3]
-                })
+                # Get keywords with high search volume from recent data
+                cursor.execute(self._sql('''
+                    SELECT d.keyword, SUM(r.sum_searches) * 1.0 / SUM(r.observations) as avg_searches,
+                           SUM(r.observations) as frequency, MAX(r.last_seen) as last_seen
+                    FROM keyword_daily_rollup r
+                    JOIN keyword_dim d ON d.id = r.keyword_id
+                    WHERE r.day >= ?
+                    GROUP BY r.keyword_id, d.keyword 
+                    ORDER BY avg_searches DESC, frequency DESC 
+                    LIMIT ?
+                '''), (cutoff, limit))
+            
+                trending_keywords = []
+                for row in cursor.fetchall():
+                    trending_keywords.append({
+                        'keyword': row[0],
+                        'avg_monthly_searches': int(row[1]) if row[1] else 0,
+                        'frequency': row[2],
+                        'last_seen': row[3]
+                    })
             
             logger.info(f"Retrieved {len(trending_keywords)} trending keywords")
             return trending_keywords
@@ -529,6 +2229,10 @@ class DataWarehouseManager:
         """
         Get keyword suggestions based on a seed keyword.
         
+        Stored keywords matching the seed are found through the trigram search
+        index, then their related queries and topics are ranked by match
+        similarity times trend value.
+        
         Args:
             seed_keyword: The seed keyword to find suggestions for
             limit: Maximum number of suggestions
@@ -537,44 +2241,56 @@ class DataWarehouseManager:
             List of keyword suggestion dictionaries
         """
         try:
-            cursor = self.connection.cursor()
+            matches = self.search_keywords(seed_keyword, limit=SUGGESTION_MATCH_LIMIT)
+            if not matches:
+                logger.info(f"Retrieved 0 keyword suggestions for: {seed_keyword}")
+                return []
+            seed = self._normalize_keyword(seed_keyword)
+            similarity = {match['keyword_id']: match['similarity'] for match in matches}
+            # Keywords containing the seed count as full matches; fuzzy ones are discounted
+            weight = {
+                match['keyword_id']: 1.0 if seed in self._normalize_keyword(match['keyword']) else match['similarity']
+                for match in matches
+            }
+            placeholders = ', '.join('?' for _ in similarity)
             
-            # Get related keywords from trends and topics
-            cursor.execute('''
-                SELECT DISTINCT query as keyword, value, 'trend' as type
-                FROM trends 
-                WHERE keyword LIKE ? 
-                ORDER BY value DESC 
-                LIMIT ?
-            ''', (f'%{seed_keyword}%', limit // 2))
-            
-            suggestions = []
-            for row in cursor.fetchall():
-                suggestions.append({
-                    'keyword': row[0],
-                    'value': row[1],
-                    'type': row[2]
-                })
-            
-            # Get related topics
-            cursor.execute('''
-                SELECT DISTINCT topic_title as keyword, value, 'topic' as type
-                FROM topics 
-                WHERE keyword LIKE ? 
-                ORDER BY value DESC 
-                LIMIT ?
-            ''', (f'%{seed_keyword}%', limit // 2))
-            
-            for row in cursor.fetchall():
-                suggestions.append({
-                    'keyword': row[0],
-                    'value': row[1],
-                    'type': row[2]
-                })
-            
-            # Sort by value and return top results
-            suggestions.sort(key=lambda x: x['value'], reverse=True)
-            suggestions = suggestions[:limit]
+            with self.session() as conn:
+                cursor = conn.cursor()
+                
+                # Get related keywords from trends and topics
+                cursor.execute(self._sql(f'''
+                    SELECT DISTINCT query as keyword, value, 'trend' as type, keyword_id
+                    FROM trends 
+                    WHERE keyword_id IN ({placeholders}) 
+                    ORDER BY value DESC 
+                    LIMIT ?
+                '''), (*similarity, limit))
+                rows = cursor.fetchall()
+                
+                # Get related topics
+                cursor.execute(self._sql(f'''
+                    SELECT DISTINCT topic_title as keyword, value, 'topic' as type, keyword_id
+                    FROM topics 
+                    WHERE keyword_id IN ({placeholders}) 
+                    ORDER BY value DESC 
+                    LIMIT ?
+                '''), (*similarity, limit))
+                rows += cursor.fetchall()
+            
+            suggestions = {}
+            for keyword, value, suggestion_type, keyword_id in rows:
+                score = (value or 0) * weight[keyword_id]
+                if keyword not in suggestions or score > suggestions[keyword]['score']:
+                    suggestions[keyword] = {
+                        'keyword': keyword,
+                        'value': value,
+                        'type': suggestion_type,
+                        'similarity': similarity[keyword_id],
+                        'score': round(score, 2)
+                    }
+            
+            # Sort by similarity-weighted value and return top results
+            suggestions = sorted(suggestions.values(), key=lambda x: (x['score'], x['value'] or 0), reverse=True)[:limit]
             
             logger.info(f"Retrieved {len(suggestions)} keyword suggestions for: {seed_keyword}")
             return suggestions
@@ -584,10 +2300,16 @@ class DataWarehouseManager:
             return []
     
     def close(self):
-        """Close the database connection."""
-        if self.connection:
-            self.connection.close()
-            logger.info("Database connection closed")
+        """Close all pooled and per-thread database connections."""
+        if self._pool:
+            self._pool.closeall()
+            self._pool = None
+        with self._sqlite_lock:
+            for conn in self._sqlite_connections:
+                conn.close()
+            self._sqlite_connections = []
+        self._local = threading.local()
+        logger.info("Database connection closed")
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -622,7 +2344,7 @@ if __name__ == "__main__":
     print(f"Retrieved {len(keywords)} keywords")
     
     # Get trending keywords
-    trending = warehouse.get_trending_keywords(days=30)
+    trending = warehouse.get_trending_keywords(days=30, refresh=True)
     print(f"Found {len(trending)} trending keywords")
     
     # Close connection
@@ -7,35 +7,322 @@ It includes methods for getting related queries, trending topics, and interest o
 
 import time
 import json
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Any, Iterator, Callable
+from datetime import datetime, date, timedelta
 from pathlib import Path
 import sys
 
 # Add the parent directory to the path so we can import our modules
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+import pandas as pd
 from pytrends.request import TrendReq
-from config.settings import BASE_DIR
+from pytrends.exceptions import TooManyRequestsError
+from config.settings import (
+    BASE_DIR, TRENDS_CONCURRENCY, TRENDS_GEOS, TRENDS_REQUESTS_PER_SECOND, TRENDS_BURST, TRENDS_CACHE_TTL_HOURS,
+    TRENDS_TRENDING_CACHE_TTL_MINUTES, TRENDS_REALTIME_CACHE_TTL_MINUTES,
+    TRENDS_MAX_REQUESTS_PER_SECOND, TRENDS_MAX_RETRIES, TRENDS_CIRCUIT_COOLDOWN_SECONDS, TRENDS_OUTPUT_COMPRESSION
+)
+from data_collection.trends_cache import TrendsCache, cached_response, is_complete_response
+from data_collection.collection_journal import CollectionJournal
+from data_collection.trends_sink import NDJSONSink
 from utils.logger import get_logger
+from utils.rate_limiter import AdaptiveRateController
 
 logger = get_logger(__name__)
 
+# Google Trends compares at most this many keywords in one payload
+MAX_PAYLOAD_KEYWORDS = 5
+
+# Longest custom window Google Trends still reports day by day
+DAILY_WINDOW_MAX_DAYS = 269
+
 class GoogleTrendsCollector:
     """Collects keyword trend data using Google Trends."""
     
-    def __init__(self, hl: str = 'en-US', tz: int = 360):
+    def __init__(self,
+                 hl: str = 'en-US',
+                 tz: int = 360,
+                 concurrency: Optional[int] = None,
+                 rate_controller: Optional[AdaptiveRateController] = None,
+                 cache: Optional[TrendsCache] = None,
+                 use_cache: bool = True):
         """
         Initialize the Google Trends collector.
         
         Args:
             hl: Host language (default: 'en-US')
             tz: Timezone offset in minutes (default: 360 for EST)
+            concurrency: Independent TrendReq sessions run in parallel (default: TRENDS_CONCURRENCY)
+            rate_controller: Adaptive rate controller shared by all sessions (default: starts at
+                TRENDS_REQUESTS_PER_SECOND, ramps up to TRENDS_MAX_REQUESTS_PER_SECOND); pass one
+                controller to several collectors to pace them together
+            cache: Response cache (default: the shared on-disk cache when TRENDS_CACHE_TTL_HOURS > 0)
+            use_cache: Set False to always query Google Trends
         """
-        self.pytrends = TrendReq(hl=hl, tz=tz)
+        self.hl = hl
+        self.tz = tz
+        self.concurrency = max(1, concurrency or TRENDS_CONCURRENCY)
+        self.rate_controller = rate_controller or AdaptiveRateController(
+            rate=TRENDS_REQUESTS_PER_SECOND,
+            max_rate=TRENDS_MAX_REQUESTS_PER_SECOND,
+            burst=TRENDS_BURST,
+            max_concurrency=self.concurrency,
+            cooldown=TRENDS_CIRCUIT_COOLDOWN_SECONDS
+        )
+        if not use_cache:
+            self.cache = None
+        else:
+            self.cache = cache or (TrendsCache() if TRENDS_CACHE_TTL_HOURS > 0 else None)
+        
+        # TrendReq keeps per-request state (the built payload), so every worker
+        # borrows its own session from the pool; more are created on demand
+        self.pytrends = self._new_client()
         self.session = self.pytrends.session
-        logger.info("Google Trends collector initialized")
+        self._clients = queue.Queue()
+        self._clients.put(self.pytrends)
+        self._client_count = 1
+        self._client_lock = threading.Lock()
+        logger.info(f"Google Trends collector initialized (concurrency {self.concurrency})")
+    
+    def _new_client(self) -> TrendReq:
+        """
+        Create a TrendReq session whose every HTTP request is paced.
+        
+        One report call can make several requests (a payload's token request,
+        then one per keyword for related queries and topics), so the rate
+        limit is charged per request rather than per call.
+        
+        Returns:
+            New TrendReq session
+        """
+        client = TrendReq(hl=self.hl, tz=self.tz)
+        get_data = client._get_data
+        
+        def paced_get_data(*args, **kwargs):
+            self.rate_controller.pace()
+            return get_data(*args, **kwargs)
+        
+        client._get_data = paced_get_data
+        return client
+    
+    @contextmanager
+    def _borrow_client(self) -> Iterator[TrendReq]:
+        """
+        Borrow a TrendReq session for one request.
+        
+        Yields:
+            TrendReq session used by no other thread until it is returned
+        """
+        try:
+            client = self._clients.get_nowait()
+        except queue.Empty:
+            with self._client_lock:
+                create = self._client_count < self.concurrency
+                if create:
+                    self._client_count += 1
+            client = self._new_client() if create else self._clients.get()
+        
+        try:
+            yield client
+        finally:
+            self._clients.put(client)
+    
+    def _request(self, fetch: Callable[[TrendReq], Any]) -> Any:
+        """
+        Run one Google Trends call on a pooled session under the rate controller.
+        
+        The call holds one concurrency slot; each HTTP request it makes takes
+        its own rate-limit token (see `_new_client`).
+        
+        A 429 is reported to the controller, which cuts rate and concurrency
+        and may open the circuit breaker, and the call is retried after a
+        jittered exponential backoff, up to TRENDS_MAX_RETRIES times.
+        
+        Args:
+            fetch: Callable doing the requests on the session it is given
+            
+        Returns:
+            Whatever `fetch` returns
+        """
+        for attempt in range(TRENDS_MAX_RETRIES + 1):
+            # Tokens are taken per HTTP request by the session itself
+            with self.rate_controller.slot(tokens=0), self._borrow_client() as pytrends:
+                try:
+                    result = fetch(pytrends)
+                except TooManyRequestsError:
+                    self.rate_controller.record_throttle()
+                    if attempt == TRENDS_MAX_RETRIES:
+                        raise
+                else:
+                    self.rate_controller.record_success()
+                    return result
+            
+            delay = self.rate_controller.backoff(attempt)
+            logger.warning(f"Google Trends returned 429, retrying in {delay:.1f}s ({attempt + 1}/{TRENDS_MAX_RETRIES})")
+            time.sleep(delay)
     
+    def _frame_records(self, frame: Optional[pd.DataFrame], columns: Dict[str, Optional[str]], **constants) -> List[Dict]:
+        """
+        Convert DataFrame columns to a list of dicts in one vectorized pass.
+        
+        Args:
+            frame: pytrends result frame (None or empty gives no records)
+            columns: Column name to dtype to cast to (None keeps the column's dtype)
+            **constants: Fields added to every record
+            
+        Returns:
+            List of record dictionaries with native Python values
+        """
+        if frame is None or frame.empty:
+            return []
+        selected = frame[list(columns)].astype({name: dtype for name, dtype in columns.items() if dtype})
+        if constants:
+            selected = selected.assign(**constants)
+        return selected.to_dict('records')
+    
+    def _related_queries_result(self, keyword: str, timeframe: str, related_queries: Dict) -> Dict[str, Any]:
+        """
+        Convert pytrends related-query frames for one keyword into a result dict.
+        
+        Args:
+            keyword: Keyword the queries belong to
+            timeframe: Timeframe of the payload
+            related_queries: Output of `TrendReq.related_queries()`
+            
+        Returns:
+            Dictionary containing rising and top queries
+        """
+        if keyword in related_queries and related_queries[keyword]:
+            rising_queries = related_queries[keyword].get('rising', pd.DataFrame())
+            top_queries = related_queries[keyword].get('top', pd.DataFrame())
+            
+            # Convert to list of dictionaries
+            columns = {'query': None, 'value': 'int64'}
+            rising_data = self._frame_records(rising_queries, columns, type='rising')
+            top_data = self._frame_records(top_queries, columns, type='top')
+            
+            logger.info(f"Found {len(rising_data)} rising and {len(top_data)} top queries")
+        else:
+            logger.warning(f"No related queries found for: {keyword}")
+            rising_data, top_data = [], []
+        
+        return {
+            'keyword': keyword,
+            'timeframe': timeframe,
+            'rising_queries': rising_data,
+            'top_queries': top_data,
+            'source': 'google_trends',
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _related_topics_result(self, keyword: str, timeframe: str, related_topics: Dict) -> Dict[str, Any]:
+        """
+        Convert pytrends related-topic frames for one keyword into a result dict.
+        
+        Args:
+            keyword: Keyword the topics belong to
+            timeframe: Timeframe of the payload
+            related_topics: Output of `TrendReq.related_topics()`
+            
+        Returns:
+            Dictionary containing rising and top topics
+        """
+        if keyword in related_topics and related_topics[keyword]:
+            rising_topics = related_topics[keyword].get('rising', pd.DataFrame())
+            top_topics = related_topics[keyword].get('top', pd.DataFrame())
+            
+            # Convert to list of dictionaries
+            columns = {'topic_title': None, 'topic_type': None, 'value': 'int64'}
+            rising_data = self._frame_records(rising_topics, columns, type='rising')
+            top_data = self._frame_records(top_topics, columns, type='top')
+            
+            logger.info(f"Found {len(rising_data)} rising and {len(top_data)} top topics")
+        else:
+            logger.warning(f"No related topics found for: {keyword}")
+            rising_data, top_data = [], []
+        
+        return {
+            'keyword': keyword,
+            'timeframe': timeframe,
+            'rising_topics': rising_data,
+            'top_topics': top_data,
+            'source': 'google_trends',
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _interest_frame(self, keywords: List[str], interest_over_time: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reshape a pytrends interest-over-time frame into output columns.
+        
+        Args:
+            keywords: Keywords in the payload
+            interest_over_time: Output of `TrendReq.interest_over_time()`
+            
+        Returns:
+            Frame with 'date' (ISO string), 'is_partial' and one int column per keyword
+        """
+        present = [keyword for keyword in keywords if keyword in interest_over_time.columns]
+        frame = interest_over_time[present].astype('int64')
+        if 'isPartial' in interest_over_time.columns:
+            frame.insert(0, 'is_partial', interest_over_time['isPartial'].astype(bool))
+        else:
+            frame.insert(0, 'is_partial', False)
+        frame.insert(0, 'date', interest_over_time.index.strftime('%Y-%m-%dT%H:%M:%S'))
+        return frame.reset_index(drop=True)
+    
+    def _interest_points(self, frame: pd.DataFrame, columnar: bool = False) -> Any:
+        """
+        Render an interest frame as result data points.
+        
+        Args:
+            frame: Frame from `_interest_frame`
+            columnar: Return {column: values} instead of one dict per date
+            
+        Returns:
+            List of data point dictionaries, or a dictionary of column lists
+        """
+        if columnar:
+            return {column: frame[column].tolist() for column in frame.columns}
+        return frame.to_dict('records')
+    
+    def _interest_result(self,
+                         keywords: List[str],
+                         timeframe: str,
+                         interest_over_time: pd.DataFrame,
+                         columnar: bool = False) -> Dict[str, Any]:
+        """
+        Convert a pytrends interest-over-time frame into a result dict.
+        
+        Args:
+            keywords: Keywords in the payload
+            timeframe: Timeframe of the payload
+            interest_over_time: Output of `TrendReq.interest_over_time()`
+            columnar: Return data points as {column: values}
+            
+        Returns:
+            Dictionary containing interest over time data
+        """
+        if not interest_over_time.empty:
+            time_data = self._interest_points(self._interest_frame(keywords, interest_over_time), columnar)
+            logger.info(f"Retrieved interest data for {len(interest_over_time)} time points")
+        else:
+            logger.warning(f"No interest over time data found for: {keywords}")
+            time_data = {} if columnar else []
+        
+        return {
+            'keywords': keywords,
+            'timeframe': timeframe,
+            'interest_over_time': time_data,
+            'source': 'google_trends',
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    @cached_response('related_queries')
     def get_related_queries(self, 
                            keyword: str, 
                            timeframe: str = 'today 12-m') -> Dict[str, Any]:
@@ -52,56 +339,16 @@ class GoogleTrendsCollector:
         logger.info(f"Getting related queries for: {keyword}")
         
         try:
-            # Build payload
-            self.pytrends.build_payload([keyword], timeframe=timeframe)
+            def fetch(pytrends):
+                # Build payload
+                pytrends.build_payload([keyword], timeframe=timeframe)
+                
+                # Get related queries
+                return pytrends.related_queries()
             
-            # Get related queries
-            related_queries = self.pytrends.related_queries()
+            related_queries = self._request(fetch)
             
-            if keyword in related_queries and related_queries[keyword]:
-                rising_queries = related_queries[keyword].get('rising', pd.DataFrame())
-                top_queries = related_queries[keyword].get('top', pd.DataFrame())
-                
-                # Convert to list of dictionaries
-                rising_data = []
-                if not rising_queries.empty:
-                    for _, row in rising_queries.iterrows():
-                        rising_data.append({
-                            'query': row['query'],
-                            'value': int(row['value']),
-                            'type': 'rising'
-                        })
-                
-                top_data = []
-                if not top_queries.empty:
-                    for _, row in top_queries.iterrows():
-                        top_data.append({
-                            'query': row['query'],
-                            'value': int(row['value']),
-                            'type': 'top'
-                        })
-                
-                result = {
-                    'keyword': keyword,
-                    'timeframe': timeframe,
-                    'rising_queries': rising_data,
-                    'top_queries': top_data,
-                    'source': 'google_trends',
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                logger.info(f"Found {len(rising_data)} rising and {len(top_data)} top queries")
-                return result
-            else:
-                logger.warning(f"No related queries found for: {keyword}")
-                return {
-                    'keyword': keyword,
-                    'timeframe': timeframe,
-                    'rising_queries': [],
-                    'top_queries': [],
-                    'source': 'google_trends',
-                    'timestamp': datetime.now().isoformat()
-                }
+            return self._related_queries_result(keyword, timeframe, related_queries)
                 
         except Exception as e:
             logger.error(f"Error getting related queries for {keyword}: {e}")
@@ -115,6 +362,7 @@ class GoogleTrendsCollector:
                 'timestamp': datetime.now().isoformat()
             }
     
+    @cached_response('related_topics')
     def get_related_topics(self, 
                           keyword: str, 
                           timeframe: str = 'today 12-m') -> Dict[str, Any]:
@@ -131,58 +379,16 @@ class GoogleTrendsCollector:
         logger.info(f"Getting related topics for: {keyword}")
         
         try:
-            # Build payload
-            self.pytrends.build_payload([keyword], timeframe=timeframe)
+            def fetch(pytrends):
+                # Build payload
+                pytrends.build_payload([keyword], timeframe=timeframe)
+                
+                # Get related topics
+                return pytrends.related_topics()
             
-            # Get related topics
-            related_topics = self.pytrends.related_topics()
+            related_topics = self._request(fetch)
             
-            if keyword in related_topics and related_topics[keyword]:
-                rising_topics = related_topics[keyword].get('rising', pd.DataFrame())
-                top_topics = related_topics[keyword].get('top', pd.DataFrame())
-                
-                # Convert to list of dictionaries
-                rising_data = []
-                if not rising_topics.empty:
-                    for _, row in rising_topics.iterrows():
-                        rising_data.append({
-                            'topic_title': row['topic_title'],
-                            'topic_type': row['topic_type'],
-                            'value': int(row['value']),
-                            'type': 'rising'
-                        })
-                
-                top_data = []
-                if not top_topics.empty:
-                    for _, row in top_topics.iterrows():
-                        top_data.append({
-                            'topic_title': row['topic_title'],
-                            'topic_type': row['topic_type'],
-                            'value': int(row['value']),
-                            'type': 'top'
-                        })
-                
-                result = {
-                    'keyword': keyword,
-                    'timeframe': timeframe,
-                    'rising_topics': rising_data,
-                    'top_topics': top_data,
-                    'source': 'google_trends',
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                logger.info(f"Found {len(rising_data)} rising and {len(top_data)} top topics")
-                return result
-            else:
-                logger.warning(f"No related topics found for: {keyword}")
-                return {
-                    'keyword': keyword,
-                    'timeframe': timeframe,
-                    'rising_topics': [],
-                    'top_topics': [],
-                    'source': 'google_trends',
-                    'timestamp': datetime.now().isoformat()
-                }
+            return self._related_topics_result(keyword, timeframe, related_topics)
                 
         except Exception as e:
             logger.error(f"Error getting related topics for {keyword}: {e}")
@@ -196,15 +402,113 @@ class GoogleTrendsCollector:
                 'timestamp': datetime.now().isoformat()
             }
     
+    def plan_interest_batches(self, keywords: List[str], anchor: Optional[str] = None) -> List[List[str]]:
+        """
+        Split keywords into payload-sized groups that share an anchor keyword.
+        
+        Every group holds the anchor plus up to MAX_PAYLOAD_KEYWORDS - 1 other
+        keywords, so N keywords take about N / 4 payloads and each group can be
+        rescaled against the anchor's series.
+        
+        Args:
+            keywords: Keywords to plan for (duplicates are dropped)
+            anchor: Keyword repeated in every group (default: the first keyword)
+            
+        Returns:
+            List of keyword groups
+        """
+        keywords = list(dict.fromkeys(keywords))
+        if len(keywords) <= MAX_PAYLOAD_KEYWORDS:
+            return [keywords]
+        
+        anchor = anchor or keywords[0]
+        others = [keyword for keyword in keywords if keyword != anchor]
+        step = MAX_PAYLOAD_KEYWORDS - 1
+        return [[anchor] + others[i:i + step] for i in range(0, len(others), step)]
+    
+    def _rescale_interest(self,
+                          keywords: List[str],
+                          timeframe: str,
+                          parts: List[Dict[str, Any]],
+                          anchor: str) -> Dict[str, Any]:
+        """
+        Put interest results from anchored groups on one scale and join them.
+        
+        Each group is multiplied by the ratio of the anchor's total interest in
+        the reference group (the first with a non-zero anchor) to its total in
+        that group. Groups where the anchor is all zeros cannot be rescaled and
+        are kept as returned.
+        
+        Args:
+            keywords: All keywords, in output order
+            timeframe: Timeframe shared by the parts
+            parts: Interest results, one per group from `plan_interest_batches`
+            anchor: Keyword shared by every group
+            
+        Returns:
+            Interest result covering every keyword
+        """
+        if len(parts) == 1:
+            return parts[0]
+        
+        frames = [pd.DataFrame(part.get('interest_over_time') or []) for part in parts]
+        totals = [int(frame[anchor].sum()) if anchor in frame.columns else 0 for frame in frames]
+        reference = next((total for total in totals if total), 0)
+        
+        for part, frame, total in zip(parts, frames, totals):
+            if not total:
+                if not frame.empty:
+                    logger.warning(f"Anchor '{anchor}' has no interest in group {part['keywords']}, left unscaled")
+                continue
+            if total != reference:
+                values = frame.columns.drop(['date', 'is_partial'])
+                frame[values] = (frame[values] * (reference / total)).round().astype('int64')
+        
+        result = self._merge_interest(keywords, timeframe, parts, frames)
+        result['anchor'] = anchor
+        return result
+    
     def get_interest_over_time(self, 
                               keywords: List[str], 
-                              timeframe: str = 'today 12-m') -> Dict[str, Any]:
+                              timeframe: str = 'today 12-m',
+                              anchor: Optional[str] = None,
+                              columnar: bool = False) -> Dict[str, Any]:
         """
         Get interest over time for keywords.
         
+        Lists longer than one payload are split by `plan_interest_batches`,
+        fetched concurrently and rescaled against the shared anchor, so the
+        series of all keywords are comparable.
+        
         Args:
             keywords: List of keywords to track
             timeframe: Time range for the search (default: 'today 12-m')
+            anchor: Keyword shared by every batch (default: the first keyword)
+            columnar: Return data points as {'date': [...], 'is_partial': [...],
+                keyword: [...]} instead of one dict per date; cheaper to build and
+                accepted as-is by `DataWarehouseManager.store_trends`
+            
+        Returns:
+            Dictionary containing interest over time data
+        """
+        batches = self.plan_interest_batches(keywords, anchor)
+        if len(batches) == 1:
+            return self._get_interest_payload(batches[0], timeframe, columnar)
+        
+        logger.info(f"Getting interest over time for {len(keywords)} keywords in {len(batches)} batches")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='trends') as executor:
+            parts = list(executor.map(lambda batch: self._get_interest_payload(batch, timeframe, columnar), batches))
+        return self._rescale_interest(list(dict.fromkeys(keywords)), timeframe, parts, batches[0][0])
+    
+    @cached_response('interest_over_time')
+    def _get_interest_payload(self, keywords: List[str], timeframe: str, columnar: bool = False) -> Dict[str, Any]:
+        """
+        Get interest over time for keywords that fit in one payload.
+        
+        Args:
+            keywords: Up to MAX_PAYLOAD_KEYWORDS keywords
+            timeframe: Time range for the search
+            columnar: Return data points as {column: values}
             
         Returns:
             Dictionary containing interest over time data
@@ -212,47 +516,16 @@ class GoogleTrendsCollector:
         logger.info(f"Getting interest over time for: {keywords}")
         
         try:
-            # Build payload
-            self.pytrends.build_payload(keywords, timeframe=timeframe)
-            
-            # Get interest over time
-            interest_over_time = self.pytrends.interest_over_time()
-            
-            if not interest_over_time.empty:
-                # Convert to list of dictionaries
-                time_data = []
-                for date, row in interest_over_time.iterrows():
-                    data_point = {
-                        'date': date.isoformat(),
-                        'is_partial': bool(row.get('isPartial', False))
-                    }
-                    
-                    # Add interest values for each keyword
-                    for keyword in keywords:
-                        if keyword in row:
-                            data_point[keyword] = int(row[keyword])
-                    
-                    time_data.append(data_point)
+            def fetch(pytrends):
+                # Build payload
+                pytrends.build_payload(keywords, timeframe=timeframe)
                 
-                result = {
-                    'keywords': keywords,
-                    'timeframe': timeframe,
-                    'interest_over_time': time_data,
-                    'source': 'google_trends',
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                logger.info(f"Retrieved interest data for {len(time_data)} time points")
-                return result
-            else:
-                logger.warning(f"No interest over time data found for: {keywords}")
-                return {
-                    'keywords': keywords,
-                    'timeframe': timeframe,
-                    'interest_over_time': [],
-                    'source': 'google_trends',
-                    'timestamp': datetime.now().isoformat()
-                }
+                # Get interest over time
+                return pytrends.interest_over_time()
+            
+            interest_over_time = self._request(fetch)
+            
+            return self._interest_result(keywords, timeframe, interest_over_time, columnar)
                 
         except Exception as e:
             logger.error(f"Error getting interest over time for {keywords}: {e}")
@@ -265,6 +538,256 @@ class GoogleTrendsCollector:
                 'timestamp': datetime.now().isoformat()
             }
     
+    def _bucket_interest(self, frame: pd.DataFrame, tail: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Average fetched interest points into the buckets of a stored series.
+        
+        A short refresh window comes back daily while a year-long stored
+        series is weekly, so the fetched points are grouped on the stored
+        grid, taken from the tail's latest complete point and spacing.
+        
+        Args:
+            frame: Fetched data points, with 'date' parsed to timestamps
+            tail: Stored tail from `DataWarehouseManager.get_interest_tails`
+            
+        Returns:
+            Frame indexed by bucket date with 'is_partial' and one column per keyword
+        """
+        complete = [pd.Timestamp(point['date']) for point in tail['points'] if not point['is_partial']]
+        step = (complete[-1] - complete[-2]).days if len(complete) > 1 else 1
+        if len(frame) < 2 or (frame['date'].iloc[1] - frame['date'].iloc[0]).days >= step:
+            # Already at the stored resolution
+            return frame.set_index('date')
+        
+        origin = pd.Timestamp(tail['latest'])
+        buckets = origin + pd.to_timedelta((frame['date'] - origin).dt.days // step * step, unit='D')
+        values = frame.drop(columns=['date', 'is_partial']).groupby(buckets.values).mean()
+        partial = frame['is_partial'].groupby(buckets.values).any()
+        # The bucket still being filled is partial too
+        partial |= partial.index + pd.Timedelta(days=step) > frame['date'].max() + pd.Timedelta(days=1)
+        values.insert(0, 'is_partial', partial)
+        return values
+    
+    def _continue_interest(self,
+                           keywords: List[str],
+                           part: Dict[str, Any],
+                           tails: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Rescale a refreshed interest result onto the stored series it extends.
+        
+        Each keyword with a stored tail is scaled by the ratio of its stored
+        to fetched totals over their complete common buckets; keywords
+        without one follow the anchor (the first keyword). Values at or
+        before a keyword's latest stored point are dropped.
+        
+        Args:
+            keywords: Keywords of the result, anchor first
+            part: Interest result from `get_interest_over_time`
+            tails: Stored tails by keyword
+            
+        Returns:
+            Frame indexed by date with 'is_partial' and one column per keyword (NaN where not new)
+        """
+        frame = pd.DataFrame(part.get('interest_over_time') or [])
+        if frame.empty:
+            return frame
+        frame['date'] = pd.to_datetime(frame['date'])
+        anchor = keywords[0]
+        frame = self._bucket_interest(frame, tails[anchor])
+        complete = frame.index[~frame['is_partial']]
+        
+        factors = {}
+        for keyword in keywords:
+            if keyword in tails and keyword in frame.columns:
+                stored = pd.Series({
+                    pd.Timestamp(point['date']): point['interest_value']
+                    for point in tails[keyword]['points'] if not point['is_partial']
+                }, dtype='float64')
+                common = stored.index.intersection(complete)
+                stored_total, fetched_total = stored[common].sum(), frame.loc[common, keyword].sum()
+                if stored_total and fetched_total:
+                    factors[keyword] = stored_total / fetched_total
+        
+        for keyword in keywords:
+            if keyword not in frame.columns:
+                continue
+            factor = factors.get(keyword, factors.get(anchor))
+            if factor is None:
+                logger.warning(f"No overlapping interest for '{keyword}', left unscaled")
+                factor = 1.0
+            values = (frame[keyword] * factor).round()
+            if keyword in tails:
+                values[values.index <= pd.Timestamp(tails[keyword]['latest'])] = float('nan')
+            frame[keyword] = values
+        return frame
+    
+    def refresh_interest_over_time(self,
+                                   keywords: List[str],
+                                   tails: Dict[str, Dict[str, Any]],
+                                   timeframe: str = 'today 12-m') -> Dict[str, Any]:
+        """
+        Fetch only the interest points a stored series is missing.
+        
+        Keywords with a stored tail (see `DataWarehouseManager.get_interest_tails`)
+        are fetched over a custom window from the start of the earliest tail
+        to today, averaged into the stored buckets and rescaled on the
+        overlap (see `_continue_interest`), so a daily refresh costs a few
+        weeks of points rather than the whole timeframe. Keywords with no tail,
+        or one too old for a daily window, are fetched over the full
+        timeframe beside a keyword that has one and put on the stored scale
+        through it.
+        
+        Args:
+            keywords: Keywords to refresh
+            tails: Stored tails by keyword
+            timeframe: Timeframe of the stored series
+            
+        Returns:
+            Interest result for `timeframe` holding only points after each
+            keyword's latest complete stored point, ready for
+            `DataWarehouseManager.store_trends`
+        """
+        keywords = list(dict.fromkeys(keywords))
+        today = datetime.now().date()
+        
+        def window_start(keyword):
+            tail = tails[keyword]
+            return tail['points'][0]['date'] if tail['points'] else tail['latest']
+        
+        recent = [
+            keyword for keyword in keywords
+            if keyword in tails and (today - date.fromisoformat(window_start(keyword))).days <= DAILY_WINDOW_MAX_DAYS
+        ]
+        if not recent:
+            logger.info(f"No stored interest to extend for {keywords}, fetching the full timeframe")
+            return self.get_interest_over_time(keywords, timeframe)
+        
+        fetches = [(recent, f"{min(window_start(keyword) for keyword in recent)} {today.isoformat()}")]
+        rest = [keyword for keyword in keywords if keyword not in recent]
+        if rest:
+            fetches.append(([recent[0]] + rest, timeframe))
+        
+        frames, errors = [], []
+        for group, window in fetches:
+            logger.info(f"Refreshing interest for {len(group)} keywords over '{window}'")
+            part = self.get_interest_over_time(group, window, anchor=group[0])
+            if part.get('error'):
+                errors.append(part['error'])
+            frames.append(self._continue_interest(group, part, tails))
+        
+        frames = [frame for frame in frames if not frame.empty]
+        time_data = []
+        if frames:
+            # Earlier fetches win where a keyword appears twice (the anchor)
+            merged = pd.concat(frames).groupby(level=0)
+            partial = merged['is_partial'].any()
+            values = merged[[keyword for keyword in keywords if any(keyword in frame.columns for frame in frames)]].first()
+            for day, row in values.iterrows():
+                point = {keyword: int(value) for keyword, value in row.items() if not pd.isna(value)}
+                if point:
+                    time_data.append({'date': day.strftime('%Y-%m-%dT%H:%M:%S'), 'is_partial': bool(partial[day]), **point})
+        
+        logger.info(f"Refreshed {len(time_data)} interest points for {len(keywords)} keywords")
+        result = {
+            'keywords': keywords,
+            'timeframe': timeframe,
+            'interest_over_time': time_data,
+            'source': 'google_trends',
+            'timestamp': datetime.now().isoformat()
+        }
+        if errors:
+            result['error'] = '; '.join(errors)
+        return result
+    
+    @cached_response('keyword_bundle')
+    def get_keyword_bundle(self,
+                           keywords: List[str],
+                           timeframe: str = 'today 12-m',
+                           columnar: bool = False) -> Dict[str, Any]:
+        """
+        Get related queries, related topics and interest over time from one payload.
+        
+        The widget tokens fetched by a single `build_payload` serve all three
+        reports, so a bundle costs one token request per (keyword set,
+        timeframe) instead of one per report and keyword.
+        
+        Args:
+            keywords: Up to MAX_PAYLOAD_KEYWORDS keywords
+            timeframe: Time range for the search (default: 'today 12-m')
+            columnar: Return interest data points as {column: values}
+            
+        Returns:
+            Dictionary with per-keyword 'related_queries' and 'related_topics'
+            results and the payload's 'interest_over_time' result
+        """
+        if len(keywords) > MAX_PAYLOAD_KEYWORDS:
+            raise ValueError(f"A Google Trends payload holds at most {MAX_PAYLOAD_KEYWORDS} keywords")
+        
+        logger.info(f"Getting trend bundle for: {keywords} ({timeframe})")
+        
+        try:
+            def fetch(pytrends):
+                # Build payload once for every report
+                pytrends.build_payload(keywords, timeframe=timeframe)
+                return pytrends.related_queries(), pytrends.related_topics(), pytrends.interest_over_time()
+            
+            related_queries, related_topics, interest_over_time = self._request(fetch)
+            
+            return {
+                'keywords': keywords,
+                'timeframe': timeframe,
+                'related_queries': {
+                    keyword: self._related_queries_result(keyword, timeframe, related_queries)
+                    for keyword in keywords
+                },
+                'related_topics': {
+                    keyword: self._related_topics_result(keyword, timeframe, related_topics)
+                    for keyword in keywords
+                },
+                'interest_over_time': self._interest_result(keywords, timeframe, interest_over_time, columnar)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting trend bundle for {keywords}: {e}")
+            timestamp = datetime.now().isoformat()
+            return {
+                'keywords': keywords,
+                'timeframe': timeframe,
+                'related_queries': {
+                    keyword: {
+                        'keyword': keyword,
+                        'timeframe': timeframe,
+                        'rising_queries': [],
+                        'top_queries': [],
+                        'source': 'google_trends',
+                        'error': str(e),
+                        'timestamp': timestamp
+                    }
+                    for keyword in keywords
+                },
+                'related_topics': {
+                    keyword: {
+                        'keyword': keyword,
+                        'timeframe': timeframe,
+                        'rising_topics': [],
+                        'top_topics': [],
+                        'source': 'google_trends',
+                        'error': str(e),
+                        'timestamp': timestamp
+                    }
+                    for keyword in keywords
+                },
+                'interest_over_time': {
+                    'keywords': keywords,
+                    'timeframe': timeframe,
+                    'interest_over_time': [],
+                    'source': 'google_trends',
+                    'error': str(e),
+                    'timestamp': timestamp
+                }
+            }
+    
+    @cached_response('trending_searches', ttl_seconds=TRENDS_TRENDING_CACHE_TTL_MINUTES * 60)
     def get_trending_searches(self, geo: str = 'US') -> List[Dict]:
         """
         Get trending searches for a specific location.
@@ -278,17 +801,19 @@ class GoogleTrendsCollector:
         logger.info(f"Getting trending searches for: {geo}")
         
         try:
-            trending_searches = self.pytrends.trending_searches(pn=geo)
+            trending_searches = self._request(lambda pytrends: pytrends.trending_searches(pn=geo))
             
-            trending_data = []
-            for index, search_term in trending_searches.iterrows():
-                trending_data.append({
-                    'rank': int(index) + 1,
-                    'search_term': search_term[0],
+            timestamp = datetime.now().isoformat()
+            trending_data = [
+                {
+                    'rank': rank,
+                    'search_term': search_term,
                     'location': geo,
                     'source': 'google_trends',
-                    'timestamp': datetime.now().isoformat()
-                })
+                    'timestamp': timestamp
+                }
+                for rank, search_term in enumerate(trending_searches.iloc[:, 0].tolist(), 1)
+            ]
             
             logger.info(f"Found {len(trending_data)} trending searches")
             return trending_data
@@ -297,6 +822,7 @@ class GoogleTrendsCollector:
             logger.error(f"Error getting trending searches for {geo}: {e}")
             return []
     
+    @cached_response('realtime_trending_searches', ttl_seconds=TRENDS_REALTIME_CACHE_TTL_MINUTES * 60)
     def get_realtime_trending_searches(self, geo: str = 'US') -> List[Dict]:
         """
         Get real-time trending searches for a specific location.
@@ -310,20 +836,22 @@ class GoogleTrendsCollector:
         logger.info(f"Getting real-time trending searches for: {geo}")
         
         try:
-            realtime_trending = self.pytrends.realtime_trending_searches(pn=geo)
+            realtime_trending = self._request(lambda pytrends: pytrends.realtime_trending_searches(pn=geo))
             
-            trending_data = []
-            for index, row in realtime_trending.iterrows():
-                trending_data.append({
-                    'rank': int(index) + 1,
+            timestamp = datetime.now().isoformat()
+            trending_data = [
+                {
+                    'rank': rank,
                     'title': row.get('title', ''),
                     'traffic': row.get('traffic', ''),
-                    'image_url': row.get('image', {}).get('newsUrl', ''),
+                    'image_url': (row.get('image') or {}).get('newsUrl', ''),
                     'articles': row.get('articles', []),
                     'location': geo,
                     'source': 'google_trends_realtime',
-                    'timestamp': datetime.now().isoformat()
-                })
+                    'timestamp': timestamp
+                }
+                for rank, row in enumerate(realtime_trending.to_dict('records'), 1)
+            ]
             
             logger.info(f"Found {len(trending_data)} real-time trending searches")
             return trending_data
@@ -332,6 +860,134 @@ class GoogleTrendsCollector:
             logger.error(f"Error getting real-time trending searches for {geo}: {e}")
             return []
     
+    def rank_trending_terms(self, searches: List[Dict]) -> List[Dict]:
+        """
+        Deduplicate trending searches across geos into one ranking.
+        
+        Terms are matched case- and whitespace-insensitively. Each term
+        scores the sum of 1 / rank over every geo (trending and real-time)
+        it appears in, so a term trending in several markets outranks one
+        that tops a single market.
+        
+        Args:
+            searches: Rows from `get_trending_searches` and
+                `get_realtime_trending_searches`, for any number of geos
+            
+        Returns:
+            List of {'term', 'ranks' (geo -> rank), 'realtime_ranks', 'geo_count', 'score'}
+            dictionaries, best first
+        """
+        terms = {}
+        for search in searches:
+            term = search.get('search_term') or search.get('title')
+            if not term:
+                continue
+            entry = terms.setdefault(' '.join(term.lower().split()), {
+                'term': term,
+                'ranks': {},
+                'realtime_ranks': {},
+                'score': 0.0
+            })
+            ranks = entry['realtime_ranks'] if search.get('source') == 'google_trends_realtime' else entry['ranks']
+            # A term listed twice in one geo keeps its better rank
+            if search['location'] not in ranks:
+                ranks[search['location']] = search['rank']
+                entry['score'] += 1 / search['rank']
+        
+        for entry in terms.values():
+            entry['geo_count'] = len(entry['ranks'].keys() | entry['realtime_ranks'].keys())
+            entry['score'] = round(entry['score'], 4)
+        return sorted(terms.values(), key=lambda entry: (-entry['score'], -entry['geo_count'], entry['term']))
+    
+    def get_trending_by_geo(self, geos: Optional[List[str]] = None, realtime: bool = True) -> Dict[str, Any]:
+        """
+        Get trending and real-time trending searches for several geos at once.
+        
+        The per-geo calls run concurrently on the session pool under the
+        shared rate controller, so covering more markets adds requests but
+        not a sequential wait per market.
+        
+        Args:
+            geos: Geographic locations (default: TRENDS_GEOS)
+            realtime: Also get real-time trending searches
+            
+        Returns:
+            Dictionary with the per-geo 'trending_searches' and 'realtime_trending'
+            rows, ready for `DataWarehouseManager.store_trends`, and 'ranked',
+            the terms deduplicated across geos (see `rank_trending_terms`)
+        """
+        geos = list(dict.fromkeys(geos or TRENDS_GEOS))
+        logger.info(f"Getting trending searches for {len(geos)} geos: {geos}")
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='trends') as executor:
+            trending = [executor.submit(self.get_trending_searches, geo) for geo in geos]
+            live = [executor.submit(self.get_realtime_trending_searches, geo) for geo in geos] if realtime else []
+            trending_searches = [search for future in trending for search in future.result()]
+            realtime_trending = [search for future in live for search in future.result()]
+        
+        return {
+            'geos': geos,
+            'trending_searches': trending_searches,
+            'realtime_trending': realtime_trending,
+            'ranked': self.rank_trending_terms(trending_searches + realtime_trending),
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _merge_interest(self,
+                        keywords: List[str],
+                        timeframe: str,
+                        parts: List[Dict[str, Any]],
+                        frames: Optional[List[pd.DataFrame]] = None) -> Dict[str, Any]:
+        """
+        Join interest-over-time results from several payloads on their dates.
+        
+        Values are taken as given; parts from different payloads should be
+        rescaled first (see `_rescale_interest`). Keywords repeated across
+        parts (the anchor) keep their value from the first part.
+        
+        Args:
+            keywords: All keywords, in output order
+            timeframe: Timeframe shared by the parts
+            parts: Interest results, one per payload
+            frames: The parts' data points as DataFrames, if already built
+            
+        Returns:
+            Interest result covering every keyword, columnar if any part was
+        """
+        if len(parts) == 1:
+            return parts[0]
+        
+        columnar = any(isinstance(part.get('interest_over_time'), dict) for part in parts)
+        if frames is None:
+            frames = [pd.DataFrame(part.get('interest_over_time') or []) for part in parts]
+        frames = [frame.set_index('date') for frame in frames if not frame.empty]
+        
+        if frames:
+            partial = pd.concat([frame['is_partial'] for frame in frames], axis=1).fillna(False).astype(bool).any(axis=1)
+            seen = set()
+            values = []
+            for frame in frames:
+                columns = [column for column in frame.columns if column != 'is_partial' and column not in seen]
+                seen.update(columns)
+                values.append(frame[columns])
+            merged = pd.concat(values, axis=1).fillna(0).astype('int64').sort_index()
+            merged.insert(0, 'is_partial', partial.reindex(merged.index))
+            time_data = self._interest_points(merged.rename_axis('date').reset_index(), columnar)
+        else:
+            time_data = {} if columnar else []
+        
+        result = {
+            'keywords': keywords,
+            'timeframe': timeframe,
+            'interest_over_time': time_data,
+            'source': 'google_trends',
+            'timestamp': datetime.now().isoformat()
+        }
+        errors = [part['error'] for part in parts if part.get('error')]
+        if errors:
+            result['error'] = '; '.join(errors)
+        return result
+    
     def save_data_to_file(self, data: Any, filename: str = None):
         """
         Save trend data to a JSON file.
@@ -355,20 +1011,57 @@ class GoogleTrendsCollector:
     def collect_comprehensive_trends(self,
                                    keywords: List[str],
                                    timeframes: List[str] = None,
-                                   save_to_file: bool = True) -> Dict[str, Any]:
+                                   save_to_file: bool = True,
+                                   columnar: bool = False,
+                                   journal: Optional[CollectionJournal] = None,
+                                   resume: bool = False,
+                                   geos: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Collect comprehensive trend data for keywords.
         
+        Keywords are fetched in anchored groups from `plan_interest_batches`,
+        each payload serving related queries, related topics and interest over
+        time (see `get_keyword_bundle`); interest is rescaled across groups on
+        the anchor. Payloads run on up to `concurrency` sessions at once, paced
+        by the shared rate controller, so network waits overlap.
+        
+        With a journal, each payload and trending-searches call is checkpointed
+        as soon as it completes, so a resumed run only requests the units that
+        are missing or failed.
+        
+        With `save_to_file`, results are streamed to an NDJSON file (compressed
+        per TRENDS_OUTPUT_COMPRESSION) as each unit completes: one record per
+        keyword, timeframe and report, and per geo for trending searches.
+        Interest over time is written per timeframe once its groups are
+        rescaled. `trends_sink.read_trends_ndjson` rebuilds this method's
+        result from the file, including one cut short mid-run. The file is
+        written as data_warehouse/keywords/comprehensive_trends_<timestamp>.ndjson.gz
+        by default (.ndjson.zst or .ndjson per TRENDS_OUTPUT_COMPRESSION); it
+        used to be a single .json file written at the end of the run.
+        
+        Streaming bounds what a crash loses, not memory: the returned
+        dictionary still holds the full result, as callers store it in the
+        warehouse afterwards.
+        
         Args:
             keywords: List of keywords to analyze
             timeframes: List of timeframes to analyze (default: ['today 12-m', 'today 3-m'])
-            save_to_file: Whether to save results to file
+            save_to_file: Whether to stream results to an NDJSON file
+            columnar: Return interest data points as {column: values} (see
+                `get_interest_over_time`)
+            journal: Checkpoint journal for the run (optional)
+            resume: Reuse units completed by an unfinished run with the same
+                keywords and timeframes (requires `journal`)
+            geos: Geographic locations for trending searches (default: TRENDS_GEOS)
             
         Returns:
             Dictionary containing all collected trend data
         """
         if timeframes is None:
             timeframes = ['today 12-m', 'today 3-m']
+        geos = list(dict.fromkeys(geos or TRENDS_GEOS))
+        # Deduplicated once, so the plan, the result layout and the rescale all see the same list
+        keywords = list(dict.fromkeys(keywords))
         
         logger.info(f"Starting comprehensive trend data collection for: {keywords}")
         
@@ -380,42 +1073,114 @@ class GoogleTrendsCollector:
             'related_topics': {},
             'interest_over_time': {},
             'trending_searches': [],
-            'realtime_trending': []
+            'realtime_trending': [],
+            'trending_ranked': []
         }
         
-        # Get related queries and topics for each keyword and timeframe
-        for keyword in keywords:
-            results['related_queries'][keyword] = {}
-            results['related_topics'][keyword] = {}
-            
-            for timeframe in timeframes:
-                # Add delay to avoid rate limiting
-                time.sleep(1)
-                
-                results['related_queries'][keyword][timeframe] = self.get_related_queries(keyword, timeframe)
-                results['related_topics'][keyword][timeframe] = self.get_related_topics(keyword, timeframe)
+        sink = None
+        if save_to_file:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            sink = NDJSONSink(BASE_DIR / 'data_warehouse' / 'keywords' / f"comprehensive_trends_{timestamp}", TRENDS_OUTPUT_COMPRESSION)
+            sink.write('run', {
+                'keywords': keywords,
+                'timeframes': timeframes,
+                'geos': geos,
+                'collection_timestamp': results['collection_timestamp']
+            })
+            sink.flush()
         
-        # Get interest over time for all keywords
-        for timeframe in timeframes:
-            time.sleep(1)
-            results['interest_over_time'][timeframe] = self.get_interest_over_time(keywords, timeframe)
+        def stream_bundle(done, owns_anchor):
+            if done.exception() is None:
+                bundle = done.result()
+                for keyword in bundle['keywords']:
+                    # The anchor is in every group; only its first group's results are kept
+                    if keyword == bundle['keywords'][0] and not owns_anchor:
+                        continue
+                    sink.write('related_queries', bundle['related_queries'][keyword], keyword=keyword, timeframe=bundle['timeframe'])
+                    sink.write('related_topics', bundle['related_topics'][keyword], keyword=keyword, timeframe=bundle['timeframe'])
+                sink.flush()
         
-        # Get trending searches
-        results['trending_searches'] = self.get_trending_searches()
-        results['realtime_trending'] = self.get_realtime_trending_searches()
+        def stream_searches(done, record_type, geo):
+            if done.exception() is None:
+                sink.write(record_type, done.result(), geo=geo)
+                sink.flush()
         
-        # Save to file if requested
-        if save_to_file:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"comprehensive_trends_{timestamp}.json"
-            self.save_data_to_file(results, filename)
+        completed = {}
+        if journal is not None:
+            completed = journal.open_run(
+                {'keywords': keywords, 'timeframes': timeframes, 'columnar': columnar, 'geos': geos}, resume
+            )
+        
+        def submit(unit, func, *args):
+            # Reuse a checkpointed result, or run the unit and checkpoint it once done
+            if unit in completed:
+                future = Future()
+                future.set_result(completed[unit])
+                return future
+            future = executor.submit(func, *args)
+            if journal is not None:
+                future.add_done_callback(lambda done: done.exception() or journal.record(unit, done.result()))
+            return future
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='trends') as executor:
+            # One bundle per keyword group and timeframe
+            groups = self.plan_interest_batches(keywords)
+            bundles = {
+                timeframe: [
+                    submit(json.dumps(['bundle', timeframe, group]), self.get_keyword_bundle, group, timeframe, columnar)
+                    for group in groups
+                ]
+                for timeframe in timeframes
+            }
+            
+            # Trending searches, one call per geo and kind
+            trending = [submit(json.dumps(['trending_searches', geo]), self.get_trending_searches, geo) for geo in geos]
+            realtime = [submit(json.dumps(['realtime_trending', geo]), self.get_realtime_trending_searches, geo) for geo in geos]
+            
+            if sink is not None:
+                for futures in bundles.values():
+                    for index, future in enumerate(futures):
+                        future.add_done_callback(lambda done, first=(index == 0): stream_bundle(done, first))
+                for record_type, futures in (('trending_searches', trending), ('realtime_trending', realtime)):
+                    for geo, future in zip(geos, futures):
+                        future.add_done_callback(lambda done, kind=record_type, geo=geo: stream_searches(done, kind, geo))
+            
+            # Assemble in keyword order so the result layout does not depend on timing
+            for keyword in keywords:
+                results['related_queries'][keyword] = {}
+                results['related_topics'][keyword] = {}
+            for timeframe, futures in bundles.items():
+                timeframe_bundles = [future.result() for future in futures]
+                for bundle in timeframe_bundles:
+                    for keyword in bundle['keywords']:
+                        # The anchor is in every group; keep its first result
+                        results['related_queries'][keyword].setdefault(timeframe, bundle['related_queries'][keyword])
+                        results['related_topics'][keyword].setdefault(timeframe, bundle['related_topics'][keyword])
+                results['interest_over_time'][timeframe] = self._rescale_interest(
+                    keywords, timeframe, [bundle['interest_over_time'] for bundle in timeframe_bundles], groups[0][0]
+                )
+                if sink is not None:
+                    sink.write('interest_over_time', results['interest_over_time'][timeframe], timeframe=timeframe)
+                    sink.flush()
+            results['trending_searches'] = [search for future in trending for search in future.result()]
+            results['realtime_trending'] = [search for future in realtime for search in future.result()]
+            results['trending_ranked'] = self.rank_trending_terms(results['trending_searches'] + results['realtime_trending'])
+        
+        if sink is not None:
+            sink.write('trending_ranked', results['trending_ranked'])
+            sink.close()
+        
+        if journal is not None:
+            futures = [future for futures in bundles.values() for future in futures] + trending + realtime
+            units = [future.result() for future in futures]
+            if all(is_complete_response(unit) for unit in units):
+                journal.finish_run()
+            else:
+                logger.warning("Some collection units failed; rerun with resume to retry only those")
         
         logger.info("Comprehensive trend data collection completed")
         return results
 
-# Import pandas for DataFrame handling
-import pandas as pd
-
 # Example usage and testing
 if __name__ == "__main__":
     # Example usage
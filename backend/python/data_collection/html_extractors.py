@@ -0,0 +1,191 @@
+"""
+HTML Keyword Extractors
+
+This module pulls keyword candidates out of scraped HTML pages with
+precompiled XPath selectors. A page is parsed once with lxml's C parser and
+every extractor registered for its page type runs over the same tree, so the
+cost of a page is one parse plus a handful of tree walks, with no regex
+backtracking over the raw markup.
+"""
+
+from typing import List, Dict, Optional, Any
+from datetime import datetime
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from lxml import etree, html
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_html(content: str) -> Optional[html.HtmlElement]:
+    """
+    Parse a page into an lxml tree.
+    
+    Args:
+        content: Page HTML
+    
+    Returns:
+        Document root, or None if the page is empty or unparseable
+    """
+    if not content or not content.strip():
+        return None
+    try:
+        return html.document_fromstring(content)
+    except (etree.ParserError, ValueError) as e:
+        logger.warning(f"Could not parse HTML page: {e}")
+        return None
+
+
+def _collapse(node: Any) -> str:
+    """Text of an element or XPath string result with whitespace collapsed."""
+    text = node if isinstance(node, str) else node.text_content()
+    return ' '.join(text.split())
+
+
+class XPathExtractor:
+    """
+    Keyword extractor driven by a precompiled XPath selector.
+    
+    `xpath` selects one element per keyword; when `text_xpath` is given it is
+    evaluated relative to each element and its first non-empty match supplies
+    the text, otherwise the element's whole text content is used. Whitespace
+    is collapsed and duplicate keywords are dropped, keeping page order.
+    """
+    
+    def __init__(self,
+                 source: str,
+                 xpath: str,
+                 text_xpath: Optional[str] = None,
+                 seed_field: str = 'seed_keyword',
+                 fields: Optional[Dict[str, Any]] = None):
+        """
+        Compile the selectors.
+        
+        Args:
+            source: Value stored as 'source' on every keyword
+            xpath: Selector for the elements holding one keyword each
+            text_xpath: Selector, relative to each element, for the keyword text
+            seed_field: Key under which the seed (keyword, language, ...) is stored
+            fields: Extra constant fields added to every keyword
+        """
+        self.source = source
+        self.seed_field = seed_field
+        self.fields = fields or {}
+        self._select = etree.XPath(xpath)
+        self._text = etree.XPath(text_xpath) if text_xpath else None
+    
+    def _element_text(self, element: Any) -> str:
+        """Collapsed text of one selected element, or of its first non-empty text match."""
+        if self._text is None:
+            return _collapse(element)
+        for match in self._text(element):
+            text = _collapse(match)
+            if text:
+                return text
+        return ''
+    
+    def texts(self, document: html.HtmlElement) -> List[str]:
+        """
+        Extract the distinct keyword texts of a parsed page.
+        
+        Args:
+            document: Tree returned by parse_html
+        
+        Returns:
+            Keyword texts in page order
+        """
+        seen = set()
+        texts = []
+        for element in self._select(document):
+            text = self._element_text(element)
+            if text and text not in seen:
+                seen.add(text)
+                texts.append(text)
+        return texts
+    
+    def __call__(self, document: html.HtmlElement, seed: str) -> List[Dict]:
+        """
+        Extract keyword records from a parsed page.
+        
+        Args:
+            document: Tree returned by parse_html
+            seed: The keyword (or language) the page was fetched for
+        
+        Returns:
+            List of keyword dictionaries
+        """
+        timestamp = datetime.now().isoformat()
+        return [
+            {
+                'keyword': text,
+                'source': self.source,
+                self.seed_field: seed,
+                'timestamp': timestamp,
+                'search_volume': 'unknown',
+                'difficulty': 'unknown',
+                **self.fields
+            }
+            for text in self.texts(document)
+        ]
+
+
+# Extractors by page type, then by source name
+PAGE_EXTRACTORS = {
+    'serp': {
+        # Query links in the "Searches related to ..." block at the bottom of a results
+        # page. Without #bres the block is the nearest container of query links around
+        # its heading; if that container also holds results or navigation, the layout
+        # is unknown and nothing is taken rather than every link on the page.
+        'related_searches': XPathExtractor(
+            'google_related',
+            "//div[@id='bres']//a[starts-with(@href, '/search')]"
+            " | //*[starts-with(normalize-space(text()), 'Searches related to')]"
+            "/ancestor::div[.//a[starts-with(@href, '/search')]][1]"
+            "[not(.//h3) and not(.//*[@role='navigation'])]"
+            "//a[starts-with(@href, '/search')]"
+        ),
+        # Each "People also ask" entry; its question is the first non-empty span
+        'people_also_ask': XPathExtractor(
+            'people_also_ask',
+            "//div[contains(@class, 'related-question-pair')]"
+            " | //div[contains(@class, 'related-question') and not(ancestor::div[contains(@class, 'related-question')])]",
+            text_xpath=".//span[normalize-space()]",
+            fields={'type': 'question'}
+        ),
+    },
+    'github_trending': {
+        # Repository links ("owner / name") in the trending list
+        'github_trending': XPathExtractor(
+            'github_trending',
+            "//article[contains(@class, 'Box-row')]//h2/a | //h2[contains(@class, 'lh-condensed')]/a",
+            seed_field='language'
+        ),
+    },
+}
+
+
+def extract_page(document: html.HtmlElement,
+                 page_type: str,
+                 seed: str,
+                 extractors: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+    """
+    Run the extractors registered for a page type over one parsed page.
+    
+    Args:
+        document: Tree returned by parse_html
+        page_type: Key of PAGE_EXTRACTORS
+        seed: The keyword (or language) the page was fetched for
+        extractors: Source names to run (default: all for the page type)
+    
+    Returns:
+        Mapping of source name to the keywords it found
+    """
+    registry = PAGE_EXTRACTORS[page_type]
+    names = extractors if extractors is not None else list(registry)
+    return {name: registry[name](document, seed) for name in names}
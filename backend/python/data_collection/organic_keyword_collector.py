@@ -6,35 +6,128 @@ that don't require Google Ads API access. It focuses on finding popular search
 terms in your niche for content generation.
 """
 
-import time
 import json
+import string
+import threading
+import time
 import requests
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Optional, Any, Callable
+from datetime import datetime
 from pathlib import Path
 import sys
-import re
 from urllib.parse import quote_plus, urlparse
-import pandas as pd
 
 # Add the parent directory to the path so we can import our modules
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from config.settings import BASE_DIR
+from config.settings import (
+    BASE_DIR, ORGANIC_CONCURRENCY, ORGANIC_HOST_RATES, ORGANIC_DEFAULT_REQUESTS_PER_SECOND,
+    ORGANIC_EXPANSION_DEPTH, ORGANIC_EXPANSION_BUDGET, ORGANIC_TOOL_TERMS_FILE
+)
+from data_collection.html_extractors import PAGE_EXTRACTORS, parse_html
 from utils.logger import get_logger
+from utils.rate_limiter import TokenBucket
+from utils.text_matcher import VocabularyMatcher
 
 logger = get_logger(__name__)
 
+# Google results pages kept in memory for reuse by SERP extractors, and for how long
+SERP_CACHE_SIZE = 256
+SERP_CACHE_TTL_SECONDS = 900
+
+# Extractors run over each fetched results page, by source name
+SERP_EXTRACTORS = PAGE_EXTRACTORS['serp']
+
+# Online tool terms looked for in Reddit posts, extended by ORGANIC_TOOL_TERMS_FILE
+TOOL_TERMS = [
+    'pdf', 'converter', 'merger', 'splitter', 'compressor',
+    'online', 'tool', 'free', 'download', 'merge', 'split',
+    'compress', 'convert', 'format', 'file', 'document'
+]
+
+
 class OrganicKeywordCollector:
     """Collects organic keyword data from multiple free sources."""
     
-    def __init__(self):
-        """Initialize the organic keyword collector."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        logger.info("Organic keyword collector initialized")
+    def __init__(self,
+                 concurrency: Optional[int] = None,
+                 host_rates: Optional[Dict[str, float]] = None,
+                 tool_terms: Optional[List[str]] = None):
+        """
+        Initialize the organic keyword collector.
+        
+        Args:
+            concurrency: Worker threads used by collect_comprehensive_keywords (default: ORGANIC_CONCURRENCY)
+            host_rates: Requests per second per host, on top of ORGANIC_HOST_RATES; other
+                hosts get ORGANIC_DEFAULT_REQUESTS_PER_SECOND
+            tool_terms: Terms matched in Reddit posts (default: TOOL_TERMS plus the
+                lines of ORGANIC_TOOL_TERMS_FILE)
+        """
+        self.concurrency = max(1, concurrency or ORGANIC_CONCURRENCY)
+        self.host_rates = {**ORGANIC_HOST_RATES, **(host_rates or {})}
+        self._buckets = {}
+        self._bucket_lock = threading.Lock()
+        self._local = threading.local()
+        self.serp_extractors = dict(SERP_EXTRACTORS)
+        self._serp_pages = OrderedDict()
+        self._serp_lock = threading.Lock()
+        self.tool_terms = VocabularyMatcher(tool_terms if tool_terms is not None else self._default_tool_terms())
+        logger.info(f"Organic keyword collector initialized (concurrency {self.concurrency})")
+    
+    def _default_tool_terms(self) -> List[str]:
+        """TOOL_TERMS plus any terms listed in ORGANIC_TOOL_TERMS_FILE."""
+        terms = list(TOOL_TERMS)
+        if ORGANIC_TOOL_TERMS_FILE:
+            try:
+                with open(ORGANIC_TOOL_TERMS_FILE, 'r', encoding='utf-8') as f:
+                    terms.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+            except OSError as e:
+                logger.error(f"Error reading tool terms from {ORGANIC_TOOL_TERMS_FILE}: {e}")
+        return terms
+    
+    def _session(self) -> requests.Session:
+        """HTTP session of the calling thread; requests sessions are not safe to share across threads."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            })
+            self._local.session = session
+        return session
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session the calling thread's requests go through."""
+        return self._session()
+    
+    @session.setter
+    def session(self, session: requests.Session):
+        self._local.session = session
+    
+    def _bucket(self, host: str) -> TokenBucket:
+        """Rate budget of one host, created on first use."""
+        with self._bucket_lock:
+            if host not in self._buckets:
+                rate = self.host_rates.get(host, ORGANIC_DEFAULT_REQUESTS_PER_SECOND)
+                self._buckets[host] = TokenBucket(rate, 1)
+            return self._buckets[host]
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET a URL once its host's rate budget allows, on this thread's session.
+        
+        Args:
+            url: Absolute URL
+            **kwargs: Passed to `requests.Session.get`
+            
+        Returns:
+            The response
+        """
+        self._bucket(urlparse(url).netloc).acquire()
+        return self._session().get(url, **kwargs)
     
     def get_google_suggestions(self, keyword: str, country: str = 'us') -> List[Dict]:
         """
@@ -60,7 +153,7 @@ class OrganicKeywordCollector:
                 'gl': country
             }
             
-            response = self.session.get(url, params=params)
+            response = self._get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -83,6 +176,165 @@ class OrganicKeywordCollector:
             logger.error(f"Error getting Google suggestions: {e}")
             return []
     
+    def expand_suggestions(self,
+                           seed: str,
+                           depth: Optional[int] = None,
+                           max_requests: Optional[int] = None,
+                           country: str = 'us',
+                           prefixes: bool = True) -> List[Dict]:
+        """
+        Expand a seed into long-tail autocomplete suggestions, breadth first.
+        
+        The first level queries the seed itself and the seed with every
+        letter and digit appended (and, with `prefixes`, prepended). Each
+        following level queries the suggestions first found on the level
+        before, down to `depth` levels. A set of normalized queries already
+        asked keeps any query from being fetched twice, and no more than
+        `max_requests` requests are made in total. Each level runs
+        concurrently under the autocomplete host's rate budget.
+        
+        Args:
+            seed: The seed keyword
+            depth: Levels to expand, the alphabet level included (default: ORGANIC_EXPANSION_DEPTH)
+            max_requests: Request budget for the whole expansion (default: ORGANIC_EXPANSION_BUDGET)
+            country: Country code for localized suggestions
+            prefixes: Also query each letter and digit in front of the seed
+            
+        Returns:
+            Unique suggestions in discovery order, each with the 'query' that
+            produced it and its 'depth' (1 for the alphabet level)
+        """
+        depth = depth or ORGANIC_EXPANSION_DEPTH
+        budget = max_requests or ORGANIC_EXPANSION_BUDGET
+        
+        def normalize(text):
+            return ' '.join(text.lower().split())
+        
+        characters = string.ascii_lowercase + string.digits
+        level_queries = [seed] + [f"{seed} {character}" for character in characters]
+        if prefixes:
+            level_queries += [f"{character} {seed}" for character in characters]
+        
+        asked = set()
+        found = {}
+        requests_made = 0
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='autocomplete') as executor:
+            for level in range(1, depth + 1):
+                queries = []
+                for query in level_queries:
+                    key = normalize(query)
+                    if key not in asked and requests_made + len(queries) < budget:
+                        asked.add(key)
+                        queries.append(query)
+                if not queries:
+                    break
+                requests_made += len(queries)
+                
+                next_queries = []
+                for query, suggestions in zip(queries, executor.map(lambda query: self.get_google_suggestions(query, country), queries)):
+                    for suggestion in suggestions:
+                        key = normalize(suggestion['keyword'])
+                        if key not in found:
+                            found[key] = {**suggestion, 'seed_keyword': seed, 'query': query, 'depth': level}
+                            next_queries.append(suggestion['keyword'])
+                
+                logger.info(f"Expansion level {level} for '{seed}': {len(queries)} queries, {len(found)} suggestions so far")
+                level_queries = next_queries
+        
+        logger.info(f"Expanded '{seed}' into {len(found)} suggestions with {requests_made} requests")
+        return list(found.values())
+    
+    def register_serp_extractor(self, name: str, extractor: Callable[[Any, str], List[Dict]]):
+        """
+        Add (or replace) an extractor run over every fetched results page.
+        
+        Args:
+            name: Source name, usable in collect_comprehensive_keywords `sources`
+            extractor: Callable taking (parsed lxml page, seed keyword) and returning
+                keyword dicts, e.g. an html_extractors.XPathExtractor
+        """
+        self.serp_extractors[name] = extractor
+    
+    @staticmethod
+    def _serp_expired(entry: tuple, now: float) -> bool:
+        """Whether a cached (future, fetched_at) page is finished and older than SERP_CACHE_TTL_SECONDS."""
+        future, fetched_at = entry
+        return future.done() and now - fetched_at > SERP_CACHE_TTL_SECONDS
+    
+    def fetch_serp(self, keyword: str) -> Optional[str]:
+        """
+        Download the Google results page for a keyword, once.
+        
+        Pages are kept in a small LRU cache for SERP_CACHE_TTL_SECONDS, and
+        concurrent callers asking for the same keyword share one download.
+        
+        Args:
+            keyword: Search query
+            
+        Returns:
+            Raw page HTML, or None if the download failed
+        """
+        with self._serp_lock:
+            now = time.monotonic()
+            entry = self._serp_pages.get(keyword)
+            owner = entry is None or self._serp_expired(entry, now)
+            if owner:
+                # Drop expired pages so a long-lived collector does not hold stale HTML
+                expired = [cached for cached, cached_entry in self._serp_pages.items() if self._serp_expired(cached_entry, now)]
+                for cached in expired:
+                    del self._serp_pages[cached]
+                future = Future()
+                self._serp_pages[keyword] = (future, now)
+                while len(self._serp_pages) > SERP_CACHE_SIZE:
+                    self._serp_pages.popitem(last=False)
+            else:
+                future = entry[0]
+                self._serp_pages.move_to_end(keyword)
+        
+        if owner:
+            try:
+                response = self._get(f"https://www.google.com/search?q={quote_plus(keyword)}")
+                response.raise_for_status()
+                future.set_result(response.text)
+            except Exception as e:
+                logger.error(f"Error fetching search results for {keyword}: {e}")
+                # Failures are not cached, so a later call retries
+                with self._serp_lock:
+                    entry = self._serp_pages.get(keyword)
+                    if entry is not None and entry[0] is future:
+                        del self._serp_pages[keyword]
+                future.set_result(None)
+        return future.result()
+    
+    def get_serp_keywords(self, keyword: str, extractors: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Run SERP extractors over the single results page of a keyword.
+        
+        Args:
+            keyword: The seed keyword
+            extractors: Registered extractor names (default: all)
+            
+        Returns:
+            Mapping of extractor name to the keywords it found
+        """
+        names = extractors if extractors is not None else list(self.serp_extractors)
+        content = self.fetch_serp(keyword)
+        document = parse_html(content) if content is not None else None
+        if document is None:
+            return {name: [] for name in names}
+        
+        # Parse once; every extractor walks the same tree
+        results = {}
+        for name in names:
+            try:
+                results[name] = self.serp_extractors[name](document, keyword)
+                logger.info(f"Found {len(results[name])} {name} for: {keyword}")
+            except Exception as e:
+                logger.error(f"Error extracting {name} for {keyword}: {e}")
+                results[name] = []
+        return results
+    
     def get_related_searches(self, keyword: str) -> List[Dict]:
         """
         Get related searches from Google search results.
@@ -94,37 +346,7 @@ class OrganicKeywordCollector:
             List of related search terms
         """
         logger.info(f"Getting related searches for: {keyword}")
-        
-        related_searches = []
-        try:
-            # Search for the keyword
-            search_url = f"https://www.google.com/search?q={quote_plus(keyword)}"
-            response = self.session.get(search_url)
-            response.raise_for_status()
-            
-            # Extract related searches from the page
-            content = response.text
-            
-            # Look for "Searches related to" section
-            related_pattern = r'Searches related to.*?<a[^>]*>([^<]+)</a>'
-            matches = re.findall(related_pattern, content, re.IGNORECASE | re.DOTALL)
-            
-            for match in matches:
-                related_searches.append({
-                    'keyword': match.strip(),
-                    'source': 'google_related',
-                    'seed_keyword': keyword,
-                    'timestamp': datetime.now().isoformat(),
-                    'search_volume': 'unknown',
-                    'difficulty': 'unknown'
-                })
-            
-            logger.info(f"Found {len(related_searches)} related searches")
-            return related_searches
-            
-        except Exception as e:
-            logger.error(f"Error getting related searches: {e}")
-            return []
+        return self.get_serp_keywords(keyword, ['related_searches'])['related_searches']
     
     def get_people_also_ask(self, keyword: str) -> List[Dict]:
         """
@@ -137,37 +359,7 @@ class OrganicKeywordCollector:
             List of questions people ask
         """
         logger.info(f"Getting 'People also ask' for: {keyword}")
-        
-        questions = []
-        try:
-            search_url = f"https://www.google.com/search?q={quote_plus(keyword)}"
-            response = self.session.get(search_url)
-            response.raise_for_status()
-            
-            content = response.text
-            
-            # Look for "People also ask" questions
-            # This is a simplified pattern - in practice you'd need more sophisticated parsing
-            question_pattern = r'<div[^>]*class="[^"]*related-question[^"]*"[^>]*>.*?<span[^>]*>([^<]+)</span>'
-            matches = re.findall(question_pattern, content, re.IGNORECASE | re.DOTALL)
-            
-            for match in matches:
-                questions.append({
-                    'keyword': match.strip(),
-                    'source': 'people_also_ask',
-                    'seed_keyword': keyword,
-                    'timestamp': datetime.now().isoformat(),
-                    'search_volume': 'unknown',
-                    'difficulty': 'unknown',
-                    'type': 'question'
-                })
-            
-            logger.info(f"Found {len(questions)} 'People also ask' questions")
-            return questions
-            
-        except Exception as e:
-            logger.error(f"Error getting 'People also ask': {e}")
-            return []
+        return self.get_serp_keywords(keyword, ['people_also_ask'])['people_also_ask']
     
     def get_reddit_keywords(self, subreddit: str, limit: int = 100) -> List[Dict]:
         """
@@ -186,7 +378,7 @@ class OrganicKeywordCollector:
         try:
             # Reddit JSON API
             url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}"
-            response = self.session.get(url)
+            response = self._get(url)
             response.raise_for_status()
             
             data = response.json()
@@ -196,27 +388,17 @@ class OrganicKeywordCollector:
                 title = post_data.get('title', '')
                 selftext = post_data.get('selftext', '')
                 
-                # Extract potential keywords from title and text
-                text = f"{title} {selftext}".lower()
-                
-                # Look for common online tool related terms
-                tool_keywords = [
-                    'pdf', 'converter', 'merger', 'splitter', 'compressor',
-                    'online', 'tool', 'free', 'download', 'merge', 'split',
-                    'compress', 'convert', 'format', 'file', 'document'
-                ]
-                
-                for tool_keyword in tool_keywords:
-                    if tool_keyword in text:
-                        keywords.append({
-                            'keyword': tool_keyword,
-                            'source': 'reddit',
-                            'subreddit': subreddit,
-                            'post_title': title[:100],
-                            'timestamp': datetime.now().isoformat(),
-                            'search_volume': 'unknown',
-                            'difficulty': 'unknown'
-                        })
+                # One pass over title and text finds every tool term as a whole word
+                for tool_keyword in self.tool_terms.find_terms(f"{title} {selftext}"):
+                    keywords.append({
+                        'keyword': tool_keyword,
+                        'source': 'reddit',
+                        'subreddit': subreddit,
+                        'post_title': title[:100],
+                        'timestamp': datetime.now().isoformat(),
+                        'search_volume': 'unknown',
+                        'difficulty': 'unknown'
+                    })
             
             logger.info(f"Found {len(keywords)} keywords from r/{subreddit}")
             return keywords
@@ -250,7 +432,7 @@ class OrganicKeywordCollector:
                 'order': 'desc'
             }
             
-            response = self.session.get(url, params=params)
+            response = self._get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -291,26 +473,12 @@ class OrganicKeywordCollector:
         keywords = []
         try:
             url = f"https://github.com/trending/{language}"
-            response = self.session.get(url)
+            response = self._get(url)
             response.raise_for_status()
             
-            content = response.text
-            
-            # Extract repository names and descriptions
-            repo_pattern = r'<h2[^>]*>.*?<a[^>]*>([^<]+)</a>'
-            matches = re.findall(repo_pattern, content, re.IGNORECASE | re.DOTALL)
-            
-            for match in matches:
-                repo_name = match.strip()
-                if repo_name:
-                    keywords.append({
-                        'keyword': repo_name,
-                        'source': 'github_trending',
-                        'language': language,
-                        'timestamp': datetime.now().isoformat(),
-                        'search_volume': 'unknown',
-                        'difficulty': 'unknown'
-                    })
+            document = parse_html(response.text)
+            if document is not None:
+                keywords = PAGE_EXTRACTORS['github_trending']['github_trending'](document, language)
             
             logger.info(f"Found {len(keywords)} GitHub trending topics")
             return keywords
@@ -325,6 +493,10 @@ class OrganicKeywordCollector:
         """
         Collect keywords from multiple organic sources.
         
+        Requests run on `concurrency` worker threads, each host paced by its
+        own rate budget, so wall time follows the busiest host's budget
+        rather than the sum of per-request pauses.
+        
         Args:
             seed_keywords: List of seed keywords to expand
             sources: List of sources to use (default: all available)
@@ -337,41 +509,34 @@ class OrganicKeywordCollector:
         
         logger.info(f"Starting comprehensive keyword collection for {len(seed_keywords)} seed keywords")
         
-        all_keywords = []
+        # Per-seed sources: suggestions, then every requested SERP extractor over one
+        # results page; community sources are not tied to specific keywords
+        serp_sources = [name for name in self.serp_extractors if name in sources]
+        community_sources = {
+            'reddit': lambda: self.get_reddit_keywords('programming', limit=50),
+            'stackoverflow': lambda: self.get_stackoverflow_tags('python', limit=50),
+            'github': lambda: self.get_github_trending_topics('python')
+        }
         
-        for keyword in seed_keywords:
-            logger.info(f"Processing seed keyword: {keyword}")
-            
-            # Google suggestions
-            if 'google_suggestions' in sources:
-                suggestions = self.get_google_suggestions(keyword)
-                all_keywords.extend(suggestions)
-                time.sleep(1)  # Be respectful to Google
-            
-            # Related searches
-            if 'related_searches' in sources:
-                related = self.get_related_searches(keyword)
-                all_keywords.extend(related)
-                time.sleep(2)  # Be respectful to Google
-            
-            # People also ask
-            if 'people_also_ask' in sources:
-                questions = self.get_people_also_ask(keyword)
-                all_keywords.extend(questions)
-                time.sleep(2)  # Be respectful to Google
-        
-        # Community sources (not tied to specific keywords)
-        if 'reddit' in sources:
-            reddit_keywords = self.get_reddit_keywords('programming', limit=50)
-            all_keywords.extend(reddit_keywords)
-        
-        if 'stackoverflow' in sources:
-            stack_keywords = self.get_stackoverflow_tags('python', limit=50)
-            all_keywords.extend(stack_keywords)
-        
-        if 'github' in sources:
-            github_keywords = self.get_github_trending_topics('python')
-            all_keywords.extend(github_keywords)
+        def serp_keywords(keyword):
+            found = self.get_serp_keywords(keyword, serp_sources)
+            return [kw for name in serp_sources for kw in found[name]]
+        
+        # Every request is its own task: workers only wait on the budget of the
+        # host they are about to hit, so hosts are throttled independently
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='organic') as executor:
+            futures = []
+            for keyword in seed_keywords:
+                if 'google_suggestions' in sources:
+                    futures.append(executor.submit(self.get_google_suggestions, keyword))
+                if 'google_suggestions_expanded' in sources:
+                    futures.append(executor.submit(self.expand_suggestions, keyword))
+                if serp_sources:
+                    futures.append(executor.submit(serp_keywords, keyword))
+            futures += [executor.submit(community_sources[source]) for source in community_sources if source in sources]
+            
+            # Gather in submission order so deduplication keeps the same first occurrence
+            all_keywords = [kw for future in futures for kw in future.result()]
         
         # Remove duplicates based on keyword text
         unique_keywords = []
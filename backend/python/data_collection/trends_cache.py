@@ -0,0 +1,238 @@
+"""
+Google Trends Response Cache
+
+This module provides a persistent, TTL-based response cache for Google Trends
+requests. Responses are stored compressed in a local SQLite file, keyed by a
+hash of the request (method, keywords, timeframe, geo, hl, tz), and evicted
+least-recently-used first once the file outgrows its size budget.
+"""
+
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import inspect
+import threading
+import functools
+from typing import Dict, Optional, Any, Callable
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from config.settings import TRENDS_CACHE_FILE, TRENDS_CACHE_TTL_HOURS, TRENDS_CACHE_MAX_MB
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TrendsCache:
+    """Persistent, size-bounded LRU cache of Google Trends responses."""
+    
+    def __init__(self,
+                 path: Optional[Path] = None,
+                 ttl_seconds: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Open (or create) the cache file.
+        
+        Args:
+            path: SQLite file holding the cache (default: TRENDS_CACHE_FILE)
+            ttl_seconds: Age after which entries are ignored (default: TRENDS_CACHE_TTL_HOURS)
+            max_bytes: Compressed payload budget before LRU eviction (default: TRENDS_CACHE_MAX_MB)
+        """
+        self.path = Path(path or TRENDS_CACHE_FILE)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else TRENDS_CACHE_TTL_HOURS * 3600
+        self.max_bytes = max_bytes if max_bytes is not None else TRENDS_CACHE_MAX_MB * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)')
+        self.purge_expired()
+    
+    def _key(self, method: str, params: Dict[str, Any]) -> str:
+        """Content address of a request: hash of its method and canonical parameters."""
+        canonical = json.dumps([method, params], sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def get(self, method: str, params: Dict[str, Any], ttl_seconds: Optional[float] = None) -> Optional[Any]:
+        """
+        Look up a cached response.
+        
+        Args:
+            method: Collector method name
+            params: Request parameters
+            ttl_seconds: Age after which this entry is ignored (default: the cache's TTL)
+        
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        key = self._key(method, params)
+        ttl_seconds = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT payload, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or (ttl_seconds and now - row[1] > ttl_seconds):
+                self.misses += 1
+                return None
+            self._connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+    
+    def set(self, method: str, params: Dict[str, Any], value: Any):
+        """
+        Store a response, evicting least recently used entries if over budget.
+        
+        Args:
+            method: Collector method name
+            params: Request parameters
+            value: JSON-serializable response
+        """
+        key = self._key(method, params)
+        payload = zlib.compress(json.dumps(value).encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            previous = self._connection.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses (key, method, payload, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, method, payload, len(payload), now, now)
+            )
+            self._bytes += len(payload) - (previous[0] if previous else 0)
+            if self.max_bytes and self._bytes > self.max_bytes:
+                self._evict()
+    
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget (lock held)."""
+        # Evict down to 90% of the budget so eviction does not run on every write
+        target = self.max_bytes * 0.9
+        freed_keys = []
+        cursor = self._connection.execute('SELECT key, size FROM responses ORDER BY accessed_at')
+        for key, size in cursor:
+            if self._bytes <= target:
+                break
+            freed_keys.append((key,))
+            self._bytes -= size
+        cursor.close()
+        self._connection.executemany('DELETE FROM responses WHERE key = ?', freed_keys)
+        self.evictions += len(freed_keys)
+        logger.info(f"Evicted {len(freed_keys)} cached Trends responses")
+    
+    def purge_expired(self) -> int:
+        """
+        Delete entries older than the TTL.
+        
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            deleted = 0
+            if self.ttl_seconds:
+                deleted = self._connection.execute(
+                    'DELETE FROM responses WHERE created_at < ?', (time.time() - self.ttl_seconds,)
+                ).rowcount
+            self._bytes = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            return deleted
+    
+    def clear(self):
+        """Delete every cached response."""
+        with self._lock:
+            self._connection.execute('DELETE FROM responses')
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries and bytes
+        """
+        with self._lock:
+            entries = self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': self._bytes
+        }
+    
+    def close(self):
+        """Close the cache file."""
+        with self._lock:
+            self._connection.close()
+
+
+def is_complete_response(result: Any) -> bool:
+    """Whether a collector result is complete: no error markers, nothing empty from a failed call."""
+    if isinstance(result, dict):
+        return 'error' not in result and all(is_complete_response(value) for value in result.values() if isinstance(value, dict))
+    if isinstance(result, list):
+        return bool(result)
+    return result is not None
+
+
+def cached_response(method: str, ttl_seconds: Optional[float] = None) -> Callable:
+    """
+    Serve a collector method from the owner's `cache` when one is set.
+    
+    The cache key covers the method name, its bound arguments and the
+    collector's `hl` and `tz`. Error results are never cached.
+    
+    Args:
+        method: Name recorded with cached entries
+        ttl_seconds: Age after which this method's entries are refetched, for
+            results that go stale sooner than the cache's TTL (default: the cache's TTL)
+    
+    Returns:
+        Method decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != 'self'}
+            params.update(hl=getattr(self, 'hl', None), tz=getattr(self, 'tz', None))
+            
+            cached = cache.get(method, params, ttl_seconds)
+            if cached is not None:
+                logger.debug(f"Cache hit for {method}: {params}")
+                return cached
+            
+            result = func(self, *args, **kwargs)
+            if is_complete_response(result):
+                cache.set(method, params, result)
+            return result
+        
+        return wrapper
+    
+    return decorator
@@ -0,0 +1,231 @@
+"""
+Streaming Trends Output
+
+This module writes collection results as newline-delimited JSON while a run
+is in progress, one compact record per (keyword, timeframe, report) or geo,
+and reads such files back. Compressed output is appended one gzip member or
+zstd frame per flush, so everything flushed so far can be read (with `zcat`,
+`zstd -dc` or `iter_ndjson`) before the run finishes. zstd goes through
+pyarrow, which is only imported when a zstd file is written or read.
+"""
+
+import json
+import gzip
+import zlib
+import threading
+from typing import List, Dict, Optional, Any, Iterator
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# File suffix of each supported compression
+COMPRESSION_SUFFIXES = {
+    None: '.ndjson',
+    'gzip': '.ndjson.gz',
+    'zstd': '.ndjson.zst',
+}
+
+# Decompressed bytes per read from a zstd file; a torn final frame loses at most this much before it
+ZSTD_READ_SIZE = 8192
+
+
+def _compression_of(path: Path) -> Optional[str]:
+    """Infer the compression of an NDJSON file from its suffix."""
+    if path.suffix == '.gz':
+        return 'gzip'
+    if path.suffix == '.zst':
+        return 'zstd'
+    return None
+
+
+class NDJSONSink:
+    """Thread-safe, append-only NDJSON writer with optional gzip/zstd compression."""
+    
+    def __init__(self, path: Path, compression: Optional[str] = None):
+        """
+        Open the output file.
+        
+        Args:
+            path: Output file; the suffix for `compression` is added if missing
+            compression: 'gzip', 'zstd', or None ('none' and '' also mean uncompressed)
+        """
+        if compression in ('', 'none'):
+            compression = None
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported NDJSON compression: {compression}")
+        suffix = COMPRESSION_SUFFIXES[compression]
+        path = Path(path)
+        self.path = path if path.name.endswith(suffix) else path.with_name(path.name + suffix)
+        self.compression = compression
+        self.records = 0
+        
+        self._lock = threading.Lock()
+        self._pending = []
+        self._codec = None
+        if compression == 'zstd':
+            import pyarrow as pa
+            self._codec = pa.Codec('zstd')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'ab')
+    
+    def write(self, record_type: str, data: Any, **fields):
+        """
+        Queue one record; it reaches the file on the next `flush`.
+        
+        Args:
+            record_type: Kind of record (stored as 'type')
+            data: JSON-serializable payload (stored as 'data')
+            **fields: Identifying fields such as keyword, timeframe or geo
+        """
+        line = json.dumps({'type': record_type, **fields, 'data': data}, separators=(',', ':'), default=str)
+        with self._lock:
+            self._pending.append(line)
+            self.records += 1
+    
+    def flush(self):
+        """Write queued records to disk as one self-contained block."""
+        with self._lock:
+            if not self._pending:
+                return
+            block = ('\n'.join(self._pending) + '\n').encode('utf-8')
+            self._pending.clear()
+            if self.compression == 'gzip':
+                block = gzip.compress(block)
+            elif self.compression == 'zstd':
+                block = self._codec.compress(block, asbytes=True)
+            self._file.write(block)
+            self._file.flush()
+    
+    def close(self):
+        """Flush queued records and close the file."""
+        self.flush()
+        with self._lock:
+            self._file.close()
+        logger.info(f"Wrote {self.records} records to {self.path}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _read_blocks(path: Path, chunk_size: int) -> Iterator[bytes]:
+    """Yield the decompressed bytes of an NDJSON file, stopping quietly at a torn block."""
+    compression = _compression_of(path)
+    if compression == 'gzip':
+        # Members are decoded one by one, so a torn last member still yields what it holds
+        decompressor = zlib.decompressobj(wbits=31)
+        pending = False
+        with open(path, 'rb') as f:
+            for raw in iter(lambda: f.read(chunk_size), b''):
+                while raw:
+                    pending = True
+                    yield decompressor.decompress(raw)
+                    raw = b''
+                    if decompressor.eof:
+                        raw = decompressor.unused_data
+                        decompressor = zlib.decompressobj(wbits=31)
+                        pending = False
+        if pending:
+            logger.warning(f"{path} ends in an incomplete block, stopping there")
+    elif compression == 'zstd':
+        import pyarrow as pa
+        
+        # Arrow only reports truncation on the read that reaches it, so read in small steps
+        stream = pa.input_stream(str(path), compression='zstd')
+        try:
+            while True:
+                try:
+                    chunk = stream.read(ZSTD_READ_SIZE)
+                except OSError as e:
+                    logger.warning(f"{path} ends in an incomplete block, stopping there: {e}")
+                    return
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            stream.close()
+    else:
+        with open(path, 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+
+
+def iter_ndjson(path: Path, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """
+    Stream the records of an NDJSON file, compressed or not.
+    
+    A block cut short by a crash or a concurrent write ends the stream with
+    a warning instead of an error, so output of a running or failed
+    collection can still be read.
+    
+    Args:
+        path: NDJSON file (.ndjson, .ndjson.gz or .ndjson.zst)
+        chunk_size: Bytes read at a time
+    
+    Yields:
+        Record dictionaries
+    """
+    remainder = b''
+    for chunk in _read_blocks(Path(path), chunk_size):
+        lines = (remainder + chunk).split(b'\n')
+        remainder = lines.pop()
+        for line in lines:
+            if line:
+                yield json.loads(line)
+
+
+def read_trends_ndjson(path: Path) -> Dict[str, Any]:
+    """
+    Reassemble a streamed `collect_comprehensive_trends` result.
+    
+    Args:
+        path: File written by `collect_comprehensive_trends`
+    
+    Returns:
+        Dictionary in the shape `collect_comprehensive_trends` returns; parts
+        a partial file does not hold yet are left empty
+    """
+    results = {
+        'keywords': [],
+        'timeframes': [],
+        'collection_timestamp': None,
+        'related_queries': {},
+        'related_topics': {},
+        'interest_over_time': {},
+        'trending_searches': [],
+        'realtime_trending': [],
+        'trending_ranked': []
+    }
+    searches = {'trending_searches': {}, 'realtime_trending': {}}
+    geos: List[str] = []
+    
+    for record in iter_ndjson(path):
+        record_type = record['type']
+        if record_type == 'run':
+            results.update(record['data'])
+            geos = record['data'].get('geos', [])
+            for keyword in results['keywords']:
+                results['related_queries'].setdefault(keyword, {})
+                results['related_topics'].setdefault(keyword, {})
+        elif record_type in ('related_queries', 'related_topics'):
+            results[record_type].setdefault(record['keyword'], {})[record['timeframe']] = record['data']
+        elif record_type == 'interest_over_time':
+            results['interest_over_time'][record['timeframe']] = record['data']
+        elif record_type in searches:
+            searches[record_type][record['geo']] = record['data']
+        elif record_type == 'trending_ranked':
+            results['trending_ranked'] = record['data']
+    
+    # Geos finish in any order; list them as the run requested them
+    results.pop('geos', None)
+    for record_type, by_geo in searches.items():
+        ordered = geos + [geo for geo in by_geo if geo not in geos]
+        results[record_type] = [search for geo in ordered for search in by_geo.get(geo, [])]
+    return results
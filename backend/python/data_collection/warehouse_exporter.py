@@ -0,0 +1,330 @@
+"""
+Warehouse Columnar Exporter
+
+This module exports data warehouse tables as compressed, hive-partitioned
+Parquet datasets (partitioned by source and date) and as uncompressed Arrow
+IPC files that can be memory-mapped for fast local reads.
+"""
+
+import json
+from typing import List, Dict, Optional, Any, Iterator, Sequence
+from datetime import datetime, date
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.ipc as ipc
+
+from config.settings import EXPORTS_DIR, WAREHOUSE_FETCH_SIZE
+from data_collection.data_warehouse_manager import DataWarehouseManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Column types of each exported table, in output order
+TABLE_SCHEMAS = {
+    'keywords': pa.schema([
+        ('id', pa.int64()),
+        ('keyword_id', pa.int64()),
+        ('keyword', pa.string()),
+        ('avg_monthly_searches', pa.int64()),
+        ('competition', pa.string()),
+        ('competition_index', pa.int64()),
+        ('low_top_of_page_bid_micros', pa.int64()),
+        ('high_top_of_page_bid_micros', pa.int64()),
+        ('source', pa.string()),
+        ('seed_keywords', pa.list_(pa.string())),
+        ('snapshot_date', pa.date32()),
+        ('timestamp', pa.timestamp('us')),
+        ('updated_at', pa.timestamp('us')),
+        ('created_at', pa.timestamp('us')),
+    ]),
+    'trends': pa.schema([
+        ('id', pa.int64()),
+        ('keyword_id', pa.int64()),
+        ('keyword', pa.string()),
+        ('query', pa.string()),
+        ('value', pa.int64()),
+        ('trend_type', pa.string()),
+        ('timeframe', pa.string()),
+        ('source', pa.string()),
+        ('snapshot_date', pa.date32()),
+        ('timestamp', pa.timestamp('us')),
+        ('created_at', pa.timestamp('us')),
+    ]),
+    'topics': pa.schema([
+        ('id', pa.int64()),
+        ('keyword_id', pa.int64()),
+        ('keyword', pa.string()),
+        ('topic_title', pa.string()),
+        ('topic_type', pa.string()),
+        ('value', pa.int64()),
+        ('trend_type', pa.string()),
+        ('timeframe', pa.string()),
+        ('source', pa.string()),
+        ('snapshot_date', pa.date32()),
+        ('timestamp', pa.timestamp('us')),
+        ('created_at', pa.timestamp('us')),
+    ]),
+    'interest_over_time': pa.schema([
+        ('id', pa.int64()),
+        ('keyword_id', pa.int64()),
+        ('keyword', pa.string()),
+        ('date', pa.timestamp('us')),
+        ('interest_value', pa.int64()),
+        ('is_partial', pa.bool_()),
+        ('timeframe', pa.string()),
+        ('source', pa.string()),
+        ('timestamp', pa.timestamp('us')),
+        ('month', pa.string()),
+    ]),
+    'trending_searches': pa.schema([
+        ('id', pa.int64()),
+        ('rank', pa.int64()),
+        ('search_term', pa.string()),
+        ('title', pa.string()),
+        ('traffic', pa.string()),
+        ('image_url', pa.string()),
+        ('articles', pa.string()),
+        ('location', pa.string()),
+        ('source', pa.string()),
+        ('snapshot_date', pa.date32()),
+        ('timestamp', pa.timestamp('us')),
+        ('created_at', pa.timestamp('us')),
+    ]),
+}
+
+# Hive partition columns; interest points are weekly, so they are grouped by month
+PARTITION_COLUMNS = {
+    'keywords': ('source', 'snapshot_date'),
+    'trends': ('source', 'snapshot_date'),
+    'topics': ('source', 'snapshot_date'),
+    'interest_over_time': ('source', 'month'),
+    'trending_searches': ('source', 'snapshot_date'),
+}
+
+
+class WarehouseExporter:
+    """Exports warehouse tables to Parquet datasets and Arrow IPC files."""
+    
+    def __init__(self,
+                 warehouse: Optional[DataWarehouseManager] = None,
+                 output_dir: Optional[Path] = None,
+                 compression: str = 'zstd',
+                 chunk_size: Optional[int] = None):
+        """
+        Initialize the exporter.
+        
+        Args:
+            warehouse: Warehouse manager to read from (optional, one is created if omitted)
+            output_dir: Root directory for exports (default: EXPORTS_DIR)
+            compression: Parquet compression codec
+            chunk_size: Rows per record batch (default: WAREHOUSE_FETCH_SIZE)
+        """
+        self._owns_warehouse = warehouse is None
+        self.warehouse = warehouse or DataWarehouseManager()
+        self.output_dir = Path(output_dir or EXPORTS_DIR)
+        self.compression = compression
+        self.chunk_size = chunk_size or WAREHOUSE_FETCH_SIZE
+    
+    def _partitioning(self, table: str) -> ds.Partitioning:
+        """Hive partitioning of a table's Parquet dataset, with typed keys."""
+        schema = TABLE_SCHEMAS[table]
+        return ds.partitioning(
+            pa.schema([schema.field(name) for name in PARTITION_COLUMNS[table]]),
+            flavor='hive'
+        )
+    
+    def _iter_rows(self, table: str) -> Iterator[Dict]:
+        """Stream a table's rows from the warehouse in constant memory."""
+        if table == 'keywords':
+            return self.warehouse.iter_keywords(chunk_size=self.chunk_size)
+        if table == 'interest_over_time':
+            return self.warehouse.iter_interest(chunk_size=self.chunk_size)
+        if table in TABLE_SCHEMAS:
+            return self.warehouse.iter_table(table, chunk_size=self.chunk_size)
+        raise ValueError(f"Unknown warehouse table: {table}")
+    
+    def _coerce(self, value: Any, arrow_type: pa.DataType) -> Any:
+        """
+        Convert a stored value to the Python type Arrow expects for a column.
+        
+        SQLite hands back dates and timestamps as ISO strings and booleans as
+        integers; PostgreSQL returns native types, including plain dates for
+        DATE columns exported as timestamps (interest_over_time.date).
+        """
+        if value is None:
+            return None
+        if pa.types.is_timestamp(arrow_type):
+            if isinstance(value, str):
+                return datetime.fromisoformat(value)
+            if isinstance(value, date) and not isinstance(value, datetime):
+                return datetime.combine(value, datetime.min.time())
+        if pa.types.is_date(arrow_type):
+            if isinstance(value, datetime):
+                return value.date()
+            if isinstance(value, str):
+                return date.fromisoformat(value[:10])
+        if pa.types.is_boolean(arrow_type):
+            return bool(value)
+        if pa.types.is_list(arrow_type) and isinstance(value, str):
+            return json.loads(value)
+        return value
+    
+    def _iter_batches(self, table: str) -> Iterator[pa.RecordBatch]:
+        """
+        Convert a table's row stream into typed record batches.
+        
+        Args:
+            table: Warehouse table name
+        
+        Yields:
+            Record batches of at most `chunk_size` rows
+        """
+        schema = TABLE_SCHEMAS[table]
+        columns = {name: [] for name in schema.names}
+        rows = 0
+        
+        def flush():
+            arrays = [
+                pa.array([self._coerce(value, field.type) for value in columns[field.name]], type=field.type)
+                for field in schema
+            ]
+            for values in columns.values():
+                values.clear()
+            return pa.RecordBatch.from_arrays(arrays, schema=schema)
+        
+        for row in self._iter_rows(table):
+            if table == 'interest_over_time':
+                row['month'] = str(row['date'])[:7]
+            for name, values in columns.items():
+                values.append(row.get(name))
+            rows += 1
+            if rows % self.chunk_size == 0:
+                yield flush()
+        
+        if rows % self.chunk_size:
+            yield flush()
+    
+    def export_parquet(self, table: str) -> Path:
+        """
+        Export one table as a hive-partitioned, compressed Parquet dataset.
+        
+        Partitions written by this export replace the same partitions from any
+        earlier export; partitions that received no rows are left in place.
+        
+        Args:
+            table: Warehouse table name
+        
+        Returns:
+            Dataset root directory
+        """
+        schema = TABLE_SCHEMAS[table]
+        target = self.output_dir / 'parquet' / table
+        target.mkdir(parents=True, exist_ok=True)
+        
+        ds.write_dataset(
+            self._iter_batches(table),
+            target,
+            schema=schema,
+            format='parquet',
+            partitioning=self._partitioning(table),
+            file_options=ds.ParquetFileFormat().make_write_options(compression=self.compression),
+            basename_template='part-{i}.parquet',
+            existing_data_behavior='delete_matching'
+        )
+        
+        logger.info(f"Exported {table} to Parquet dataset: {target}")
+        return target
+    
+    def export_arrow(self, table: str) -> Path:
+        """
+        Export one table as a single uncompressed Arrow IPC file.
+        
+        Uncompressed IPC files can be memory-mapped, so `read_arrow` loads
+        them without copying or decoding.
+        
+        Args:
+            table: Warehouse table name
+        
+        Returns:
+            Path to the written file
+        """
+        schema = TABLE_SCHEMAS[table]
+        target = self.output_dir / 'arrow' / f'{table}.arrow'
+        target.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write to a temporary file so readers never map a half-written export
+        partial = target.with_suffix('.arrow.partial')
+        with pa.OSFile(str(partial), 'wb') as sink:
+            with ipc.new_file(sink, schema) as writer:
+                for batch in self._iter_batches(table):
+                    writer.write_batch(batch)
+        partial.replace(target)
+        
+        logger.info(f"Exported {table} to Arrow IPC file: {target}")
+        return target
+    
+    def export_all(self, tables: Optional[Sequence[str]] = None, formats: Sequence[str] = ('parquet',)) -> Dict[str, List[str]]:
+        """
+        Export several tables in one or more formats.
+        
+        Args:
+            tables: Table names (default: every exportable table)
+            formats: Any of 'parquet' and 'arrow'
+        
+        Returns:
+            Mapping of table name to the paths written
+        """
+        exported = {}
+        for table in tables or TABLE_SCHEMAS:
+            exported[table] = []
+            try:
+                if 'parquet' in formats:
+                    exported[table].append(str(self.export_parquet(table)))
+                if 'arrow' in formats:
+                    exported[table].append(str(self.export_arrow(table)))
+            except Exception as e:
+                logger.error(f"Error exporting {table}: {e}")
+        return exported
+    
+    def read_parquet(self, table: str, filter_expression: Optional[Any] = None) -> pa.Table:
+        """
+        Load an exported Parquet dataset, pruning partitions with a filter.
+        
+        Args:
+            table: Warehouse table name
+            filter_expression: pyarrow.dataset expression, e.g. ds.field('source') == 'google_trends'
+        
+        Returns:
+            Arrow table (call `.to_pandas()` for a DataFrame)
+        """
+        dataset = ds.dataset(
+            self.output_dir / 'parquet' / table,
+            schema=TABLE_SCHEMAS[table],
+            format='parquet',
+            partitioning=self._partitioning(table)
+        )
+        return dataset.to_table(filter=filter_expression)
+    
+    def read_arrow(self, table: str) -> pa.Table:
+        """
+        Memory-map an exported Arrow IPC file.
+        
+        Args:
+            table: Warehouse table name
+        
+        Returns:
+            Arrow table backed by the mapped file
+        """
+        source = pa.memory_map(str(self.output_dir / 'arrow' / f'{table}.arrow'), 'r')
+        return ipc.open_file(source).read_all()
+    
+    def close(self):
+        """Close the warehouse manager if this exporter created it."""
+        if self._owns_warehouse:
+            self.warehouse.close()
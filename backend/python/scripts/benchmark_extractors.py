@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+HTML Extractor Benchmark
+
+This script times the lxml keyword extractors against the saved pages in
+scripts/fixtures, reporting parse and extraction time per page so changes to
+selectors (or to the parser) can be measured before they ship. Fixture files
+are named after their page type: serp_*.html, github_trending_*.html.
+"""
+
+import sys
+import time
+import statistics
+import click
+from pathlib import Path
+from typing import List, Dict
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data_collection.html_extractors import PAGE_EXTRACTORS, parse_html, extract_page
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+
+def page_type_of(path: Path) -> str:
+    """Page type of a fixture, from the longest PAGE_EXTRACTORS key its name starts with."""
+    matches = [page_type for page_type in PAGE_EXTRACTORS if path.stem.startswith(page_type + '_')]
+    if not matches:
+        raise click.ClickException(f"No extractors for fixture {path.name}")
+    return max(matches, key=len)
+
+
+def time_page(content: str, page_type: str, repeat: int) -> Dict[str, List[float]]:
+    """
+    Time parsing and extraction of one page.
+    
+    Args:
+        content: Page HTML
+        page_type: Key of PAGE_EXTRACTORS
+        repeat: Number of timed runs
+    
+    Returns:
+        Milliseconds per run for 'parse', 'extract' and 'total'
+    """
+    timings = {'parse': [], 'extract': [], 'total': []}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        document = parse_html(content)
+        parsed = time.perf_counter()
+        extract_page(document, page_type, 'benchmark')
+        finished = time.perf_counter()
+        timings['parse'].append((parsed - started) * 1000)
+        timings['extract'].append((finished - parsed) * 1000)
+        timings['total'].append((finished - started) * 1000)
+    return timings
+
+
+def summary(values: List[float]) -> str:
+    """Median and 95th percentile of a list of timings, as 'p50/p95' (a single run is its own p95)."""
+    p95 = statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0]
+    return f"{statistics.median(values):.2f}/{p95:.2f}"
+
+
+@click.command()
+@click.option('--fixtures', '-f', type=click.Path(exists=True, file_okay=False), default=str(FIXTURES_DIR),
+              help='Directory of saved pages')
+@click.option('--repeat', '-r', default=200, type=click.IntRange(min=1), help='Timed runs per page')
+@click.option('--warmup', '-w', default=10, help='Untimed runs per page before timing')
+def benchmark(fixtures, repeat, warmup):
+    """Benchmark HTML keyword extraction on saved pages."""
+    pages = sorted(Path(fixtures).glob('*.html'))
+    if not pages:
+        raise click.ClickException(f"No .html fixtures in {fixtures}")
+    
+    click.echo(f"{'page':<32} {'KB':>6} {'found':>6} {'parse ms':>16} {'extract ms':>16} {'total p50/p95':>16}")
+    for path in pages:
+        page_type = page_type_of(path)
+        content = path.read_text(encoding='utf-8')
+        found = sum(len(keywords) for keywords in extract_page(parse_html(content), page_type, 'benchmark').values())
+        time_page(content, page_type, warmup)
+        timings = time_page(content, page_type, repeat)
+        
+        click.echo(
+            f"{path.name:<32} {len(content.encode('utf-8')) / 1024:>6.0f} {found:>6} "
+            f"{summary(timings['parse']):>16} {summary(timings['extract']):>16} {summary(timings['total']):>16}"
+        )
+    click.echo(f"Times are median/p95 over {repeat} runs per page.")
+
+
+if __name__ == '__main__':
+    benchmark()
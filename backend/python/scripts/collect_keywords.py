@@ -20,7 +20,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 from data_collection.google_ads_collector import GoogleAdsKeywordCollector
 from data_collection.google_trends_collector import GoogleTrendsCollector
 from data_collection.data_warehouse_manager import DataWarehouseManager
-from config.settings import BASE_DIR
+from data_collection.collection_journal import CollectionJournal
+from config.settings import BASE_DIR, TRENDS_REFRESH_OVERLAP_DAYS
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -28,9 +29,17 @@ logger = get_logger(__name__)
 class KeywordCollectionOrchestrator:
     """Orchestrates keyword data collection from multiple sources."""
     
-    def __init__(self):
-        """Initialize the orchestrator with all collectors."""
-        self.warehouse = DataWarehouseManager()
+    def __init__(self, warehouse: Optional[DataWarehouseManager] = None):
+        """
+        Initialize the orchestrator with all collectors.
+        
+        Args:
+            warehouse: Shared warehouse manager (optional). Its pooled sessions are
+                thread-safe, so several orchestrators or collection workers can
+                write through one manager; a shared manager is not closed by cleanup().
+        """
+        self._owns_warehouse = warehouse is None
+        self.warehouse = warehouse or DataWarehouseManager()
         self.google_ads_collector = None
         self.google_trends_collector = None
         
@@ -58,13 +67,23 @@ class KeywordCollectionOrchestrator:
     
     def collect_from_google_trends(self, 
                                   keywords: List[str],
-                                  timeframes: List[str] = None) -> Dict:
+                                  timeframes: List[str] = None,
+                                  resume: bool = False,
+                                  geos: Optional[List[str]] = None,
+                                  checkpoint: bool = False) -> Dict:
         """
         Collect keyword data from Google Trends.
         
+        With `checkpoint` or `resume` the run is checkpointed to the collection
+        journal as it goes; otherwise the journal file is not touched.
+        
         Args:
             keywords: List of keywords to analyze
             timeframes: List of timeframes to analyze
+            resume: Skip the units an interrupted checkpointed run with the same
+                keywords and timeframes already completed
+            geos: Geographic locations for trending searches (default: TRENDS_GEOS)
+            checkpoint: Journal completed units so the run can be resumed
             
         Returns:
             Dictionary containing collected trend data
@@ -75,12 +94,16 @@ class KeywordCollectionOrchestrator:
         
         logger.info(f"Collecting Google Trends data for {len(keywords)} keywords")
         
+        journal = CollectionJournal() if checkpoint or resume else None
         try:
             # Collect comprehensive trend data
             trends_data = self.google_trends_collector.collect_comprehensive_trends(
                 keywords=keywords,
                 timeframes=timeframes,
-                save_to_file=True
+                save_to_file=True,
+                journal=journal,
+                resume=resume,
+                geos=geos
             )
             
             # Store in data warehouse
@@ -93,6 +116,44 @@ class KeywordCollectionOrchestrator:
         except Exception as e:
             logger.error(f"Error collecting Google Trends data: {e}")
             return {}
+        finally:
+            if journal is not None:
+                journal.close()
+    
+    def refresh_interest(self,
+                         keywords: List[str],
+                         timeframe: str = 'today 12-m',
+                         overlap_days: Optional[int] = None) -> Dict:
+        """
+        Extend stored interest-over-time series with the points collected since.
+        
+        Args:
+            keywords: Keywords to refresh
+            timeframe: Timeframe of the stored series
+            overlap_days: Stored days refetched for rescaling (default: TRENDS_REFRESH_OVERLAP_DAYS)
+            
+        Returns:
+            Interest result holding the new points, or {} if collecting or storing failed
+        """
+        if not self.google_trends_collector:
+            logger.error("Google Trends collector not available")
+            return {}
+        
+        try:
+            tails = self.warehouse.get_interest_tails(keywords, timeframe, overlap_days or TRENDS_REFRESH_OVERLAP_DAYS)
+            interest = self.google_trends_collector.refresh_interest_over_time(keywords, tails, timeframe)
+            
+            if interest.get('interest_over_time'):
+                if not self.warehouse.store_trends({'keywords': interest['keywords'], 'interest_over_time': {timeframe: interest}}):
+                    logger.error("Refreshed interest data could not be stored in warehouse")
+                    return {}
+                logger.info("Refreshed interest data stored in warehouse")
+            
+            return interest
+            
+        except Exception as e:
+            logger.error(f"Error refreshing interest data: {e}")
+            return {}
     
     def collect_from_google_ads(self, 
                                keywords: List[str],
@@ -124,6 +185,8 @@ class KeywordCollectionOrchestrator:
             if ads_data and ads_data.get('keyword_ideas'):
                 self.warehouse.store_keywords(ads_data['keyword_ideas'])
                 logger.info("Google Ads keyword data stored in warehouse")
+                # Readers of the trending rollup no longer refresh it themselves
+                self.warehouse.refresh_trending_rollup()
             
             return ads_data
             
@@ -134,7 +197,10 @@ class KeywordCollectionOrchestrator:
     def collect_comprehensive_data(self,
                                   keywords: List[str],
                                   sources: List[str] = None,
-                                  timeframes: List[str] = None) -> Dict[str, Any]:
+                                  timeframes: List[str] = None,
+                                  resume: bool = False,
+                                  geos: Optional[List[str]] = None,
+                                  checkpoint: bool = False) -> Dict[str, Any]:
         """
         Collect comprehensive keyword data from all available sources.
         
@@ -142,6 +208,9 @@ class KeywordCollectionOrchestrator:
             keywords: List of keywords to analyze
             sources: List of sources to collect from (default: all available)
             timeframes: List of timeframes for trend analysis
+            resume: Resume an interrupted Google Trends run (see collect_from_google_trends)
+            geos: Geographic locations for trending searches (default: TRENDS_GEOS)
+            checkpoint: Checkpoint the Google Trends run so it can be resumed
             
         Returns:
             Dictionary containing all collected data
@@ -169,7 +238,7 @@ class KeywordCollectionOrchestrator:
         # Collect from Google Trends
         if 'google_trends' in sources:
             logger.info("Collecting from Google Trends...")
-            trends_data = self.collect_from_google_trends(keywords, timeframes)
+            trends_data = self.collect_from_google_trends(keywords, timeframes, resume, geos, checkpoint)
             results['google_trends_data'] = trends_data
             
             # Add summary
@@ -182,8 +251,12 @@ class KeywordCollectionOrchestrator:
                         for timeframe_data in keyword_data.values()
                     ),
                     'trending_searches_count': len(trends_data.get('trending_searches', [])),
-                    'realtime_trending_count': len(trends_data.get('realtime_trending', []))
+                    'realtime_trending_count': len(trends_data.get('realtime_trending', [])),
+                    'trending_terms_count': len(trends_data.get('trending_ranked', []))
                 }
+                if self.google_trends_collector.cache:
+                    results['summary']['trends']['cache'] = self.google_trends_collector.cache.stats()
+                results['summary']['trends']['rate'] = self.google_trends_collector.rate_controller.stats()
         
         # Collect from Google Ads
         if 'google_ads' in sources:
@@ -307,7 +380,7 @@ class KeywordCollectionOrchestrator:
     
     def cleanup(self):
         """Clean up resources."""
-        if self.warehouse:
+        if self.warehouse and self._owns_warehouse:
             self.warehouse.close()
 
 @click.group()
@@ -321,7 +394,10 @@ def cli():
 @click.option('--sources', '-s', multiple=True, default=['google_trends'], help='Data sources to use')
 @click.option('--timeframes', '-t', multiple=True, default=['today 12-m'], help='Timeframes for trend analysis')
 @click.option('--output', '-o', help='Output file for results')
-def collect(keywords, keywords_file, sources, timeframes, output):
+@click.option('--checkpoint', is_flag=True, help='Journal completed work so an interrupted run can be resumed')
+@click.option('--resume', is_flag=True, help='Skip work an interrupted checkpointed run with the same keywords already completed')
+@click.option('--geos', '-g', multiple=True, help='Markets for trending searches (default: TRENDS_GEOS)')
+def collect(keywords, keywords_file, sources, timeframes, output, checkpoint, resume, geos):
     """Collect keyword data from specified sources."""
     orchestrator = KeywordCollectionOrchestrator()
     
@@ -343,7 +419,10 @@ def collect(keywords, keywords_file, sources, timeframes, output):
         results = orchestrator.collect_comprehensive_data(
             keywords=keyword_list,
             sources=list(sources),
-            timeframes=list(timeframes)
+            timeframes=list(timeframes),
+            resume=resume,
+            geos=list(geos) or None,
+            checkpoint=checkpoint
         )
         
         # Save results if output file specified
@@ -356,7 +435,13 @@ def collect(keywords, keywords_file, sources, timeframes, output):
         click.echo("\n📊 Collection Summary:")
         if results.get('summary', {}).get('trends'):
             trends = results['summary']['trends']
-            click.echo(f"  - Google Trends: {trends.get('related_queries_count', 0)} queries, {trends.get('trending_searches_count', 0)} trending")
+            click.echo(f"  - Google Trends: {trends.get('related_queries_count', 0)} queries, {trends.get('trending_searches_count', 0)} trending ({trends.get('trending_terms_count', 0)} distinct terms across markets)")
+            if trends.get('cache'):
+                cache = trends['cache']
+                click.echo(f"  - Trends cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate']:.0%} hit rate)")
+            if trends.get('rate', {}).get('throttles'):
+                rate = trends['rate']
+                click.echo(f"  - Trends throttling: {rate['throttles']} 429s, {rate['trips']} circuit trips, ended at {rate['rate']} req/s")
         
         if results.get('summary', {}).get('ads'):
             ads = results['summary']['ads']
@@ -369,6 +454,39 @@ def collect(keywords, keywords_file, sources, timeframes, output):
     finally:
         orchestrator.cleanup()
 
+@cli.command('refresh-interest')
+@click.option('--keywords', '-k', multiple=True, help='Keywords to refresh')
+@click.option('--keywords-file', '-f', type=click.Path(exists=True), help='File containing keywords (one per line)')
+@click.option('--timeframe', '-t', default='today 12-m', help='Timeframe of the stored series')
+@click.option('--overlap-days', '-o', type=int, default=None, help='Stored days refetched to rescale new points')
+def refresh_interest(keywords, keywords_file, timeframe, overlap_days):
+    """Fetch only the interest-over-time points missing from the warehouse."""
+    orchestrator = KeywordCollectionOrchestrator()
+    
+    try:
+        keyword_list = list(keywords)
+        if keywords_file:
+            with open(keywords_file, 'r') as f:
+                keyword_list.extend(line.strip() for line in f if line.strip())
+        
+        if not keyword_list:
+            click.echo("❌ No keywords provided. Use --keywords or --keywords-file")
+            return
+        
+        interest = orchestrator.refresh_interest(keyword_list, timeframe, overlap_days)
+        if not interest:
+            click.echo("❌ Interest data could not be refreshed or stored; see the log for details")
+            sys.exit(1)
+        if interest.get('error'):
+            click.echo(f"⚠️  Some requests failed: {interest['error']}")
+        click.echo(f"📈 Stored {len(interest.get('interest_over_time', []))} new interest points for {len(keyword_list)} keywords")
+        
+    except Exception as e:
+        click.echo(f"❌ Error refreshing interest data: {e}")
+        sys.exit(1)
+    finally:
+        orchestrator.cleanup()
+
 @cli.command()
 @click.option('--days', '-d', default=7, help='Number of days to look back')
 @click.option('--limit', '-l', default=20, help='Maximum number of keywords')
@@ -423,6 +541,72 @@ def suggest(keywords, max_suggestions):
     finally:
         orchestrator.cleanup()
 
+@cli.command()
+@click.option('--retention-months', '-r', type=int, default=None, help='Months of interest history to keep (0 keeps all)')
+@click.option('--downsample-after-months', '-d', type=int, default=None, help='Downsample partitions older than this to monthly averages')
+def compact(retention_months, downsample_after_months):
+    """Apply retention and downsampling to interest-over-time partitions."""
+    warehouse = DataWarehouseManager()
+    
+    try:
+        result = warehouse.compact_interest_over_time(
+            retention_months=retention_months,
+            downsample_after_months=downsample_after_months
+        )
+        
+        click.echo("🗜️  Interest Over Time Compaction:")
+        click.echo(f"  - Dropped partitions: {', '.join(result['dropped']) or 'none'}")
+        click.echo(f"  - Downsampled partitions: {', '.join(result['downsampled']) or 'none'}")
+        
+    except Exception as e:
+        click.echo(f"❌ Error compacting interest data: {e}")
+    finally:
+        warehouse.close()
+
+@cli.command('refresh-rollup')
+@click.option('--full', is_flag=True, help='Rebuild every group instead of only those queued by writes')
+def refresh_rollup(full):
+    """Bring the trending keyword rollup up to date with stored keywords."""
+    warehouse = DataWarehouseManager()
+    
+    try:
+        refreshed = warehouse.refresh_trending_rollup(full=full)
+        if refreshed < 0:
+            click.echo("❌ Error refreshing the trending keyword rollup")
+        else:
+            click.echo(f"🔄 Refreshed {refreshed} keyword rollup groups")
+        
+    finally:
+        warehouse.close()
+
+@cli.command()
+@click.option('--tables', '-t', multiple=True, help='Tables to export (default: all)')
+@click.option('--format', '-f', 'formats', multiple=True, type=click.Choice(['parquet', 'arrow']), default=['parquet'], help='Export formats')
+@click.option('--output-dir', '-o', type=click.Path(), help='Export root directory')
+@click.option('--compression', '-c', default='zstd', help='Parquet compression codec')
+def export(tables, formats, output_dir, compression):
+    """Export warehouse tables as partitioned Parquet and/or Arrow IPC files."""
+    # pyarrow is only needed here, so the other commands run without it
+    from data_collection.warehouse_exporter import WarehouseExporter, TABLE_SCHEMAS
+    
+    unknown = [table for table in tables if table not in TABLE_SCHEMAS]
+    if unknown:
+        raise click.BadParameter(f"{', '.join(unknown)} (choose from {', '.join(TABLE_SCHEMAS)})", param_hint='--tables')
+    
+    exporter = WarehouseExporter(output_dir=output_dir, compression=compression)
+    
+    try:
+        exported = exporter.export_all(tables=list(tables) or None, formats=list(formats))
+        
+        click.echo("📦 Warehouse Export:")
+        for table, paths in exported.items():
+            click.echo(f"  - {table}: {', '.join(paths) or 'failed'}")
+        
+    except Exception as e:
+        click.echo(f"❌ Error exporting warehouse: {e}")
+    finally:
+        exporter.close()
+
 @cli.command()
 def setup():
     """Display setup instructions."""
@@ -0,0 +1,188 @@
+"""
+Shared fixtures for the backend test suite.
+
+Tests run against throwaway SQLite warehouses. Tests marked with the
+`postgres_warehouse` fixture also run against PostgreSQL when
+WAREHOUSE_TEST_DATABASE_URL points at a disposable database (it is
+written to), and are skipped otherwise.
+"""
+
+import os
+import sys
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Make the backend packages importable the way the scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_collection import google_trends_collector
+from data_collection.data_warehouse_manager import DataWarehouseManager
+from data_collection.google_trends_collector import GoogleTrendsCollector
+from utils.rate_limiter import AdaptiveRateController
+
+
+class FakeTrendReq:
+    """
+    TrendReq stand-in serving reports from a table of keyword popularity.
+    
+    Interest is constant over time and, like Google's, scaled so the most
+    popular keyword of each payload peaks at 100. 'today ...' timeframes are
+    weekly up to the last Sunday; custom 'YYYY-MM-DD YYYY-MM-DD' windows are
+    daily. The last point is always partial.
+    """
+    
+    popularity = {}
+    trending = {}
+    payloads = []
+    clients = []
+    
+    def __init__(self, hl=None, tz=None, **kwargs):
+        self.session = object()
+        self.kw_list = []
+        self.timeframe = None
+        self.requests = 0
+        self.busy = threading.Lock()
+        self.clients.append(self)
+    
+    def _get_data(self, url, **kwargs):
+        self.requests += 1
+        return {}
+    
+    def build_payload(self, kw_list, timeframe='today 12-m', **kwargs):
+        self._get_data('tokens')
+        self.kw_list, self.timeframe = list(kw_list), timeframe
+        self.payloads.append((list(kw_list), timeframe))
+    
+    def _dates(self):
+        if not self.timeframe.startswith('today'):
+            start, end = self.timeframe.split()
+            return pd.date_range(start, end, freq='D')
+        today = date.today()
+        last_sunday = today - timedelta(days=(today.weekday() + 1) % 7)
+        return pd.date_range(end=pd.Timestamp(last_sunday), periods=12, freq='7D')
+    
+    def interest_over_time(self):
+        self._get_data('multiline')
+        dates = self._dates()
+        peak = max(self.popularity.get(keyword, 0) for keyword in self.kw_list) or 1
+        frame = pd.DataFrame(
+            {keyword: [round(self.popularity.get(keyword, 0) * 100 / peak)] * len(dates) for keyword in self.kw_list},
+            index=pd.DatetimeIndex(dates, name='date')
+        )
+        frame['isPartial'] = [False] * (len(dates) - 1) + [True]
+        return frame
+    
+    def related_queries(self):
+        result = {}
+        for keyword in self.kw_list:
+            self._get_data('relatedsearches')
+            result[keyword] = {
+                'rising': pd.DataFrame({'query': [f'{keyword} free'], 'value': [250]}),
+                'top': pd.DataFrame({'query': [f'{keyword} online', f'best {keyword}'], 'value': [100, 60]})
+            }
+        return result
+    
+    def related_topics(self):
+        result = {}
+        for keyword in self.kw_list:
+            self._get_data('relatedsearches')
+            result[keyword] = {
+                'rising': pd.DataFrame(),
+                'top': pd.DataFrame({
+                    'value': [100], 'formattedValue': ['100'], 'link': ['/trends/explore'],
+                    'topic_mid': ['/m/0'], 'topic_title': [keyword.title()], 'topic_type': ['Topic']
+                })
+            }
+        return result
+    
+    def trending_searches(self, pn='united_states'):
+        self._get_data('trending')
+        return pd.DataFrame({0: self.trending.get(pn, [])})
+    
+    def realtime_trending_searches(self, pn='US', **kwargs):
+        self._get_data('realtime')
+        return pd.DataFrame({
+            'title': self.trending.get(pn, []),
+            'entityNames': [[term] for term in self.trending.get(pn, [])]
+        })
+
+
+@pytest.fixture
+def fake_trends(monkeypatch):
+    """FakeTrendReq installed as the collector's TrendReq, with empty tables."""
+    monkeypatch.setattr(FakeTrendReq, 'popularity', {})
+    monkeypatch.setattr(FakeTrendReq, 'trending', {})
+    monkeypatch.setattr(FakeTrendReq, 'payloads', [])
+    monkeypatch.setattr(FakeTrendReq, 'clients', [])
+    monkeypatch.setattr(google_trends_collector, 'TrendReq', FakeTrendReq)
+    return FakeTrendReq
+
+
+@pytest.fixture
+def trends_collector(fake_trends):
+    """An uncached GoogleTrendsCollector over FakeTrendReq with an unthrottled rate."""
+    controller = AdaptiveRateController(rate=1000, max_rate=1000, burst=1000, max_concurrency=3)
+    return GoogleTrendsCollector(concurrency=3, rate_controller=controller, use_cache=False)
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    """A DataWarehouseManager over an empty SQLite file."""
+    manager = DataWarehouseManager(f'sqlite:///{tmp_path}/warehouse.db')
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def postgres_warehouse():
+    """A DataWarehouseManager over WAREHOUSE_TEST_DATABASE_URL, if set."""
+    url = os.getenv('WAREHOUSE_TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('WAREHOUSE_TEST_DATABASE_URL is not set')
+    manager = DataWarehouseManager(url)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def trends_payload():
+    """A small collect_comprehensive_trends result for two keywords over two months."""
+    timestamp = '2024-03-01T12:00:00'
+    return {
+        'keywords': ['pdf merger', 'word counter'],
+        'related_queries': {
+            'pdf merger': {'today 3-m': {
+                'rising_queries': [{'query': 'merge pdf free', 'value': 250}],
+                'top_queries': [{'query': 'merge pdf', 'value': 100}, {'query': 'pdf combiner', 'value': 40}],
+                'source': 'google_trends', 'timestamp': timestamp
+            }}
+        },
+        'related_topics': {
+            'word counter': {'today 3-m': {
+                'rising_topics': [],
+                'top_topics': [{'topic_title': 'Word count', 'topic_type': 'Topic', 'value': 100}],
+                'source': 'google_trends', 'timestamp': timestamp
+            }}
+        },
+        'interest_over_time': {
+            'today 3-m': {
+                'interest_over_time': [
+                    {'date': '2024-01-28', 'pdf merger': 40, 'word counter': 20, 'is_partial': False},
+                    {'date': '2024-02-04', 'pdf merger': 50, 'word counter': 25, 'is_partial': False},
+                    {'date': '2024-02-11', 'pdf merger': 45, 'word counter': 30, 'is_partial': True},
+                ],
+                'source': 'google_trends', 'timestamp': timestamp
+            }
+        },
+        'trending_searches': [
+            {'rank': 1, 'search_term': 'eclipse', 'location': 'united_states', 'source': 'google_trends', 'timestamp': timestamp}
+        ],
+        'realtime_trending': [
+            {'rank': 1, 'title': 'Solar eclipse', 'traffic': '2M+', 'articles': [{'title': 'Eclipse'}],
+             'location': 'US', 'source': 'google_trends_realtime', 'timestamp': timestamp}
+        ]
+    }
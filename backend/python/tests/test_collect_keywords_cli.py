@@ -0,0 +1,103 @@
+"""Tests for the collect_keywords command line interface."""
+
+import pytest
+from click.testing import CliRunner
+
+pytest.importorskip('google.ads.googleads', reason='collect_keywords imports the Google Ads client')
+
+from scripts import collect_keywords
+from scripts.collect_keywords import KeywordCollectionOrchestrator
+
+
+class FailingWarehouse:
+    """Warehouse whose writes fail the way DataWarehouseManager reports them."""
+    
+    def get_interest_tails(self, keywords, timeframe, overlap_days):
+        return {}
+    
+    def store_trends(self, trends_data):
+        return False
+
+
+class FakeTrendsCollector:
+    def refresh_interest_over_time(self, keywords, tails, timeframe):
+        return {'keywords': keywords, 'interest_over_time': [{'date': '2024-01-07', 'pdf merger': 50}]}
+
+
+def failing_orchestrator():
+    orchestrator = KeywordCollectionOrchestrator.__new__(KeywordCollectionOrchestrator)
+    orchestrator.warehouse = FailingWarehouse()
+    orchestrator.google_trends_collector = FakeTrendsCollector()
+    orchestrator.cleanup = lambda: None
+    return orchestrator
+
+
+def test_refresh_interest_reports_store_failure():
+    assert failing_orchestrator().refresh_interest(['pdf merger']) == {}
+
+
+def test_refresh_interest_command_exits_non_zero_when_not_stored(monkeypatch):
+    monkeypatch.setattr(collect_keywords, 'KeywordCollectionOrchestrator', failing_orchestrator)
+
+    result = CliRunner().invoke(collect_keywords.cli, ['refresh-interest', '-k', 'pdf merger'])
+
+    assert result.exit_code == 1
+    assert 'Stored' not in result.output
+
+
+class RecordingTrendsCollector:
+    """Trends collector stand-in that records the journal each run gets."""
+    
+    def __init__(self):
+        self.journals = []
+    
+    def collect_comprehensive_trends(self, keywords, timeframes, save_to_file, journal, resume, geos):
+        self.journals.append(journal)
+        return {}
+
+
+class FakeJournal:
+    opened = 0
+    
+    def __init__(self):
+        FakeJournal.opened += 1
+    
+    def close(self):
+        pass
+
+
+def test_journal_is_only_opened_to_checkpoint_or_resume(monkeypatch):
+    monkeypatch.setattr(collect_keywords, 'CollectionJournal', FakeJournal)
+    monkeypatch.setattr(FakeJournal, 'opened', 0)
+    orchestrator = failing_orchestrator()
+    orchestrator.google_trends_collector = RecordingTrendsCollector()
+
+    orchestrator.collect_from_google_trends(['pdf merger'])
+    orchestrator.collect_from_google_trends(['pdf merger'], checkpoint=True)
+    orchestrator.collect_from_google_trends(['pdf merger'], resume=True)
+
+    journals = orchestrator.google_trends_collector.journals
+    assert journals[0] is None
+    assert all(isinstance(journal, FakeJournal) for journal in journals[1:])
+    assert FakeJournal.opened == 2
+
+
+def test_export_rejects_unknown_tables():
+    # The exporter, and pyarrow with it, is imported by the export command only
+    assert not hasattr(collect_keywords, 'WarehouseExporter')
+
+    result = CliRunner().invoke(collect_keywords.cli, ['export', '-t', 'keywords', '-t', 'bogus'])
+
+    assert result.exit_code == 2
+    assert 'bogus' in result.output
+
+
+def test_refresh_rollup_command_folds_in_queued_writes(warehouse, monkeypatch):
+    monkeypatch.setattr(collect_keywords, 'DataWarehouseManager', lambda: warehouse)
+    assert warehouse.store_keywords([{'keyword': 'pdf merger', 'avg_monthly_searches': 900, 'source': 'test'}])
+    assert warehouse.get_trending_keywords() == []
+
+    result = CliRunner().invoke(collect_keywords.cli, ['refresh-rollup'])
+
+    assert result.exit_code == 0
+    assert 'Refreshed 1 ' in result.output
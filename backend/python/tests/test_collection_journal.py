@@ -0,0 +1,68 @@
+"""Tests for checkpointing and resuming collection runs."""
+
+import pytest
+
+from data_collection.collection_journal import CollectionJournal
+
+PARAMS = {'keywords': ['pdf merger'], 'timeframes': ['today 3-m']}
+KEYWORDS = ['pdf merger', 'word counter', 'image compressor', 'json formatter', 'qr generator', 'color picker']
+
+
+@pytest.fixture
+def journal(tmp_path):
+    """A CollectionJournal in a throwaway file."""
+    journal = CollectionJournal(tmp_path / 'journal.db')
+    yield journal
+    journal.close()
+
+
+def test_resume_returns_recorded_units(journal):
+    assert journal.open_run(PARAMS) == {}
+    assert journal.record('bundle', {'keywords': ['pdf merger']})
+    # Failed units are left for the resumed run to retry
+    assert not journal.record('trending', {'error': 'throttled'})
+    assert not journal.record('realtime', [])
+
+    assert journal.open_run(PARAMS, resume=True) == {'bundle': {'keywords': ['pdf merger']}}
+    assert journal.open_run({**PARAMS, 'timeframes': ['today 12-m']}, resume=True) == {}
+
+
+def test_fresh_and_finished_runs_start_over(journal):
+    journal.open_run(PARAMS)
+    journal.record('bundle', {'keywords': ['pdf merger']})
+    assert journal.open_run(PARAMS) == {}
+
+    journal.record('bundle', {'keywords': ['pdf merger']})
+    journal.finish_run()
+    assert journal.open_run(PARAMS, resume=True) == {}
+
+
+def test_resumed_collection_only_requests_failed_units(journal, trends_collector, fake_trends, monkeypatch):
+    fake_trends.popularity.update({keyword: 10 * (index + 1) for index, keyword in enumerate(KEYWORDS)})
+    fake_trends.trending['united_states'] = ['eclipse']
+    build_payload = fake_trends.build_payload
+
+    def flaky(self, kw_list, timeframe='today 12-m', **kwargs):
+        if 'color picker' in kw_list:
+            raise ValueError('connection reset')
+        build_payload(self, kw_list, timeframe, **kwargs)
+    monkeypatch.setattr(fake_trends, 'build_payload', flaky)
+
+    first = trends_collector.collect_comprehensive_trends(
+        KEYWORDS, ['today 3-m'], save_to_file=False, journal=journal, geos=['united_states']
+    )
+    assert first['related_queries']['color picker']['today 3-m'].get('error')
+    assert fake_trends.payloads == [(KEYWORDS[:5], 'today 3-m')]
+
+    monkeypatch.setattr(fake_trends, 'build_payload', build_payload)
+    fake_trends.payloads.clear()
+    resumed = trends_collector.collect_comprehensive_trends(
+        KEYWORDS, ['today 3-m'], save_to_file=False, journal=journal, resume=True, geos=['united_states']
+    )
+
+    assert fake_trends.payloads == [(['pdf merger', 'color picker'], 'today 3-m')]
+    assert resumed['related_queries']['color picker']['today 3-m']['top_queries']
+    assert resumed['trending_searches'][0]['search_term'] == 'eclipse'
+    # Everything succeeded, so the run is closed
+    run = {'keywords': KEYWORDS, 'timeframes': ['today 3-m'], 'columnar': False, 'geos': ['united_states']}
+    assert journal.open_run(run, resume=True) == {}
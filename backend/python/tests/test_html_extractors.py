@@ -0,0 +1,61 @@
+"""Tests for the lxml keyword extractors and their benchmark."""
+
+from pathlib import Path
+
+from data_collection.html_extractors import PAGE_EXTRACTORS, extract_page, parse_html
+from scripts.benchmark_extractors import summary
+
+FIXTURES_DIR = Path(__file__).parent.parent / 'scripts' / 'fixtures'
+
+RESULT = '<div class="g"><a href="https://example.com/"><h3>Example PDF tool</h3></a></div>'
+RELATED = '''<div><span role="heading">Searches related to pdf converter</span></div>
+<div><a href="/search?q=pdf+converter+free">pdf converter free</a></div>
+<div><a href="/search?q=pdf+converter+app">pdf converter app</a></div>'''
+PAGER = '<div role="navigation"><a href="/search?q=pdf+converter&amp;start=10">Next</a></div>'
+
+
+def related(content):
+    return PAGE_EXTRACTORS['serp']['related_searches'].texts(parse_html(content))
+
+
+def test_serp_fixture():
+    document = parse_html((FIXTURES_DIR / 'serp_pdf_converter.html').read_text(encoding='utf-8'))
+
+    found = extract_page(document, 'serp', 'pdf converter')
+
+    assert [keyword['keyword'] for keyword in found['related_searches']][:2] == ['pdf converter to word', 'pdf converter free']
+    assert len(found['related_searches']) == 8
+    assert len(found['people_also_ask']) == 4
+    assert all(keyword['type'] == 'question' for keyword in found['people_also_ask'])
+
+
+def test_related_block_found_by_its_heading():
+    page = f'<html><body><div id="rso">{RESULT}</div><div class="block">{RELATED}</div>{PAGER}</body></html>'
+
+    assert related(page) == ['pdf converter free', 'pdf converter app']
+
+
+def test_related_heading_in_unknown_layout_takes_no_links():
+    # The nearest container of query links also holds results and the pager
+    page = f'<html><body><div id="main">{RESULT}{RELATED}{PAGER}</div></body></html>'
+
+    assert related(page) == []
+
+
+def test_github_trending_fixture():
+    document = parse_html((FIXTURES_DIR / 'github_trending_python.html').read_text(encoding='utf-8'))
+
+    repositories = extract_page(document, 'github_trending', 'python')['github_trending']
+
+    assert repositories[0]['keyword'] == 'psf / requests'
+    assert repositories[0]['language'] == 'python'
+
+
+def test_empty_pages_are_not_parsed():
+    assert parse_html('') is None
+    assert parse_html('  \n') is None
+
+
+def test_benchmark_summary_of_one_run():
+    assert summary([2.0]) == '2.00/2.00'
+    assert summary([1.0, 2.0, 3.0]).startswith('2.00/')
@@ -0,0 +1,76 @@
+"""Tests for batching interest over time in anchored groups and rescaling them."""
+
+# Google reports each payload relative to its own peak; halving these is the
+# scale of the first group, whose peak is 'image compressor'
+POPULARITY = {
+    'pdf merger': 50, 'image compressor': 200, 'word counter': 100, 'json formatter': 20, 'qr generator': 40,
+    'unit converter': 10, 'color picker': 100, 'regex tester': 30, 'base64 decoder': 6
+}
+
+
+def test_groups_share_the_anchor(trends_collector):
+    keywords = [f'k{i}' for i in range(11)] + ['k3']
+
+    batches = trends_collector.plan_interest_batches(keywords)
+
+    assert batches == [['k0', 'k1', 'k2', 'k3', 'k4'], ['k0', 'k5', 'k6', 'k7', 'k8'], ['k0', 'k9', 'k10']]
+
+
+def test_explicit_anchor_and_single_payload(trends_collector):
+    assert trends_collector.plan_interest_batches(['a', 'b', 'c']) == [['a', 'b', 'c']]
+    batches = trends_collector.plan_interest_batches(['a', 'b', 'c', 'd', 'e', 'f'], anchor='c')
+    assert batches == [['c', 'a', 'b', 'd', 'e'], ['c', 'f']]
+
+
+def test_groups_are_rescaled_onto_the_first(trends_collector, fake_trends):
+    fake_trends.popularity.update(POPULARITY)
+
+    result = trends_collector.get_interest_over_time(list(POPULARITY), 'today 3-m')
+
+    assert len(fake_trends.payloads) == 2
+    assert result['anchor'] == 'pdf merger'
+    assert result['keywords'] == list(POPULARITY)
+    for point in result['interest_over_time']:
+        assert {keyword: point[keyword] for keyword in POPULARITY} == {
+            keyword: value // 2 for keyword, value in POPULARITY.items()
+        }
+    assert [point['is_partial'] for point in result['interest_over_time']][-2:] == [False, True]
+
+
+def test_rescaled_groups_can_be_columnar(trends_collector, fake_trends):
+    fake_trends.popularity.update(POPULARITY)
+
+    result = trends_collector.get_interest_over_time(list(POPULARITY), 'today 3-m', columnar=True)
+
+    columns = result['interest_over_time']
+    assert list(columns)[:2] == ['date', 'is_partial']
+    assert set(columns['base64 decoder']) == {3}
+    assert len(columns['date']) == len(columns['pdf merger']) == 12
+
+
+def test_group_without_anchor_interest_is_left_unscaled(trends_collector, fake_trends):
+    fake_trends.popularity.update({**POPULARITY, 'pdf merger': 0})
+
+    result = trends_collector.get_interest_over_time(list(POPULARITY), 'today 3-m')
+
+    point = result['interest_over_time'][0]
+    assert point['image compressor'] == 100
+    # The second group's own peak
+    assert point['color picker'] == 100
+
+
+def test_repeated_keywords_are_collected_once(trends_collector, fake_trends):
+    fake_trends.popularity.update(POPULARITY)
+    keywords = list(POPULARITY) + ['word counter', 'pdf merger']
+
+    results = trends_collector.collect_comprehensive_trends(
+        keywords, ['today 3-m'], save_to_file=False, geos=['united_states']
+    )
+
+    assert results['keywords'] == list(POPULARITY)
+    assert len(fake_trends.payloads) == 2
+    interest = results['interest_over_time']['today 3-m']
+    assert interest['keywords'] == list(POPULARITY)
+    assert {keyword: interest['interest_over_time'][0][keyword] for keyword in POPULARITY} == {
+        keyword: value // 2 for keyword, value in POPULARITY.items()
+    }
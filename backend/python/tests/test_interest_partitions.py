@@ -0,0 +1,60 @@
+"""Tests for month-partitioned interest over time, retention and downsampling."""
+
+from datetime import date
+
+
+def months_ago(months, day=7):
+    today = date.today()
+    year, month = today.year, today.month - months
+    while month < 1:
+        year, month = year - 1, month + 12
+    return date(year, month, day).isoformat()
+
+
+def store_points(warehouse, dates, keyword='pdf merger'):
+    assert warehouse.store_trends({
+        'keywords': [keyword],
+        'interest_over_time': {'today 5-y': {
+            'interest_over_time': [{'date': day, keyword: 10 + index, 'is_partial': False} for index, day in enumerate(dates)],
+            'source': 'google_trends', 'timestamp': date.today().isoformat()
+        }}
+    })
+
+
+def partitions(warehouse):
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT month, granularity FROM interest_partitions ORDER BY month')
+        return dict(cursor.fetchall())
+
+
+def test_points_land_in_month_shards(warehouse):
+    store_points(warehouse, ['2024-01-07', '2024-01-14', '2024-02-04'])
+
+    assert list(partitions(warehouse)) == ['2024-01', '2024-02']
+    with warehouse.session() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM interest_over_time_p202401').fetchone()[0] == 2
+
+
+def test_range_reads_span_shards(warehouse):
+    store_points(warehouse, ['2024-01-07', '2024-02-04', '2024-03-03', '2024-04-07'])
+
+    series = warehouse.get_interest_series('pdf merger', start='2024-02-01', end='2024-03-31')
+
+    assert [point['date'] for point in series] == ['2024-02-04', '2024-03-03']
+
+
+def test_compaction_drops_expired_and_downsamples_old_months(warehouse):
+    old, aging, recent = months_ago(30), months_ago(12), months_ago(0, day=1)
+    store_points(warehouse, [old, aging, months_ago(12, day=14), recent])
+
+    result = warehouse.compact_interest_over_time(retention_months=24, downsample_after_months=6)
+
+    assert result == {'dropped': [old[:7]], 'downsampled': [aging[:7]]}
+    assert partitions(warehouse) == {aging[:7]: 'monthly', recent[:7]: 'raw'}
+    series = warehouse.get_interest_series('pdf merger')
+    # Two weekly points averaged into one, dated the first of the month
+    assert [(point['date'], point['interest_value']) for point in series] == [(aging[:7] + '-01', 12), (recent, 13)]
+
+    # A second pass finds nothing left to do
+    assert warehouse.compact_interest_over_time(retention_months=24, downsample_after_months=6) == {'dropped': [], 'downsampled': []}
@@ -0,0 +1,61 @@
+"""Tests for incrementally refreshing stored interest-over-time series."""
+
+from datetime import date
+
+
+def store_interest(warehouse, interest, timeframe='today 12-m'):
+    assert warehouse.store_trends({'keywords': interest['keywords'], 'interest_over_time': {timeframe: interest}})
+
+
+def test_refresh_fetches_only_the_recent_window(warehouse, trends_collector, fake_trends):
+    fake_trends.popularity.update({'pdf merger': 50, 'word counter': 100})
+    store_interest(warehouse, trends_collector.get_interest_over_time(['pdf merger', 'word counter']))
+    tails = warehouse.get_interest_tails(['pdf merger', 'word counter'], 'today 12-m', 28)
+
+    interest = trends_collector.refresh_interest_over_time(['pdf merger'], tails)
+
+    keywords, window = fake_trends.payloads[-1]
+    assert keywords == ['pdf merger']
+    assert window == f"{tails['pdf merger']['points'][0]['date']} {date.today().isoformat()}"
+    # Daily points averaged back onto the stored weekly grid, after the latest complete point
+    points = interest['interest_over_time']
+    assert points and all(point['date'][:10] > tails['pdf merger']['latest'] for point in points)
+    assert all((date.fromisoformat(point['date'][:10]) - date.fromisoformat(tails['pdf merger']['latest'])).days % 7 == 0
+               for point in points)
+    # The payload peaks at 100 on its own; the overlap puts it back on the stored scale
+    assert {point['pdf merger'] for point in points} == {50}
+
+
+def test_keywords_without_a_tail_follow_the_anchor(warehouse, trends_collector, fake_trends):
+    fake_trends.popularity.update({'pdf merger': 50, 'word counter': 100, 'json formatter': 20})
+    store_interest(warehouse, trends_collector.get_interest_over_time(['pdf merger', 'word counter']))
+    tails = warehouse.get_interest_tails(['pdf merger', 'json formatter'], 'today 12-m', 28)
+    assert list(tails) == ['pdf merger']
+
+    interest = trends_collector.refresh_interest_over_time(['pdf merger', 'json formatter'], tails)
+
+    assert fake_trends.payloads[-1] == (['pdf merger', 'json formatter'], 'today 12-m')
+    series = [point['json formatter'] for point in interest['interest_over_time'] if 'json formatter' in point]
+    # The whole series is new, on the stored scale where 'word counter' is 100
+    assert series == [20] * 12
+
+
+def test_refreshed_points_extend_the_stored_series(warehouse, trends_collector, fake_trends):
+    fake_trends.popularity.update({'pdf merger': 50, 'word counter': 100})
+    store_interest(warehouse, trends_collector.get_interest_over_time(['pdf merger', 'word counter']))
+    tails = warehouse.get_interest_tails(['pdf merger'], 'today 12-m', 28)
+
+    store_interest(warehouse, trends_collector.refresh_interest_over_time(['pdf merger'], tails))
+
+    stored = warehouse.get_interest_tails(['pdf merger'], 'today 12-m', 400)['pdf merger']['points']
+    assert len({point['date'] for point in stored}) == len(stored)
+    assert {point['interest_value'] for point in stored} == {50}
+
+
+def test_refresh_without_stored_series_fetches_the_timeframe(trends_collector, fake_trends):
+    fake_trends.popularity.update({'pdf merger': 50})
+
+    interest = trends_collector.refresh_interest_over_time(['pdf merger'], {})
+
+    assert fake_trends.payloads == [(['pdf merger'], 'today 12-m')]
+    assert len(interest['interest_over_time']) == 12
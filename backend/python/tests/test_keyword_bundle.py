@@ -0,0 +1,50 @@
+"""Tests for serving related queries, topics and interest from one Trends payload."""
+
+import pytest
+
+
+def test_bundle_builds_one_payload_for_all_reports(trends_collector, fake_trends):
+    fake_trends.popularity.update({'pdf merger': 50, 'word counter': 100})
+
+    bundle = trends_collector.get_keyword_bundle(['pdf merger', 'word counter'], 'today 3-m')
+
+    assert fake_trends.payloads == [(['pdf merger', 'word counter'], 'today 3-m')]
+    # One token request, one per keyword for queries and topics, one for interest
+    assert trends_collector.pytrends.requests == 1 + 2 + 2 + 1
+    assert bundle['related_queries']['pdf merger']['rising_queries'] == [
+        {'query': 'pdf merger free', 'value': 250, 'type': 'rising'}
+    ]
+    assert bundle['related_topics']['word counter']['top_topics'] == [
+        {'topic_title': 'Word Counter', 'topic_type': 'Topic', 'value': 100, 'type': 'top'}
+    ]
+    points = bundle['interest_over_time']['interest_over_time']
+    assert points[0]['pdf merger'] == 50 and points[0]['word counter'] == 100
+    assert points[-1]['is_partial']
+
+
+def test_bundle_matches_the_separate_reports(trends_collector, fake_trends):
+    fake_trends.popularity.update({'pdf merger': 50})
+
+    bundle = trends_collector.get_keyword_bundle(['pdf merger'])
+    queries = trends_collector.get_related_queries('pdf merger')
+    topics = trends_collector.get_related_topics('pdf merger')
+
+    assert bundle['related_queries']['pdf merger']['top_queries'] == queries['top_queries']
+    assert bundle['related_topics']['pdf merger']['top_topics'] == topics['top_topics']
+
+
+def test_bundle_reports_errors_per_report(trends_collector, fake_trends, monkeypatch):
+    def fail(self, kw_list, timeframe='today 12-m', **kwargs):
+        raise ValueError('payload rejected')
+    monkeypatch.setattr(fake_trends, 'build_payload', fail)
+
+    bundle = trends_collector.get_keyword_bundle(['pdf merger'])
+
+    assert bundle['related_queries']['pdf merger']['error'] == 'payload rejected'
+    assert bundle['related_topics']['pdf merger']['top_topics'] == []
+    assert bundle['interest_over_time']['interest_over_time'] == []
+
+
+def test_bundle_refuses_more_than_one_payload(trends_collector):
+    with pytest.raises(ValueError):
+        trends_collector.get_keyword_bundle(['a', 'b', 'c', 'd', 'e', 'f'])
@@ -0,0 +1,87 @@
+"""Tests for the keyword_dim dimension and the migration onto it."""
+
+import sqlite3
+
+from data_collection.data_warehouse_manager import DataWarehouseManager
+
+# Fact tables as created before keyword_dim existed
+LEGACY_SCHEMA = '''
+    CREATE TABLE keywords (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, keyword TEXT NOT NULL, avg_monthly_searches INTEGER,
+        competition TEXT, competition_index INTEGER, low_top_of_page_bid_micros INTEGER,
+        high_top_of_page_bid_micros INTEGER, source TEXT NOT NULL, seed_keywords TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE trends (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, keyword TEXT NOT NULL, query TEXT, value INTEGER,
+        trend_type TEXT, timeframe TEXT, source TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE interest_over_time (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, keywords TEXT NOT NULL, date TEXT NOT NULL,
+        interest_value INTEGER, keyword_name TEXT, is_partial BOOLEAN, timeframe TEXT, source TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_keywords_keyword ON keywords(keyword);
+    CREATE INDEX idx_trends_keyword ON trends(keyword);
+    INSERT INTO keywords (keyword, avg_monthly_searches, source, timestamp)
+        VALUES ('PDF Merger', 900, 'google_ads', '2024-03-01T08:00:00'), ('word counter', 300, 'google_ads', '2024-03-01T08:00:00');
+    INSERT INTO trends (keyword, query, value, trend_type, timeframe, source, timestamp)
+        VALUES ('pdf merger', 'merge pdf', 100, 'top', 'today 3-m', 'google_trends', '2024-03-01T08:00:00');
+    INSERT INTO interest_over_time (keywords, date, interest_value, keyword_name, is_partial, timeframe, source)
+        VALUES ('["pdf merger"]', '2024-02-04', 50, 'pdf merger', 0, 'today 3-m', 'google_trends');
+'''
+
+
+def dim_rows(warehouse):
+    with warehouse.session() as conn:
+        return conn.execute('SELECT keyword, normalized FROM keyword_dim ORDER BY normalized').fetchall()
+
+
+def test_case_and_spacing_variants_share_an_id(warehouse):
+    assert warehouse.store_keywords([
+        {'keyword': 'PDF Merger', 'source': 'google_ads'},
+        {'keyword': 'pdf  merger', 'source': 'organic'},
+        {'keyword': 'word counter', 'source': 'organic'},
+    ])
+
+    assert [normalized for _, normalized in dim_rows(warehouse)] == ['pdf merger', 'word counter']
+
+
+def test_read_paths_do_not_create_keywords(warehouse):
+    assert warehouse.get_interest_series('never stored') == []
+    assert warehouse.get_interest_tails(['never stored'], 'today 3-m', 28) == {}
+    assert list(warehouse.iter_trends(keyword='never stored')) == []
+
+    assert dim_rows(warehouse) == []
+
+
+def test_fact_tables_hold_ids_not_text(warehouse, trends_payload):
+    assert warehouse.store_trends(trends_payload)
+
+    with warehouse.session() as conn:
+        for table in ('keywords', 'trends', 'topics'):
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+            assert 'keyword_id' in columns and 'keyword' not in columns
+    assert {row['keyword'] for row in warehouse.iter_trends()} == {'pdf merger'}
+
+
+def test_legacy_tables_are_migrated(tmp_path):
+    path = tmp_path / 'legacy.db'
+    legacy = sqlite3.connect(str(path))
+    legacy.executescript(LEGACY_SCHEMA)
+    legacy.close()
+
+    warehouse = DataWarehouseManager(f'sqlite:///{path}')
+    try:
+        assert [normalized for _, normalized in dim_rows(warehouse)] == ['pdf merger', 'word counter']
+        with warehouse.session() as conn:
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(keywords)')]
+        assert 'keyword' not in columns
+        assert {row['keyword']: row['avg_monthly_searches'] for row in warehouse.get_keywords_by_source('google_ads')} == {
+            'PDF Merger': 900, 'word counter': 300
+        }
+        assert [row['query'] for row in warehouse.iter_trends(keyword='PDF MERGER')] == ['merge pdf']
+        assert [point['interest_value'] for point in warehouse.get_interest_series('pdf merger')] == [50]
+    finally:
+        warehouse.close()
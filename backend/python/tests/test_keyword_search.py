@@ -0,0 +1,57 @@
+"""Tests for keyword_dim substring and fuzzy search."""
+
+KEYWORDS = ['PDF Merger', 'pdf merger online', 'merge pdf files', 'image compressor', 'word counter']
+
+
+def store(warehouse, keywords):
+    assert warehouse.store_keywords([{'keyword': keyword, 'source': 'test'} for keyword in keywords])
+
+
+def test_substring_matches_rank_above_unrelated(warehouse):
+    store(warehouse, KEYWORDS)
+
+    matches = warehouse.search_keywords('merger', fuzzy=False)
+
+    assert {match['keyword'] for match in matches} == {'PDF Merger', 'pdf merger online'}
+    assert matches[0]['similarity'] >= matches[-1]['similarity']
+
+
+def test_fuzzy_search_tolerates_typos(warehouse):
+    store(warehouse, KEYWORDS)
+
+    assert warehouse.search_keywords('pdf mreger', fuzzy=False) == []
+    fuzzy = warehouse.search_keywords('pdf mreger', min_similarity=0.3)
+    assert 'PDF Merger' in {match['keyword'] for match in fuzzy}
+
+
+def test_fuzzy_candidates_are_the_rows_sharing_most_trigrams(warehouse):
+    # Common 'pdf' and 'ger' rows make the typo's rare trigrams ('mre', 'reg')
+    # score highest under bm25, so ranking by it would crowd out the closest match
+    store(warehouse, ['PDF Merger'] + [f'pdf maker {i}' for i in range(100)] + [f'burger {i}' for i in range(100)]
+          + [f'mregmreg {index:02d}' for index in range(30)])
+
+    assert [match['keyword'] for match in warehouse.search_keywords('pdf mreger', limit=1)] == ['PDF Merger']
+
+
+def test_search_uses_trigram_index_on_sqlite(warehouse):
+    assert warehouse._keyword_search == 'trigram'
+    store(warehouse, ['alpha'])
+    # Keywords added after the index was built are searchable through it
+    store(warehouse, ['alphabet soup'])
+    assert [match['keyword'] for match in warehouse.search_keywords('phab', fuzzy=False)] == ['alphabet soup']
+
+
+def test_postgres_search_is_index_backed(postgres_warehouse):
+    store(postgres_warehouse, KEYWORDS)
+    query, params = postgres_warehouse._postgres_search_query('pdf mreger', True, 10)
+
+    with postgres_warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', '0.3', true)")
+        # The test table is tiny; make the planner show whether the index can serve the filter
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('EXPLAIN ' + query, params)
+        plan = '\n'.join(row[0] for row in cursor.fetchall())
+
+    assert 'Bitmap Index Scan on idx_keyword_dim_trgm' in plan
+    assert 'PDF Merger' in {match['keyword'] for match in postgres_warehouse.search_keywords('pdf mreger')}
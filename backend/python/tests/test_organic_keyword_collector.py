@@ -0,0 +1,164 @@
+"""Tests for the organic keyword collector's HTTP layer."""
+
+import threading
+import time
+
+import requests
+
+from config.settings import ORGANIC_DEFAULT_REQUESTS_PER_SECOND
+from data_collection.organic_keyword_collector import OrganicKeywordCollector
+
+
+class FakeResponse:
+    status_code = 200
+    
+    def __init__(self, text='', payload=None):
+        self.text = text
+        self._payload = payload
+    
+    def json(self):
+        return self._payload
+    
+    def raise_for_status(self):
+        pass
+
+
+def record_gets(monkeypatch, respond=lambda url, kwargs: FakeResponse()):
+    """Replace requests.Session.get; returns the list of (session, url) calls made."""
+    calls = []
+    
+    def get(session, url, **kwargs):
+        calls.append((session, url))
+        return respond(url, kwargs)
+    
+    monkeypatch.setattr(requests.Session, 'get', get)
+    return calls
+
+
+def test_session_alias_is_the_session_requests_use(monkeypatch):
+    calls = record_gets(monkeypatch)
+    collector = OrganicKeywordCollector(tool_terms=[])
+
+    collector._get('https://example.com/')
+
+    assert calls == [(collector.session, 'https://example.com/')]
+    assert 'Mozilla' in collector.session.headers['User-Agent']
+
+
+def test_each_thread_gets_its_own_session():
+    collector = OrganicKeywordCollector(tool_terms=[])
+    sessions = []
+    worker = threading.Thread(target=lambda: sessions.append(collector.session))
+    worker.start()
+    worker.join()
+
+    assert sessions[0] is not collector.session
+
+
+def test_hosts_are_paced_independently():
+    collector = OrganicKeywordCollector(host_rates={'www.reddit.com': 0.5}, tool_terms=[])
+
+    assert collector._bucket('www.reddit.com').rate == 0.5
+    assert collector._bucket('example.com').rate == ORGANIC_DEFAULT_REQUESTS_PER_SECOND
+    assert collector._bucket('www.reddit.com') is collector._bucket('www.reddit.com')
+
+
+def test_serp_pages_are_fetched_once_then_expire(monkeypatch):
+    from data_collection import organic_keyword_collector
+    calls = record_gets(monkeypatch, lambda url, kwargs: FakeResponse(text=f'<html>{len(calls)}</html>'))
+    monkeypatch.setattr(organic_keyword_collector, 'SERP_CACHE_TTL_SECONDS', 0.05)
+    collector = OrganicKeywordCollector(host_rates={'www.google.com': 1000}, tool_terms=[])
+
+    first = collector.fetch_serp('pdf merger')
+    assert collector.fetch_serp('pdf merger') == first
+    assert len(calls) == 1
+
+    time.sleep(0.1)
+    collector.fetch_serp('word counter')
+    assert list(collector._serp_pages) == ['word counter']
+    assert collector.fetch_serp('pdf merger') != first
+    assert len(calls) == 3
+
+
+def test_concurrent_serp_requests_share_one_download(monkeypatch):
+    release = threading.Event()
+    
+    def respond(url, kwargs):
+        release.wait(5)
+        return FakeResponse(text='<html></html>')
+    
+    calls = record_gets(monkeypatch, respond)
+    collector = OrganicKeywordCollector(host_rates={'www.google.com': 1000}, tool_terms=[])
+    pages = []
+    workers = [threading.Thread(target=lambda: pages.append(collector.fetch_serp('pdf merger'))) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    release.set()
+    for worker in workers:
+        worker.join()
+
+    assert pages == ['<html></html>'] * 4
+    assert len(calls) == 1
+
+
+def autocomplete(suggest, asked):
+    """Autocomplete responder serving `suggest(query)`; appends each query to `asked`."""
+    def respond(url, kwargs):
+        query = kwargs['params']['q']
+        asked.append(query)
+        return FakeResponse(payload=[query, suggest(query)])
+    return respond
+
+
+def test_expansion_walks_levels_without_repeating_queries(monkeypatch):
+    def suggest(query):
+        if query == 'pdf merger':
+            # 'pdf merger a' is also asked on the alphabet level
+            return ['PDF Merger', 'pdf merger a', 'pdf merger online']
+        return [f'{query} free'] if len(query.split()) < 4 else []
+
+    asked = []
+    record_gets(monkeypatch, autocomplete(suggest, asked))
+    collector = OrganicKeywordCollector(host_rates={'suggestqueries.google.com': 1000}, tool_terms=[])
+
+    suggestions = collector.expand_suggestions('pdf merger', depth=2, max_requests=500, prefixes=False)
+
+    # The seed and its 36 alphabet queries, then the 37 new suggestions they found
+    assert len(asked) == 37 + 37
+    assert len({' '.join(query.lower().split()) for query in asked}) == len(asked)
+    keywords = {suggestion['keyword']: suggestion for suggestion in suggestions}
+    assert keywords['pdf merger online']['depth'] == 1
+    assert keywords['pdf merger online']['query'] == 'pdf merger'
+    assert keywords['pdf merger b free']['query'] == 'pdf merger b'
+    assert keywords['pdf merger online free']['depth'] == 2
+    assert all(suggestion['seed_keyword'] == 'pdf merger' for suggestion in suggestions)
+    # 'PDF Merger' is a new suggestion but the same query as the seed, so it is not asked again
+    assert 'PDF Merger' in keywords and 'PDF Merger' not in asked
+    assert len(suggestions) == 40
+
+
+def test_expansion_stops_at_the_request_budget(monkeypatch):
+    asked = []
+    record_gets(monkeypatch, autocomplete(lambda query: [f'{query} free'], asked))
+    collector = OrganicKeywordCollector(host_rates={'suggestqueries.google.com': 1000}, tool_terms=[])
+
+    suggestions = collector.expand_suggestions('pdf merger', depth=3, max_requests=10)
+
+    assert len(asked) == 10
+    assert len(suggestions) == 10
+    assert {suggestion['depth'] for suggestion in suggestions} == {1}
+
+
+def test_reddit_posts_are_matched_against_tool_terms(monkeypatch):
+    posts = {'data': {'children': [
+        {'data': {'title': 'Best PDF converter?', 'selftext': 'Tried three pdf converters, and a pdf merger.'}},
+        {'data': {'title': 'Off topic', 'selftext': 'pdfs everywhere'}},
+    ]}}
+    record_gets(monkeypatch, lambda url, kwargs: FakeResponse(payload=posts))
+    collector = OrganicKeywordCollector(tool_terms=['pdf converter', 'pdf merger'])
+
+    keywords = collector.get_reddit_keywords('software')
+
+    assert [(keyword['keyword'], keyword['post_title']) for keyword in keywords] == [
+        ('pdf converter', 'Best PDF converter?'), ('pdf merger', 'Best PDF converter?')
+    ]
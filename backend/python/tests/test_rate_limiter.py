@@ -0,0 +1,124 @@
+"""Tests for the token bucket, the adaptive rate controller and Trends request pacing."""
+
+import threading
+
+import pytest
+from pytrends.exceptions import TooManyRequestsError
+
+from data_collection import google_trends_collector
+from data_collection.google_trends_collector import GoogleTrendsCollector
+from utils.rate_limiter import AdaptiveRateController, CircuitOpenError, TokenBucket
+
+
+class FakeTrendReq:
+    """TrendReq stand-in whose HTTP layer only counts requests."""
+    
+    def __init__(self, hl=None, tz=None):
+        self.session = object()
+        self.requests = 0
+    
+    def _get_data(self, url, **kwargs):
+        self.requests += 1
+        return {'url': url}
+
+
+def test_bucket_allows_burst_then_refuses():
+    bucket = TokenBucket(rate=0.001, capacity=2)
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert not bucket.acquire(timeout=0.01)
+
+
+def test_throttles_cut_rate_and_open_the_circuit():
+    controller = AdaptiveRateController(rate=2, max_rate=4, max_concurrency=4, breaker_threshold=2, cooldown=60)
+
+    controller.record_success()
+    assert controller.rate == pytest.approx(2.05)
+    controller.record_throttle()
+    assert controller.rate == pytest.approx(1.025)
+    assert controller.concurrency == 2
+    assert not controller.is_open
+
+    controller.record_throttle()
+    assert controller.is_open
+    with pytest.raises(CircuitOpenError):
+        with controller.slot(timeout=0.01):
+            pass
+
+
+def test_pacing_inside_an_open_slot_waits_on_the_circuit():
+    controller = AdaptiveRateController(rate=1000, max_rate=1000, burst=1000, breaker_threshold=2, cooldown=0.2)
+
+    with controller.slot(tokens=0):
+        controller.pace()
+        controller.record_throttle()
+        controller.record_throttle()
+        with pytest.raises(CircuitOpenError):
+            controller.pace(timeout=0.01)
+
+        # After the cooldown this slot's next request is the half-open trial; no other thread may send one
+        controller.pace(timeout=1)
+        refused = []
+
+        def pace_elsewhere():
+            try:
+                controller.pace(timeout=0.05)
+            except CircuitOpenError:
+                refused.append(True)
+        worker = threading.Thread(target=pace_elsewhere)
+        worker.start()
+        worker.join()
+        assert refused == [True]
+
+        controller.record_success()
+        controller.pace(timeout=0.01)
+
+
+def test_trends_requests_are_charged_per_http_call(monkeypatch):
+    monkeypatch.setattr(google_trends_collector, 'TrendReq', FakeTrendReq)
+    controller = AdaptiveRateController(rate=100, max_rate=100)
+    paced = []
+    monkeypatch.setattr(controller, 'pace', lambda tokens=1: paced.append(tokens))
+    collector = GoogleTrendsCollector(concurrency=1, rate_controller=controller, use_cache=False)
+
+    # A bundle is one call but several requests: the payload tokens plus one per report
+    results = collector._request(lambda pytrends: [pytrends._get_data(url) for url in ('tokens', 'queries', 'topics', 'interest')])
+
+    assert len(results) == 4
+    assert len(paced) == 4
+    assert collector.pytrends.requests == 4
+
+
+def test_throttled_requests_are_retried_after_backoff(monkeypatch):
+    monkeypatch.setattr(google_trends_collector, 'TrendReq', FakeTrendReq)
+    controller = AdaptiveRateController(rate=100, max_rate=100, max_concurrency=2, backoff_base=0.001)
+    collector = GoogleTrendsCollector(concurrency=2, rate_controller=controller, use_cache=False)
+    attempts = []
+
+    def fetch(pytrends):
+        attempts.append(pytrends)
+        if len(attempts) < 3:
+            raise TooManyRequestsError('throttled', None)
+        return 'ok'
+
+    assert collector._request(fetch) == 'ok'
+    assert len(attempts) == 3
+    assert controller.throttles == 2 and controller.successes == 1
+    assert controller.rate < 100
+
+
+def test_requests_give_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(google_trends_collector, 'TrendReq', FakeTrendReq)
+    monkeypatch.setattr(google_trends_collector, 'TRENDS_MAX_RETRIES', 1)
+    controller = AdaptiveRateController(rate=100, max_rate=100, backoff_base=0.001)
+    collector = GoogleTrendsCollector(concurrency=1, rate_controller=controller, use_cache=False)
+
+    def fetch(pytrends):
+        raise TooManyRequestsError('throttled', None)
+
+    with pytest.raises(TooManyRequestsError):
+        collector._request(fetch)
+    assert controller.throttles == 2
+    # The failed call still gave its session back
+    assert collector._clients.qsize() == 1
@@ -0,0 +1,54 @@
+"""Tests for chunked bulk keyword ingestion."""
+
+
+def keyword_rows(count, source='google_ads'):
+    for index in range(count):
+        yield {
+            'keyword': f'tool {index}',
+            'avg_monthly_searches': index * 10,
+            'competition': 'LOW',
+            'source': source,
+            'seed_keywords': ['tool'],
+            'timestamp': '2024-03-01T12:00:00'
+        }
+
+
+def stored_count(warehouse, table='keywords'):
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT COUNT(*) FROM {table}')
+        return cursor.fetchone()[0]
+
+
+def test_streams_a_generator_in_chunks(warehouse):
+    assert warehouse.store_keywords(keyword_rows(25), batch_size=4)
+
+    assert stored_count(warehouse) == 25
+    assert stored_count(warehouse, 'keyword_dim') == 25
+
+
+def test_commit_per_chunk_keeps_earlier_chunks_on_failure(warehouse):
+    def rows():
+        yield from keyword_rows(4)
+        raise RuntimeError('source went away')
+
+    assert not warehouse.store_keywords(rows(), batch_size=2, commit_per_chunk=True)
+    assert stored_count(warehouse) == 4
+
+
+def test_single_transaction_rolls_back_on_failure(warehouse):
+    def rows():
+        yield from keyword_rows(4)
+        raise RuntimeError('source went away')
+
+    assert not warehouse.store_keywords(rows(), batch_size=2)
+    assert stored_count(warehouse) == 0
+
+
+def test_stored_rows_read_back(warehouse):
+    assert warehouse.store_keywords(keyword_rows(3), batch_size=2)
+
+    rows = warehouse.get_keywords_by_source('google_ads')
+
+    assert {row['keyword'] for row in rows} == {'tool 0', 'tool 1', 'tool 2'}
+    assert all(row['seed_keywords'] == ['tool'] for row in rows)
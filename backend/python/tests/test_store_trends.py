@@ -0,0 +1,48 @@
+"""Tests for writing trends results through per-table bulk buffers."""
+
+
+def counts(warehouse):
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        result = {}
+        for table in ('trends', 'topics', 'interest_over_time', 'trending_searches'):
+            cursor.execute(f'SELECT COUNT(*) FROM {table}')
+            result[table] = cursor.fetchone()[0]
+        return result
+
+
+def test_every_table_is_written(warehouse, trends_payload):
+    assert warehouse.store_trends(trends_payload)
+
+    assert counts(warehouse) == {'trends': 3, 'topics': 1, 'interest_over_time': 6, 'trending_searches': 2}
+
+
+def test_small_batches_write_the_same_rows(warehouse, trends_payload):
+    assert warehouse.store_trends(trends_payload, batch_size=1)
+
+    assert counts(warehouse)['interest_over_time'] == 6
+
+
+def test_columnar_interest_matches_row_form(warehouse, trends_payload):
+    points = trends_payload['interest_over_time']['today 3-m']['interest_over_time']
+    trends_payload['interest_over_time']['today 3-m']['interest_over_time'] = {
+        'date': [point['date'] for point in points],
+        'is_partial': [point['is_partial'] for point in points],
+        'pdf merger': [point['pdf merger'] for point in points],
+        'word counter': [point['word counter'] for point in points],
+    }
+
+    assert warehouse.store_trends(trends_payload)
+
+    series = warehouse.get_interest_series('pdf merger')
+    assert [(point['date'][:10], point['interest_value'], point['is_partial']) for point in series] == [
+        ('2024-01-28', 40, False), ('2024-02-04', 50, False), ('2024-02-11', 45, True)
+    ]
+
+
+def test_realtime_articles_are_stored_as_json(warehouse, trends_payload):
+    assert warehouse.store_trends(trends_payload)
+
+    realtime = list(warehouse.iter_table('trending_searches', source='google_trends_realtime'))
+    assert realtime[0]['title'] == 'Solar eclipse'
+    assert realtime[0]['articles'] == '[{"title": "Eclipse"}]'
@@ -0,0 +1,54 @@
+"""Tests for the Aho-Corasick vocabulary matcher."""
+
+import re
+
+from utils.text_matcher import VocabularyMatcher
+
+TERMS = ['pdf', 'pdf converter', 'converter', 'word counter', 'json']
+
+
+def test_terms_match_only_as_whole_words():
+    matcher = VocabularyMatcher(TERMS)
+
+    assert matcher.find_terms('Need a PDF-tools list, or a pdf.') == ['pdf']
+    assert matcher.find_terms('pdfs and jsonl files, 2pdf') == []
+
+
+def test_overlapping_and_multi_word_terms():
+    matcher = VocabularyMatcher(TERMS)
+
+    matches = list(matcher.finditer('best PDF  Converter?'))
+
+    assert matches == [(5, 8, 'pdf'), (5, 19, 'pdf converter'), (10, 19, 'converter')]
+    assert matcher.find_terms('a word\tcounter and a pdf\n\nconverter') == ['word counter', 'pdf', 'pdf converter', 'converter']
+
+
+def test_terms_are_normalized_and_deduplicated():
+    matcher = VocabularyMatcher(['  Word   Counter ', 'word counter', '', 'JSON'])
+
+    assert len(matcher) == 2
+    assert 'WORD counter' in matcher
+    assert 'counter' not in matcher
+
+
+def test_added_terms_are_matched():
+    matcher = VocabularyMatcher(['pdf'])
+    assert matcher.find_terms('compress a png') == []
+
+    matcher.add(['png', 'compress'])
+
+    assert matcher.find_terms('compress a png') == ['compress', 'png']
+
+
+def test_matches_agree_with_a_regex_scan():
+    vocabulary = ['image resizer', 'resizer', 'qr code', 'code', 'qr code generator', 'base64', 'regex tester']
+    text = ('Is there a QR code generator (or qr  code maker) that beats my image resizer? '
+            'base64-encoding is fine; regex testers, resizers and barcode tools are not.') * 3
+    matcher = VocabularyMatcher(vocabulary)
+
+    expected = set()
+    for term in vocabulary:
+        pattern = r'(?<![^\W_])' + r'\s+'.join(map(re.escape, term.split())) + r'(?![^\W_])'
+        expected.update((match.start(), match.end(), term) for match in re.finditer(pattern, text.lower()))
+
+    assert set(matcher.finditer(text)) == expected
@@ -0,0 +1,59 @@
+"""Tests for trending searches across several geos and their combined ranking."""
+
+
+def search(term, location, rank, source='google_trends'):
+    key = 'title' if source == 'google_trends_realtime' else 'search_term'
+    return {key: term, 'location': location, 'rank': rank, 'source': source}
+
+
+def test_terms_trending_in_several_geos_rank_first(trends_collector):
+    ranked = trends_collector.rank_trending_terms([
+        search('Super Bowl', 'united_states', 1),
+        search('eclipse', 'united_states', 2),
+        search('Eclipse ', 'united_kingdom', 2),
+        search('eclipse', 'US', 3, 'google_trends_realtime'),
+    ])
+
+    assert [entry['term'] for entry in ranked] == ['eclipse', 'Super Bowl']
+    assert ranked[0] == {
+        'term': 'eclipse',
+        'ranks': {'united_states': 2, 'united_kingdom': 2},
+        'realtime_ranks': {'US': 3},
+        'score': round(1 / 2 + 1 / 2 + 1 / 3, 4),
+        'geo_count': 3
+    }
+
+
+def test_repeated_term_keeps_its_best_rank_per_geo(trends_collector):
+    ranked = trends_collector.rank_trending_terms([
+        search('eclipse', 'united_states', 1),
+        search('ECLIPSE', 'united_states', 4),
+        {'location': 'united_states', 'rank': 5, 'source': 'google_trends'},
+    ])
+
+    assert len(ranked) == 1
+    assert ranked[0]['ranks'] == {'united_states': 1}
+    assert ranked[0]['score'] == 1.0
+
+
+def test_trending_by_geo_fetches_every_geo(trends_collector, fake_trends):
+    fake_trends.trending.update({'united_states': ['super bowl', 'eclipse'], 'united_kingdom': ['eclipse']})
+
+    result = trends_collector.get_trending_by_geo(['united_states', 'united_kingdom', 'united_states'])
+
+    assert result['geos'] == ['united_states', 'united_kingdom']
+    assert [(row['location'], row['rank'], row['search_term']) for row in result['trending_searches']] == [
+        ('united_states', 1, 'super bowl'), ('united_states', 2, 'eclipse'), ('united_kingdom', 1, 'eclipse')
+    ]
+    assert [row['title'] for row in result['realtime_trending']] == ['super bowl', 'eclipse', 'eclipse']
+    assert result['ranked'][0]['term'] == 'eclipse'
+    assert result['ranked'][0]['geo_count'] == 2
+
+
+def test_trending_by_geo_can_skip_realtime(trends_collector, fake_trends):
+    fake_trends.trending['united_states'] = ['eclipse']
+
+    result = trends_collector.get_trending_by_geo(['united_states'], realtime=False)
+
+    assert result['realtime_trending'] == []
+    assert sum(client.requests for client in fake_trends.clients) == 1
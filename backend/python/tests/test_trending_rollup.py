@@ -0,0 +1,77 @@
+"""Tests for the incrementally refreshed trending keyword rollup."""
+
+from datetime import datetime
+
+
+def store(warehouse, volumes):
+    timestamp = datetime.now().isoformat()
+    assert warehouse.store_keywords([
+        {'keyword': keyword, 'avg_monthly_searches': volume, 'source': 'test', 'timestamp': timestamp}
+        for keyword, volume in volumes.items()
+    ])
+
+
+def pending(warehouse):
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM rollup_pending')
+        return cursor.fetchone()[0]
+
+
+def test_back_to_back_reads_do_no_rollup_work(warehouse):
+    store(warehouse, {'pdf merger': 900, 'word counter': 300})
+    assert pending(warehouse) == 2
+
+    trending = warehouse.get_trending_keywords(refresh=True)
+    assert [row['keyword'] for row in trending] == ['pdf merger', 'word counter']
+    assert pending(warehouse) == 0
+    assert warehouse.refresh_trending_rollup() == 0
+
+
+def test_reads_only_refresh_when_asked(warehouse):
+    store(warehouse, {'pdf merger': 900})
+
+    assert warehouse.get_trending_keywords() == []
+    assert pending(warehouse) == 1
+    assert [row['keyword'] for row in warehouse.get_trending_keywords(refresh=True)] == ['pdf merger']
+
+
+def test_new_writes_refresh_only_their_groups(warehouse):
+    store(warehouse, {'pdf merger': 900, 'word counter': 300})
+    warehouse.refresh_trending_rollup()
+
+    store(warehouse, {'word counter': 5000})
+    assert warehouse.refresh_trending_rollup() == 1
+    assert warehouse.get_trending_keywords()[0]['keyword'] == 'word counter'
+
+
+def test_watermark_is_the_newest_write_processed(warehouse):
+    warehouse.refresh_trending_rollup()
+    store(warehouse, {'pdf merger': 900})
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT MAX(queued_at) FROM rollup_pending')
+        queued_at = cursor.fetchone()[0]
+
+    warehouse.refresh_trending_rollup()
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT high_water FROM rollup_watermarks WHERE name = 'keyword_daily_rollup'")
+        assert cursor.fetchone()[0] == queued_at
+
+
+def test_upgrade_without_queue_rebuilds_in_full(warehouse, tmp_path):
+    store(warehouse, {'pdf merger': 900})
+    warehouse.refresh_trending_rollup()
+    with warehouse.session() as conn:
+        conn.cursor().execute('DROP TABLE rollup_pending')
+    warehouse.close()
+
+    # Reopening recreates the queue and forgets the watermark, so nothing written meanwhile is missed
+    from data_collection.data_warehouse_manager import DataWarehouseManager
+    reopened = DataWarehouseManager(f'sqlite:///{tmp_path}/warehouse.db')
+    try:
+        assert reopened.refresh_trending_rollup() == 1
+        assert reopened.refresh_trending_rollup() == 0
+    finally:
+        reopened.close()
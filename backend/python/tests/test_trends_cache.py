@@ -0,0 +1,104 @@
+"""Tests for the on-disk Trends response cache."""
+
+import os
+import time
+
+import pytest
+
+from data_collection.google_trends_collector import GoogleTrendsCollector
+from data_collection.trends_cache import TrendsCache, is_complete_response
+from utils.rate_limiter import AdaptiveRateController
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A TrendsCache in a throwaway file with a one-hour TTL and no size budget."""
+    cache = TrendsCache(tmp_path / 'cache.db', ttl_seconds=3600, max_bytes=0)
+    yield cache
+    cache.close()
+
+
+def test_round_trip_survives_reopening(tmp_path, cache):
+    cache.set('related_queries', {'keyword': 'pdf merger', 'hl': 'en-US'}, {'top_queries': [{'query': 'merge pdf'}]})
+
+    assert cache.get('related_queries', {'hl': 'en-US', 'keyword': 'pdf merger'}) == {'top_queries': [{'query': 'merge pdf'}]}
+    assert cache.get('related_topics', {'keyword': 'pdf merger', 'hl': 'en-US'}) is None
+    cache.close()
+
+    reopened = TrendsCache(tmp_path / 'cache.db', ttl_seconds=3600, max_bytes=0)
+    assert reopened.get('related_queries', {'keyword': 'pdf merger', 'hl': 'en-US'}) is not None
+    assert reopened.stats()['entries'] == 1
+    reopened.close()
+
+
+def test_expired_entries_miss_and_are_purged(cache):
+    cache.set('trending_searches', {'geo': 'US'}, ['eclipse'])
+    cache._connection.execute('UPDATE responses SET created_at = ?', (time.time() - 7200,))
+
+    assert cache.get('trending_searches', {'geo': 'US'}) is None
+    assert cache.purge_expired() == 1
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'hit_rate': 0.0, 'evictions': 0, 'entries': 0, 'bytes': 0}
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    def payload():
+        # Incompressible, so every entry costs about the same
+        return os.urandom(2000).hex()
+
+    cache.set('a', {}, payload())
+    size = cache.stats()['bytes']
+    cache.max_bytes = int(size * 3.5)
+    cache.set('b', {}, payload())
+    cache.set('c', {}, payload())
+    assert cache.get('a', {}) is not None
+
+    cache.set('d', {}, payload())
+
+    assert cache.get('b', {}) is None
+    assert all(cache.get(method, {}) is not None for method in ('a', 'c', 'd'))
+    assert cache.evictions == 1
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_only_complete_responses_count():
+    assert is_complete_response({'keyword': 'pdf merger', 'top_queries': []})
+    assert not is_complete_response({'keyword': 'pdf merger', 'error': 'timeout'})
+    assert not is_complete_response({'related_queries': {'pdf merger': {'error': 'timeout'}}})
+    assert not is_complete_response([])
+    assert is_complete_response([{'rank': 1}])
+
+
+def test_collector_calls_are_served_from_the_cache(fake_trends, cache, monkeypatch):
+    fake_trends.popularity.update({'pdf merger': 50})
+    controller = AdaptiveRateController(rate=1000, max_rate=1000, burst=1000)
+    collector = GoogleTrendsCollector(concurrency=1, rate_controller=controller, cache=cache)
+
+    first = collector.get_related_queries('pdf merger')
+    second = collector.get_related_queries('pdf merger')
+    collector.get_related_queries('pdf merger', timeframe='today 3-m')
+
+    assert second == first
+    assert len(fake_trends.payloads) == 2
+    assert cache.hits == 1
+
+    def fail(self, kw_list, timeframe='today 12-m', **kwargs):
+        raise ValueError('payload rejected')
+    monkeypatch.setattr(fake_trends, 'build_payload', fail)
+    assert collector.get_related_topics('word counter').get('error')
+    assert cache.stats()['entries'] == 2
+
+
+def test_trending_searches_expire_sooner_than_other_responses(fake_trends, cache):
+    fake_trends.trending['US'] = ['eclipse']
+    controller = AdaptiveRateController(rate=1000, max_rate=1000, burst=1000)
+    collector = GoogleTrendsCollector(concurrency=1, rate_controller=controller, cache=cache)
+    collector.get_trending_searches('US')
+    collector.get_realtime_trending_searches('US')
+    # Ten minutes later: past the real-time TTL, within the daily trending one
+    cache._connection.execute('UPDATE responses SET created_at = created_at - 600')
+
+    collector.get_trending_searches('US')
+    collector.get_realtime_trending_searches('US')
+
+    assert cache.hits == 1
+    assert sum(client.requests for client in fake_trends.clients) == 3
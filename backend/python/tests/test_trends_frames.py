@@ -0,0 +1,54 @@
+"""Tests for the vectorized conversion of pytrends DataFrames."""
+
+import pandas as pd
+
+
+def test_frame_records_select_cast_and_tag(trends_collector):
+    frame = pd.DataFrame({'query': ['merge pdf', 'pdf combiner'], 'value': [100.0, 40.0], 'link': ['/a', '/b']})
+
+    records = trends_collector._frame_records(frame, {'query': None, 'value': 'int64'}, type='top')
+
+    assert records == [
+        {'query': 'merge pdf', 'value': 100, 'type': 'top'},
+        {'query': 'pdf combiner', 'value': 40, 'type': 'top'}
+    ]
+    # Native values, so the records serialize to JSON as-is
+    assert type(records[0]['value']) is int
+
+
+def test_frame_records_of_missing_frames_are_empty(trends_collector):
+    assert trends_collector._frame_records(None, {'query': None}) == []
+    assert trends_collector._frame_records(pd.DataFrame(), {'query': None}) == []
+
+
+def test_interest_frame_shapes_pytrends_output(trends_collector):
+    interest = pd.DataFrame(
+        {'pdf merger': [40, 50], 'isPartial': [False, True]},
+        index=pd.DatetimeIndex(['2024-01-28', '2024-02-04'], name='date')
+    )
+
+    frame = trends_collector._interest_frame(['pdf merger', 'word counter'], interest)
+
+    assert list(frame.columns) == ['date', 'is_partial', 'pdf merger']
+    assert frame.to_dict('records') == [
+        {'date': '2024-01-28T00:00:00', 'is_partial': False, 'pdf merger': 40},
+        {'date': '2024-02-04T00:00:00', 'is_partial': True, 'pdf merger': 50}
+    ]
+
+
+def test_interest_frame_without_partial_column(trends_collector):
+    interest = pd.DataFrame({'pdf merger': [40]}, index=pd.DatetimeIndex(['2024-01-28'], name='date'))
+
+    frame = trends_collector._interest_frame(['pdf merger'], interest)
+
+    assert frame['is_partial'].tolist() == [False]
+
+
+def test_columnar_points_hold_the_same_values(trends_collector, fake_trends):
+    fake_trends.popularity.update({'pdf merger': 50, 'word counter': 100})
+
+    rows = trends_collector.get_interest_over_time(['pdf merger', 'word counter'], 'today 3-m')['interest_over_time']
+    columns = trends_collector.get_interest_over_time(['pdf merger', 'word counter'], 'today 3-m', columnar=True)['interest_over_time']
+
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == rows
+    assert trends_collector._interest_result(['pdf merger'], 'today 3-m', pd.DataFrame(), columnar=True)['interest_over_time'] == {}
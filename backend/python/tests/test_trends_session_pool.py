@@ -0,0 +1,42 @@
+"""Tests for concurrent Trends collection over the pooled TrendReq sessions."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_sessions_are_never_shared_and_capped_at_concurrency(trends_collector, fake_trends):
+    overlaps = []
+    in_flight = []
+    lock = threading.Lock()
+
+    def fetch(pytrends):
+        if not pytrends.busy.acquire(blocking=False):
+            overlaps.append(pytrends)
+            return
+        with lock:
+            in_flight.append(1)
+            peak = len(in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight.pop()
+        pytrends.busy.release()
+        return peak
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        peaks = list(executor.map(lambda _: trends_collector._request(fetch), range(16)))
+
+    assert overlaps == []
+    assert len(fake_trends.clients) == 3
+    assert trends_collector._client_count == 3
+    assert max(peaks) <= 3
+
+
+def test_sessions_are_created_on_demand(trends_collector, fake_trends):
+    for _ in range(5):
+        trends_collector._request(lambda pytrends: pytrends.build_payload(['pdf merger']))
+
+    # Sequential calls keep reusing the first session
+    assert fake_trends.clients == [trends_collector.pytrends]
+    assert trends_collector.pytrends.requests == 5
+
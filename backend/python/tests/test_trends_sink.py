@@ -0,0 +1,49 @@
+"""Tests for the streaming NDJSON Trends output."""
+
+import pytest
+
+from data_collection import trends_sink
+from data_collection.trends_sink import NDJSONSink, iter_ndjson, read_trends_ndjson
+
+
+@pytest.mark.parametrize('compression, suffix', [
+    ('gzip', '.ndjson.gz'), ('zstd', '.ndjson.zst'), ('none', '.ndjson'), (None, '.ndjson'),
+])
+def test_round_trip(tmp_path, compression, suffix):
+    with NDJSONSink(tmp_path / 'run', compression) as sink:
+        sink.write('related_queries', {'top': []}, keyword='pdf merger', timeframe='today 3-m')
+        sink.flush()
+        sink.write('trending_ranked', [{'term': 'eclipse'}])
+
+    assert sink.path.name == 'run' + suffix
+    assert [record['type'] for record in iter_ndjson(sink.path)] == ['related_queries', 'trending_ranked']
+
+
+def test_torn_last_block_keeps_earlier_records(tmp_path):
+    with NDJSONSink(tmp_path / 'run', 'gzip') as sink:
+        sink.write('trending_searches', ['a'], geo='US')
+        sink.flush()
+        sink.write('trending_searches', ['b'], geo='GB')
+    data = sink.path.read_bytes()
+    sink.path.write_bytes(data[:-10])
+
+    assert [record['geo'] for record in iter_ndjson(sink.path)] == ['US']
+
+
+def test_reassembles_result_in_requested_geo_order(tmp_path):
+    with NDJSONSink(tmp_path / 'run', 'gzip') as sink:
+        sink.write('run', {'keywords': ['pdf merger'], 'timeframes': ['today 3-m'], 'geos': ['US', 'GB'],
+                           'collection_timestamp': '2024-03-01T00:00:00'})
+        sink.write('trending_searches', [{'query': 'gb'}], geo='GB')
+        sink.write('trending_searches', [{'query': 'us'}], geo='US')
+        sink.write('related_topics', {'top': [1]}, keyword='pdf merger', timeframe='today 3-m')
+
+    results = read_trends_ndjson(sink.path)
+
+    assert [search['query'] for search in results['trending_searches']] == ['us', 'gb']
+    assert results['related_topics'] == {'pdf merger': {'today 3-m': {'top': [1]}}}
+    assert results['related_queries'] == {'pdf merger': {}}
+
+
+def test_pyarrow_is_imported_only_for_zstd():
+    assert not hasattr(trends_sink, 'pa')
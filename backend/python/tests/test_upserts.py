@@ -0,0 +1,52 @@
+"""Tests for natural-key upserts."""
+
+
+def searches(warehouse, keyword):
+    rows = warehouse.get_keywords_by_source('google_ads')
+    return [row['avg_monthly_searches'] for row in rows if row['keyword'].lower().split() == keyword.split()]
+
+
+def test_same_day_recollection_updates_in_place(warehouse):
+    first = {'keyword': 'pdf merger', 'avg_monthly_searches': 100, 'source': 'google_ads', 'timestamp': '2024-03-01T08:00:00'}
+    later = dict(first, avg_monthly_searches=150, timestamp='2024-03-01T20:00:00')
+
+    assert warehouse.store_keywords([first])
+    assert warehouse.store_keywords([later])
+
+    assert searches(warehouse, 'pdf merger') == [150]
+
+
+def test_upsert_false_keeps_the_first_row(warehouse):
+    first = {'keyword': 'pdf merger', 'avg_monthly_searches': 100, 'source': 'google_ads', 'timestamp': '2024-03-01T08:00:00'}
+
+    assert warehouse.store_keywords([first])
+    assert warehouse.store_keywords([dict(first, avg_monthly_searches=150)], upsert=False)
+
+    assert searches(warehouse, 'pdf merger') == [100]
+
+
+def test_new_day_adds_a_row(warehouse):
+    first = {'keyword': 'pdf merger', 'avg_monthly_searches': 100, 'source': 'google_ads', 'timestamp': '2024-03-01T08:00:00'}
+
+    assert warehouse.store_keywords([first, dict(first, avg_monthly_searches=120, timestamp='2024-03-02T08:00:00')])
+
+    assert sorted(searches(warehouse, 'pdf merger')) == [100, 120]
+
+
+def test_duplicates_in_one_batch_keep_the_last(warehouse):
+    row = {'keyword': 'pdf merger', 'avg_monthly_searches': 100, 'source': 'google_ads', 'timestamp': '2024-03-01T08:00:00'}
+
+    # Case variants normalize to one keyword, so they share a natural key
+    assert warehouse.store_keywords([row, dict(row, keyword='PDF  Merger', avg_monthly_searches=130)])
+
+    assert searches(warehouse, 'pdf merger') == [130]
+
+
+def test_restored_trends_do_not_duplicate(warehouse, trends_payload):
+    assert warehouse.store_trends(trends_payload)
+    trends_payload['related_queries']['pdf merger']['today 3-m']['top_queries'][0]['value'] = 90
+    assert warehouse.store_trends(trends_payload)
+
+    queries = {row['query']: row['value'] for row in warehouse.iter_trends(keyword='pdf merger')}
+    assert queries == {'merge pdf free': 250, 'merge pdf': 90, 'pdf combiner': 40}
+    assert len(warehouse.get_interest_series('word counter')) == 3
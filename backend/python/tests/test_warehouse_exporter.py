@@ -0,0 +1,49 @@
+"""Tests for the Parquet and Arrow IPC warehouse exporter."""
+
+from datetime import date, datetime
+
+import pyarrow.dataset as ds
+
+from data_collection.warehouse_exporter import WarehouseExporter
+
+
+class PostgresShapedWarehouse:
+    """Stands in for a PostgreSQL warehouse: rows carry native date, datetime and bool values."""
+    
+    def iter_interest(self, chunk_size=None):
+        for day in (date(2024, 1, 7), date(2024, 2, 4)):
+            yield {
+                'id': day.month, 'keyword_id': 1, 'keyword': 'pdf merger', 'date': day,
+                'interest_value': 40 + day.month, 'is_partial': False, 'timeframe': 'today 12-m',
+                'source': 'google_trends', 'timestamp': datetime(2024, 3, 1, 12, 30)
+            }
+    
+    def close(self):
+        pass
+
+
+def test_exports_postgres_native_dates(tmp_path):
+    exporter = WarehouseExporter(PostgresShapedWarehouse(), output_dir=tmp_path, chunk_size=1)
+
+    exporter.export_parquet('interest_over_time')
+    exporter.export_arrow('interest_over_time')
+
+    table = exporter.read_parquet('interest_over_time', ds.field('month') == '2024-02')
+    assert table.column('date').to_pylist() == [datetime(2024, 2, 4)]
+    assert exporter.read_arrow('interest_over_time').num_rows == 2
+
+
+def test_round_trips_sqlite_keywords(warehouse, tmp_path):
+    assert warehouse.store_keywords([
+        {'keyword': 'pdf merger', 'avg_monthly_searches': 900, 'source': 'google_ads', 'seed_keywords': ['pdf']},
+        {'keyword': 'word counter', 'avg_monthly_searches': 300, 'source': 'google_trends'},
+    ])
+    exporter = WarehouseExporter(warehouse, output_dir=tmp_path / 'exports')
+
+    exported = exporter.export_all(tables=['keywords'], formats=('parquet', 'arrow'))
+
+    assert len(exported['keywords']) == 2
+    ads = exporter.read_parquet('keywords', ds.field('source') == 'google_ads').to_pylist()
+    assert [(row['keyword'], row['seed_keywords']) for row in ads] == [('pdf merger', ['pdf'])]
+    assert isinstance(ads[0]['snapshot_date'], date)
+    assert sorted(exporter.read_arrow('keywords').column('keyword').to_pylist()) == ['pdf merger', 'word counter']
@@ -0,0 +1,45 @@
+"""Tests for the streaming warehouse iterators."""
+
+
+def test_keywords_stream_in_id_order_and_resume(warehouse):
+    assert warehouse.store_keywords([{'keyword': f'tool {index}', 'source': 'test', 'seed_keywords': ['tool']} for index in range(7)])
+
+    rows = list(warehouse.iter_keywords(chunk_size=3))
+    assert [row['keyword'] for row in rows] == [f'tool {index}' for index in range(7)]
+    assert rows[0]['seed_keywords'] == ['tool']
+
+    resumed = list(warehouse.iter_keywords(after_id=rows[3]['id'], chunk_size=2))
+    assert [row['id'] for row in resumed] == [row['id'] for row in rows[4:]]
+
+
+def test_iterator_can_stay_open_while_writing(warehouse):
+    assert warehouse.store_keywords([{'keyword': f'tool {index}', 'source': 'test'} for index in range(4)])
+
+    stream = warehouse.iter_keywords(chunk_size=1)
+    first = next(stream)
+    assert warehouse.store_keywords([{'keyword': 'written mid-stream', 'source': 'other'}])
+
+    assert first['keyword'] == 'tool 0'
+    assert len(list(stream)) >= 3
+
+
+def test_trends_filter_by_keyword_and_source(warehouse, trends_payload):
+    assert warehouse.store_trends(trends_payload)
+
+    assert [row['query'] for row in warehouse.iter_trends(keyword='PDF Merger')] == ['merge pdf free', 'merge pdf', 'pdf combiner']
+    assert list(warehouse.iter_trends(source='elsewhere')) == []
+
+
+def test_interest_streams_by_date_across_months(warehouse, trends_payload):
+    assert warehouse.store_trends(trends_payload)
+
+    points = list(warehouse.iter_interest(chunk_size=2))
+    assert [point['date'][:10] for point in points] == sorted(point['date'][:10] for point in points)
+    assert len(points) == 6
+
+    last = points[2]
+    resumed = list(warehouse.iter_interest(after=(last['date'], last['id'])))
+    assert resumed == points[3:]
+
+    february = list(warehouse.iter_interest(keyword='word counter', start='2024-02-01'))
+    assert [point['interest_value'] for point in february] == [25, 30]
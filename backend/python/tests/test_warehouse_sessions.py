@@ -0,0 +1,106 @@
+"""Tests for thread-safe warehouse sessions."""
+
+import threading
+
+import pytest
+
+
+def keyword_count(warehouse):
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM keyword_dim')
+        return cursor.fetchone()[0]
+
+
+def test_sqlite_runs_in_wal_mode(warehouse):
+    with warehouse.session() as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_nested_sessions_share_one_transaction(warehouse):
+    with pytest.raises(RuntimeError):
+        with warehouse.session() as outer:
+            with warehouse.session() as inner:
+                assert inner is outer
+                inner.execute("INSERT INTO keyword_dim (keyword, normalized) VALUES ('a', 'a')")
+            # Leaving the inner block did not commit, so the outer failure undoes the insert
+            raise RuntimeError('abort')
+
+    assert keyword_count(warehouse) == 0
+
+
+def test_threads_get_their_own_connections(warehouse):
+    connections = []
+
+    def open_session():
+        with warehouse.session() as conn:
+            connections.append(conn)
+
+    workers = [threading.Thread(target=open_session) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len({id(conn) for conn in connections}) == 3
+
+
+def test_concurrent_writers_all_commit(warehouse):
+    errors = []
+
+    def write(worker):
+        rows = [{'keyword': f'worker {worker} keyword {index}', 'source': 'test'} for index in range(50)]
+        if not warehouse.store_keywords(rows, batch_size=10, commit_per_chunk=True):
+            errors.append(worker)
+
+    workers = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    assert keyword_count(warehouse) == 200
+
+
+def test_ids_from_a_rolled_back_transaction_are_never_shared(warehouse):
+    inserted = threading.Event()
+    checked = threading.Event()
+    seen = {}
+
+    def insert_then_roll_back():
+        with pytest.raises(RuntimeError):
+            with warehouse.session() as conn:
+                seen['writer'] = warehouse._resolve_keyword_ids(conn.cursor(), ['ghost keyword'])
+                inserted.set()
+                checked.wait(5)
+                raise RuntimeError('abort')
+
+    def look_up():
+        inserted.wait(5)
+        with warehouse.session() as conn:
+            seen['reader'] = warehouse._lookup_keyword_ids(conn.cursor(), ['ghost keyword'])
+        checked.set()
+
+    workers = [threading.Thread(target=insert_then_roll_back), threading.Thread(target=look_up)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert seen['writer'] and seen['reader'] == {}
+    assert 'ghost keyword' not in warehouse._keyword_ids
+    assert warehouse.store_keywords([{'keyword': 'ghost keyword', 'source': 'test'}])
+    with warehouse.session() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM keywords WHERE keyword_id NOT IN (SELECT id FROM keyword_dim)')
+        assert cursor.fetchone()[0] == 0
+    assert keyword_count(warehouse) == 1
+
+
+def test_committed_ids_are_cached(warehouse):
+    with warehouse.session() as conn:
+        ids = warehouse._resolve_keyword_ids(conn.cursor(), ['PDF Merger'])
+        assert 'pdf merger' not in warehouse._keyword_ids
+
+    assert warehouse._keyword_ids == {'pdf merger': ids['PDF Merger']}
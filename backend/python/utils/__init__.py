@@ -6,5 +6,7 @@ the backend, including logging, database operations, and common utilities.
 """
 
 from .logger import get_logger, setup_logger
+from .rate_limiter import TokenBucket, AdaptiveRateController, CircuitOpenError
+from .text_matcher import VocabularyMatcher
 
-__all__ = ['get_logger', 'setup_logger']
+__all__ = ['get_logger', 'setup_logger', 'TokenBucket', 'AdaptiveRateController', 'CircuitOpenError', 'VocabularyMatcher']
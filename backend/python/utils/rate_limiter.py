@@ -0,0 +1,312 @@
+"""
+Rate limiting utilities for the Online Tools backend.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Any, Iterator
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one. Short bursts up to `capacity` go through immediately,
+    sustained traffic is held to `rate`.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket, full.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take tokens if they are available right now.
+        
+        Args:
+            tokens: Tokens to take
+        
+        Returns:
+            True if the tokens were taken, False otherwise
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until tokens are available, then take them.
+        
+        Args:
+            tokens: Tokens to take
+            timeout: Maximum seconds to wait (default: wait indefinitely)
+        
+        Returns:
+            True if the tokens were taken, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+    
+    def set_rate(self, rate: float):
+        """
+        Change the refill rate; tokens already accrued are kept.
+        
+        Args:
+            rate: New tokens per second
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit breaker is open."""
+    pass
+
+
+class AdaptiveRateController:
+    """
+    AIMD rate and concurrency control with jittered backoff and a circuit breaker.
+    
+    Successful requests raise the request rate additively (and, after a run
+    of successes, the concurrency limit by one); throttled requests cut both
+    multiplicatively. After `breaker_threshold` consecutive throttles the
+    circuit opens: every caller waits out a cooldown (doubling on each
+    consecutive trip), then a single trial request decides whether the
+    circuit closes again.
+    """
+    
+    def __init__(self,
+                 rate: float,
+                 max_rate: float,
+                 min_rate: float = 0.05,
+                 burst: Optional[float] = None,
+                 max_concurrency: int = 1,
+                 increase_step: float = 0.05,
+                 decrease_factor: float = 0.5,
+                 backoff_base: float = 2.0,
+                 backoff_max: float = 60.0,
+                 breaker_threshold: int = 5,
+                 cooldown: float = 300.0):
+        """
+        Initialize the controller.
+        
+        Args:
+            rate: Starting requests per second
+            max_rate: Ceiling for additive increase
+            min_rate: Floor for multiplicative decrease
+            burst: Token bucket capacity (default: max(1, rate))
+            max_concurrency: Ceiling for in-flight requests
+            increase_step: Requests per second added per success
+            decrease_factor: Multiplier applied to rate and concurrency on a throttle
+            backoff_base: First retry delay in seconds, doubled per attempt
+            backoff_max: Longest retry delay in seconds
+            breaker_threshold: Consecutive throttles that open the circuit
+            cooldown: Seconds the circuit stays open on its first trip
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.cooldown = cooldown
+        
+        self.successes = 0
+        self.throttles = 0
+        self.trips = 0
+        self._consecutive_throttles = 0
+        self._success_streak = 0
+        self._open_until = 0.0
+        self._trial_owner: Optional[int] = None
+        self._in_flight = 0
+        self._condition = threading.Condition()
+    
+    @property
+    def rate(self) -> float:
+        """Current requests per second."""
+        return self.bucket.rate
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit breaker is currently refusing requests."""
+        return time.monotonic() < self._open_until
+    
+    def _wait_for_circuit(self, timeout: Optional[float]) -> bool:
+        """
+        Block while the circuit is open; after the cooldown let one trial through (condition held).
+        
+        The trial belongs to the calling thread, so a thread already holding
+        it is not blocked by its own trial.
+        
+        Returns:
+            True if the caller's request is the half-open trial
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        caller = threading.get_ident()
+        while True:
+            now = time.monotonic()
+            if now >= self._open_until and self._trial_owner in (None, caller):
+                if self._consecutive_throttles >= self.breaker_threshold:
+                    # Half-open: this request is the trial
+                    self._trial_owner = caller
+                    return True
+                return False
+            wait = self._open_until - now if now < self._open_until else None
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise CircuitOpenError(f"Circuit open for another {max(0.0, self._open_until - now):.0f}s")
+                wait = remaining if wait is None else min(wait, remaining)
+            self._condition.wait(wait)
+    
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None, tokens: float = 1) -> Iterator[None]:
+        """
+        Hold one in-flight request slot, paced by the rate limit.
+        
+        Report the request's outcome with `record_success` or
+        `record_throttle` before leaving the block. Callers whose slot covers
+        several HTTP requests pass `tokens=0` and call `pace` before each one.
+        
+        Args:
+            timeout: Maximum seconds to wait for the circuit to close
+            tokens: Rate-limit tokens taken on entry
+        """
+        with self._condition:
+            self._wait_for_circuit(timeout)
+            while self._in_flight >= self.concurrency:
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            self.bucket.acquire(tokens)
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                if self._trial_owner == threading.get_ident():
+                    # A trial that ended in some other error decides nothing; let the next one try
+                    self._trial_owner = None
+                self._condition.notify_all()
+    
+    def pace(self, tokens: float = 1, timeout: Optional[float] = None):
+        """
+        Block until the circuit is closed and the rate limit allows another request.
+        
+        A slot admitted before the circuit opened waits out the cooldown here
+        like a new one would, and after it may only send the half-open trial.
+        
+        Args:
+            tokens: Tokens the request costs
+            timeout: Maximum seconds to wait for the circuit to close
+            
+        Raises:
+            CircuitOpenError: If the circuit is still open after `timeout`
+        """
+        with self._condition:
+            self._wait_for_circuit(timeout)
+        self.bucket.acquire(tokens)
+    
+    def record_success(self):
+        """Additive increase after a request that was not throttled."""
+        with self._condition:
+            self.successes += 1
+            self._consecutive_throttles = 0
+            self._trial_owner = None
+            self._success_streak += 1
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.increase_step))
+            if self._success_streak >= self.concurrency and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._success_streak = 0
+            self._condition.notify_all()
+    
+    def record_throttle(self):
+        """Multiplicative decrease after a throttled request; may open the circuit."""
+        with self._condition:
+            self.throttles += 1
+            self._consecutive_throttles += 1
+            self._success_streak = 0
+            self._trial_owner = None
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate * self.decrease_factor))
+            self.concurrency = max(1, int(self.concurrency * self.decrease_factor))
+            
+            if self._consecutive_throttles >= self.breaker_threshold:
+                # Back off harder on each trip that follows another without a success in between
+                trips_in_row = self._consecutive_throttles - self.breaker_threshold
+                pause = min(self.cooldown * (2 ** trips_in_row), self.cooldown * 16)
+                self._open_until = time.monotonic() + pause
+                self.trips += 1
+            self._condition.notify_all()
+    
+    def backoff(self, attempt: int) -> float:
+        """
+        Jittered exponential delay before retry `attempt` (0-based).
+        
+        Uses "full jitter": a uniform draw up to the exponential ceiling, so
+        workers throttled together do not retry together.
+        
+        Args:
+            attempt: Number of retries already made
+            
+        Returns:
+            Seconds to sleep
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get controller state and counters.
+        
+        Returns:
+            Dictionary with rate, concurrency, successes, throttles, trips and circuit state
+        """
+        with self._condition:
+            return {
+                'rate': round(self.bucket.rate, 3),
+                'concurrency': self.concurrency,
+                'successes': self.successes,
+                'throttles': self.throttles,
+                'trips': self.trips,
+                'circuit_open': self.is_open
+            }
@@ -0,0 +1,148 @@
+"""
+Multi-term text matching for the Online Tools backend.
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class VocabularyMatcher:
+    """
+    Case-insensitive whole-word matcher for a large vocabulary.
+    
+    Terms are compiled into an Aho-Corasick automaton, so a text is scanned
+    once whatever the vocabulary size. A term only matches where it is not
+    glued to other letters or digits: 'pdf' matches "pdf-tools" and "a pdf."
+    but not "pdfs". Terms may span several words ("pdf converter").
+    """
+    
+    def __init__(self, terms: Iterable[str] = ()):
+        """
+        Initialize the matcher.
+        
+        Args:
+            terms: Initial vocabulary
+        """
+        self._terms: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._dirty = True
+        self.add(terms)
+    
+    def __len__(self) -> int:
+        return len(self._terms)
+    
+    def __contains__(self, term: str) -> bool:
+        return self._normalize(term) in self._index
+    
+    @staticmethod
+    def _normalize(term: str) -> str:
+        return ' '.join(term.lower().split())
+    
+    def add(self, terms: Iterable[str]):
+        """
+        Add terms to the vocabulary; the automaton is rebuilt on the next match.
+        
+        Args:
+            terms: Terms to add; blanks and duplicates are ignored
+        """
+        for term in terms:
+            term = self._normalize(term)
+            if term and term not in self._index:
+                self._index[term] = len(self._terms)
+                self._terms.append(term)
+                self._dirty = True
+    
+    def _build(self):
+        """Compile the trie, failure links and merged outputs."""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for term_id, term in enumerate(self._terms):
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(term_id)
+        
+        # Breadth-first, so every failure target is finished before it is used
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state].extend(outputs[fail[next_state]])
+                queue.append(next_state)
+        
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._dirty = False
+    
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Scan a text once for every vocabulary term at word boundaries.
+        
+        Args:
+            text: Text to search
+        
+        Yields:
+            (start, end, term) for each match, in order of end position;
+            positions index the lowercased text
+        """
+        if self._dirty:
+            self._build()
+        goto, fail, outputs, terms = self._goto, self._fail, self._outputs, self._terms
+        text = text.lower()
+        length = len(text)
+        state = 0
+        for position, char in enumerate(text):
+            if char.isspace():
+                # Terms are stored with single spaces; any whitespace run matches one
+                if position and text[position - 1].isspace():
+                    continue
+                char = ' '
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            end = position + 1
+            if end < length and text[end].isalnum():
+                continue
+            for term_id in outputs[state]:
+                start = self._match_start(text, position, terms[term_id])
+                if start == 0 or not text[start - 1].isalnum():
+                    yield start, end, terms[term_id]
+    
+    @staticmethod
+    def _match_start(text: str, position: int, term: str) -> int:
+        """Start of a match of `term` ending at `position`, allowing collapsed whitespace runs."""
+        start = position
+        for char in reversed(term[:-1]):
+            start -= 1
+            if char == ' ':
+                while start > 0 and text[start - 1].isspace():
+                    start -= 1
+        return start
+    
+    def find_terms(self, text: str) -> List[str]:
+        """
+        Get the distinct vocabulary terms found in a text.
+        
+        Args:
+            text: Text to search
+        
+        Returns:
+            Matched terms, in the order their first matches end
+        """
+        found = {}
+        for _, _, term in self.finditer(text):
+            found.setdefault(term, None)
+        return list(found)